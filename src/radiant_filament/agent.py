@@ -1,5 +1,7 @@
 import os
 import time
+from contextlib import contextmanager
+from functools import partial
 
 from google import genai
 from rich.console import Console, Group
@@ -8,6 +10,48 @@ from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.spinner import Spinner
 
+from .archive import ReportArchive
+from .cancellation import ResearchCancelled
+from .events import StreamEvent, usage_totals
+from .keypool import KeyPool
+from .ledger import LedgerEntry, UsageLedger
+from .polling import OutputCursor, split_renderable
+from .profiling import NULL_TIMER, PhaseTimer
+from .ratelimit import RateLimiter
+from .result import ResearchResult, ResearchStream, _timings
+from .search import ReportIndex
+from .speculative import SpeculativeFollowUps
+from .timeline import DEFAULT_TIMELINE_CAPACITY, ThoughtTimeline
+from .viewport import ViewportBuffer
+from .watchdog import (
+    StreamStalledError,
+    call_with_timeout,
+    close_quietly,
+    watch_stream,
+)
+
+# Seconds of silence (no events, heartbeats included) before a stream is resumed
+DEFAULT_IDLE_TIMEOUT = 300
+
+# Rows kept free below the report viewport for the status panel
+VIEWPORT_RESERVED_ROWS = 4
+
+
+def _new_stream_stats():
+    return {"stalls": 0, "reconnects": 0, "recovery_latencies": []}
+
+
+def format_stream_stats(stats):
+    """One-line summary of stream stalls, reconnects and recovery latency."""
+    summary = f"Stream stalls: {stats['stalls']}, reconnects: {stats['reconnects']}"
+    latencies = stats["recovery_latencies"]
+    if latencies:
+        summary += (
+            f", recovery avg {sum(latencies) / len(latencies):.1f}s"
+            f" / max {max(latencies):.1f}s"
+        )
+    return summary
+
 
 class DeepResearchAgent:
     DEFAULT_AGENT_CONFIG = {"type": "deep-research", "thinking_summaries": "auto"}
@@ -17,19 +61,47 @@ class DeepResearchAgent:
         agent_name: str = "deep-research-pro-preview-12-2025",
         *,
         client: genai.Client | None = None,
+        archive: ReportArchive | None = None,
+        search_index: ReportIndex | None = None,
+        timeline_capacity: int = DEFAULT_TIMELINE_CAPACITY,
+        idle_timeout: float | None = DEFAULT_IDLE_TIMEOUT,
+        rate_limiter: RateLimiter | None = None,
+        phase_timer: PhaseTimer | None = None,
+        ledger: UsageLedger | None = None,
+        followups: SpeculativeFollowUps | None = None,
     ):
         """Initialize the DeepResearchAgent.
 
         Args:
             agent_name: The Gemini agent version to use.
-            client: Optional pre-configured genai.Client. If not provided,
-                creates one using GEMINI_API_KEY environment variable.
+            client: Optional pre-configured genai.Client or KeyPool. If not
+                provided, uses a KeyPool when GEMINI_API_KEYS (comma-separated)
+                is set, otherwise creates a client from GEMINI_API_KEY.
+            archive: Optional ReportArchive that completed reports are written to.
+            search_index: Optional ReportIndex that completed reports are added to.
+            timeline_capacity: Maximum thought summaries kept in ``timeline``
+                per research run.
+            idle_timeout: Seconds without any stream event before the stream is
+                treated as stalled and resumed via reconnection. None or 0
+                disables the watchdog.
+            rate_limiter: Optional RateLimiter that create, reconnect and poll
+                calls are admitted through. Share one instance between agents
+                to keep concurrent sessions under a common quota.
+            phase_timer: Optional PhaseTimer that research runs charge their
+                network, render and I/O time to (see ``--profile``).
+            ledger: Optional UsageLedger that every finished run (completed,
+                failed or cancelled) appends its token usage and outcome to.
+            followups: Optional SpeculativeFollowUps started as soon as a
+                research run completes, caching their reports for later.
 
         Raises:
-            ValueError: If client is None and GEMINI_API_KEY is not set.
+            ValueError: If client is None and neither GEMINI_API_KEYS nor
+                GEMINI_API_KEY is set.
         """
         if client is not None:
             self.client = client
+        elif pool := KeyPool.from_env():
+            self.client = pool
         else:
             api_key = os.environ.get("GEMINI_API_KEY")
             if not api_key:
@@ -42,6 +114,16 @@ class DeepResearchAgent:
         self.last_event_id = None
         self.interaction_id = None
         self.console = Console()
+        self.archive = archive
+        self.search_index = search_index
+        self.timeline_capacity = timeline_capacity
+        self.timeline = None
+        self.idle_timeout = idle_timeout
+        self.rate_limiter = rate_limiter
+        self.phase_timer = phase_timer
+        self.ledger = ledger
+        self.followups = followups
+        self.stream_stats = _new_stream_stats()
 
     def _merge_agent_config(self, user_config):
         """Merge user config with defaults. User values override defaults.
@@ -56,6 +138,147 @@ class DeepResearchAgent:
             return self.DEFAULT_AGENT_CONFIG.copy()
         return {**self.DEFAULT_AGENT_CONFIG, **user_config}
 
+    def _viewport_rows(self, viewport):
+        """Resolve a viewport setting to a number of report rows (or None)."""
+        if viewport is None:
+            return None
+        if viewport == "auto":
+            return max(self.console.size.height - VIEWPORT_RESERVED_ROWS, 1)
+        if not isinstance(viewport, int) or viewport < 1:
+            raise ValueError("viewport must be a positive int, 'auto', or None")
+        return viewport
+
+    def _record_completion(
+        self,
+        prompt,
+        report,
+        *,
+        agent_config=None,
+        model=None,
+        timings=None,
+        events=None,
+    ):
+        """Persist a completed report and start speculative follow-ups."""
+        if self.followups is not None and self.interaction_id:
+            self.followups.start(self.interaction_id, self)
+        if self.archive is not None:
+            self.archive.add(
+                report,
+                prompt=prompt,
+                interaction_id=self.interaction_id,
+                agent_name=model or self.agent_name,
+                agent_config=None if model else self._merge_agent_config(agent_config),
+                model=model,
+                timings=timings,
+                events=events,
+            )
+        if self.search_index is not None and self.interaction_id:
+            self.search_index.add_report(
+                report, interaction_id=self.interaction_id, prompt=prompt
+            )
+
+    @contextmanager
+    def _track_usage(self, prompt, *, agent_config=None, model=None):
+        """Yield a LedgerEntry for one run; append it to the ledger when done.
+
+        Callers may fill in ``usage``, ``retries`` and ``outcome`` as the run
+        progresses. Otherwise the outcome is "completed" on normal exit,
+        "cancelled" on cancellation or interrupt and "failed" on any error.
+        """
+        entry = LedgerEntry.for_run(
+            prompt,
+            self.agent_name,
+            None if model else self._merge_agent_config(agent_config),
+            model,
+        )
+        # Stale values from a previous run must not be attributed to this one
+        self.interaction_id = None
+        self.stream_stats = _new_stream_stats()
+        started = time.monotonic()
+        try:
+            yield entry
+        except (ResearchCancelled, KeyboardInterrupt, GeneratorExit) as e:
+            entry.outcome = entry.outcome or "cancelled"
+            entry.error = entry.error or getattr(e, "reason", None) or type(e).__name__
+            raise
+        except Exception as e:
+            entry.outcome = "failed"
+            entry.error = str(e)
+            raise
+        else:
+            entry.outcome = entry.outcome or "completed"
+        finally:
+            if self.ledger is not None:
+                entry.interaction_id = self.interaction_id
+                entry.duration = round(time.monotonic() - started, 3)
+                entry.retries += self.stream_stats["reconnects"]
+                self.ledger.record(entry)
+
+    def cancel(self, interaction_id=None) -> bool:
+        """Cancel a background interaction server-side (best effort).
+
+        Args:
+            interaction_id: Interaction to cancel; defaults to the current one.
+
+        Returns:
+            bool: True if the cancel request was accepted.
+        """
+        interaction_id = interaction_id or self.interaction_id
+        if not interaction_id:
+            return False
+        try:
+            self.client.interactions.cancel(id=interaction_id)
+        except Exception as e:
+            self.console.print(
+                f"[yellow]Could not cancel interaction {interaction_id}: {e}[/yellow]"
+            )
+            return False
+        return True
+
+    def _call_api(self, method, cancel_token=None, **kwargs):
+        """Call an interactions method, through the rate limiter if configured."""
+        if self.rate_limiter is None:
+            return method(**kwargs)
+        try:
+            return self.rate_limiter.call(method, cancel_token=cancel_token, **kwargs)
+        except ResearchCancelled:
+            self._abort(cancel_token)
+
+    def _open_stream(self, method, cancel_token, **kwargs):
+        """Resume an API stream; the call itself is bounded by idle_timeout."""
+        return self._call_api(
+            partial(call_with_timeout, method, self.idle_timeout),
+            cancel_token,
+            **kwargs,
+        )
+
+    def _abort(self, cancel_token):
+        """Cancel the remote interaction and raise ResearchCancelled."""
+        self.cancel()
+        raise ResearchCancelled(cancel_token.reason)
+
+    def _iter_stream(self, stream, cancel_token):
+        """Iterate an API stream under the stall watchdog and cancellation token."""
+        events = watch_stream(stream, self.idle_timeout)
+        if cancel_token is None:
+            yield from events
+            return
+
+        # Closing the raw stream unblocks a pending read immediately
+        unregister = cancel_token.add_callback(lambda: close_quietly(stream))
+        try:
+            for event in events:
+                if cancel_token.cancelled:
+                    break
+                yield event
+        except Exception:
+            if not cancel_token.cancelled:
+                raise
+        finally:
+            unregister()
+        if cancel_token.cancelled:
+            self._abort(cancel_token)
+
     def start_research_stream(
         self,
         prompt,
@@ -63,6 +286,8 @@ class DeepResearchAgent:
         previous_interaction_id=None,
         model=None,
         tools=None,
+        cancel_token=None,
+        on_reconnect=None,
     ):
         """
         Generates a robust stream of events, handling reconnection automatically.
@@ -75,23 +300,34 @@ class DeepResearchAgent:
             model: Use a model instead of agent. When provided, agent_config is
                 ignored. Typically used with previous_interaction_id for follow-ups.
             tools: List of tools (e.g., file_search) for the agent to use.
+            cancel_token: Optional CancellationToken. When it fires, the open
+                stream is closed and the remote interaction is cancelled.
+            on_reconnect: Optional callback ``(attempt, error)`` invoked when the
+                stream drops, before reconnect attempt number ``attempt``.
 
         Yields:
             Event objects from the API with event_type attribute. Key types:
             interaction.start, content.delta, interaction.complete, error.
 
+        A stream that stays silent for longer than ``idle_timeout`` is closed and
+        resumed like a dropped connection; so is a reconnect call that does not
+        return within ``idle_timeout``. Stall, reconnect and recovery-latency
+        counts for the run are kept in ``stream_stats``.
+
         Raises:
             RuntimeError: If reconnection fails after max_retries attempts.
+            ResearchCancelled: If cancel_token is cancelled or its deadline passes.
             ConnectionError, TimeoutError, OSError: If initial connection fails
                 before an interaction is established.
         """
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
         merged_config = self._merge_agent_config(agent_config)
 
-        retry_delay = 2
-        max_delay = 60
-        max_retries = 10
-        retry_count = 0
         is_complete = False
+        interrupted_at = None
+        self.stream_stats = stats = _new_stream_stats()
+        stream = None
 
         # 1. Initial Request
         try:
@@ -117,8 +353,12 @@ class DeepResearchAgent:
             if tools:
                 create_kwargs["tools"] = tools
 
-            stream = self.client.interactions.create(**create_kwargs)
-            for event in stream:
+            # Not bounded like reconnects: abandoning a create that later
+            # succeeds would leave an interaction running that nobody follows
+            stream = self._call_api(
+                self.client.interactions.create, cancel_token, **create_kwargs
+            )
+            for event in self._iter_stream(stream, cancel_token):
                 yield event
                 if event.event_type == "interaction.start":
                     self.interaction_id = event.interaction.id
@@ -133,15 +373,65 @@ class DeepResearchAgent:
             if not self.interaction_id:
                 raise
             # Initial connection dropped mid-stream; proceed to reconnection loop.
+            interrupted_at = time.monotonic()
+            if isinstance(e, StreamStalledError):
+                stats["stalls"] += 1
             self.console.print(
                 f"[yellow]Stream interrupted: {e}. Reconnecting...[/yellow]"
             )
+            if on_reconnect is not None:
+                on_reconnect(stats["reconnects"] + 1, e)
+        finally:
+            # Release the connection however the stream ended (or was abandoned)
+            close_quietly(stream)
 
         # 2. Reconnection Loop
+        if not is_complete:
+            yield from self._follow_stream(cancel_token, interrupted_at, on_reconnect)
+
+    def attach_stream(
+        self, interaction_id, last_event_id=None, cancel_token=None, on_reconnect=None
+    ):
+        """Stream an existing interaction from last_event_id (or the start).
+
+        Uses the same reconnection, stall watchdog and cancellation handling as
+        :meth:`start_research_stream`, without creating a new interaction.
+
+        Raises:
+            RuntimeError: If reconnection fails after max_retries attempts.
+            ResearchCancelled: If cancel_token is cancelled or its deadline passes.
+        """
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        self.interaction_id = interaction_id
+        self.last_event_id = last_event_id
+        self.stream_stats = _new_stream_stats()
+        yield from self._follow_stream(cancel_token, None, on_reconnect, attaching=True)
+
+    def _follow_stream(
+        self, cancel_token, interrupted_at=None, on_reconnect=None, *, attaching=False
+    ):
+        """Stream the current interaction via get(), reconnecting until it ends."""
+        stats = self.stream_stats
+        retry_delay = 2
+        max_delay = 60
+        max_retries = 10
+        retry_count = 0
+        is_complete = False
+
         while not is_complete and self.interaction_id:
+            stream = None
             try:
                 # Attempt reconnection immediately; sleep only on failure (see except block)
-                stream = self.client.interactions.get(
+                if cancel_token is not None and cancel_token.cancelled:
+                    self._abort(cancel_token)
+                if attaching:
+                    attaching = False
+                else:
+                    stats["reconnects"] += 1
+                stream = self._open_stream(
+                    self.client.interactions.get,
+                    cancel_token,
                     id=self.interaction_id,
                     stream=True,
                     last_event_id=self.last_event_id,
@@ -151,7 +441,12 @@ class DeepResearchAgent:
                 # Reset delay on successful connection
                 retry_delay = 2
 
-                for event in stream:
+                for event in self._iter_stream(stream, cancel_token):
+                    if interrupted_at is not None:
+                        stats["recovery_latencies"].append(
+                            round(time.monotonic() - interrupted_at, 3)
+                        )
+                        interrupted_at = None
                     yield event
                     if event.event_id:
                         self.last_event_id = event.event_id
@@ -163,6 +458,10 @@ class DeepResearchAgent:
 
             except (ConnectionError, TimeoutError, OSError) as e:
                 # Reconnection failed; back off and retry
+                if interrupted_at is None:
+                    interrupted_at = time.monotonic()
+                if isinstance(e, StreamStalledError):
+                    stats["stalls"] += 1
                 retry_count += 1
                 self.console.print(
                     f"[yellow]Connection interrupted: {e}. "
@@ -172,8 +471,34 @@ class DeepResearchAgent:
                     raise RuntimeError(
                         f"Failed to reconnect after {max_retries} attempts: {e}"
                     ) from e
-                time.sleep(retry_delay)
+                if on_reconnect is not None:
+                    on_reconnect(stats["reconnects"] + 1, e)
+                if cancel_token is None:
+                    time.sleep(retry_delay)
+                elif cancel_token.wait(retry_delay):
+                    self._abort(cancel_token)
                 retry_delay = min(retry_delay * 2, max_delay)
+            finally:
+                close_quietly(stream)
+
+    def stream_events(self, prompt, **kwargs):
+        """Like start_research_stream, but yields compact StreamEvent records.
+
+        Accepts the same keyword arguments. Each SDK event is normalized as it
+        arrives, so nothing downstream holds on to the SDK objects.
+        """
+        for event in self.start_research_stream(prompt, **kwargs):
+            yield StreamEvent.from_sdk(event)
+
+    def stream_research(self, prompt, **kwargs) -> ResearchStream:
+        """Run research without any UI.
+
+        Accepts the same keyword arguments as start_research_stream. Iterate
+        the returned ResearchStream for text chunks and thought summaries as
+        they arrive, then read its ``result`` (a ResearchResult). Completed
+        reports are recorded to the archive and search index like research().
+        """
+        return ResearchStream(self, prompt, **kwargs)
 
     def research(
         self,
@@ -183,6 +508,11 @@ class DeepResearchAgent:
         previous_interaction_id=None,
         model=None,
         tools=None,
+        viewport=None,
+        pager=False,
+        cancel_token=None,
+        report_parser=None,
+        pipeline=None,
     ):
         """Starts and manages the research task with UI.
 
@@ -194,80 +524,187 @@ class DeepResearchAgent:
             model: Use a model instead of agent. When provided, agent_config is
                 ignored. Typically used with previous_interaction_id for follow-ups.
             tools: List of tools (e.g., file_search) for the agent to use.
+            viewport: Render only the tail of the report while streaming. An int
+                keeps that many terminal rows; "auto" fits the terminal height.
+                None (default) renders the whole report on every refresh.
+            pager: Show the full report in a scrollback pager once complete.
+            cancel_token: Optional CancellationToken. When it fires, the remote
+                interaction is cancelled and the partial report is kept in
+                output_path.
+            report_parser: Optional ReportParser fed every text delta, so
+                sections and citations are emitted as the report streams in.
+            pipeline: Optional OutputPipeline that receives every text delta.
+                It is flushed and closed when the run ends.
+
+        Returns:
+            ResearchResult: The report, interaction ID, metrics and timeline.
 
         Raises:
             RuntimeError: If output_path cannot be opened for writing, if the
                 API returns an error event, or if reconnection fails.
+            ResearchCancelled: If cancel_token is cancelled or its deadline passes.
         """
-        out_file = None
-        if output_path:
-            try:
-                out_file = open(output_path, "w", encoding="utf-8")
-            except OSError as e:
-                raise RuntimeError(f"Cannot write to '{output_path}': {e}") from e
-
-        accumulated_text = ""
-        current_thought = "Connecting..."
-        is_complete = False
+        # Validate arguments before output_path is truncated
+        viewport_rows = self._viewport_rows(viewport)
+        tail = ViewportBuffer(viewport_rows) if viewport_rows else None
+        self.timeline = ThoughtTimeline(self.timeline_capacity)
+        with self._track_usage(
+            prompt, agent_config=agent_config, model=model
+        ) as usage_entry:
+            out_file = None
+            if output_path:
+                try:
+                    out_file = open(output_path, "w", encoding="utf-8")
+                except OSError as e:
+                    raise RuntimeError(f"Cannot write to '{output_path}': {e}") from e
+
+            report_chunks = []
+            current_thought = "Connecting..."
+            is_complete = False
+            started = time.monotonic()
+            first_text_at = None
+            events = (
+                [] if self.archive is not None and self.archive.store_events else None
+            )
+            timer = self.phase_timer or NULL_TIMER
 
-        def generate_view():
-            elements = [Markdown(accumulated_text)]
-            if not is_complete:
-                elements.append(
-                    Panel(
-                        Spinner("dots", style="magenta", text=current_thought),
-                        title="Deep Research Agent",
-                        border_style="blue",
-                        padding=(0, 1),
+            def render_report():
+                if tail is not None:
+                    return Markdown(
+                        tail.text(max_rows=viewport_rows, width=self.console.width)
                     )
-                )
-            return Group(*elements)
+                return Markdown("".join(report_chunks))
+
+            # Rebuilt only when report text changes, not on status/thought updates
+            report_view = render_report()
+
+            def generate_view():
+                elements = [report_view]
+                if not is_complete:
+                    elements.append(
+                        Panel(
+                            Spinner("dots", style="magenta", text=current_thought),
+                            title="Deep Research Agent",
+                            border_style="blue",
+                            padding=(0, 1),
+                        )
+                    )
+                return Group(*elements)
 
-        try:
-            with Live(
-                generate_view(), refresh_per_second=10, console=self.console
-            ) as live:
-                # Use the robust stream generator
-                for event in self.start_research_stream(
-                    prompt,
-                    agent_config=agent_config,
-                    previous_interaction_id=previous_interaction_id,
-                    model=model,
-                    tools=tools,
-                ):
-                    if event.event_type == "interaction.start":
-                        current_thought = "Research Started..."
-                        live.update(generate_view())
-
-                    if event.event_type == "content.delta":
-                        if event.delta.type == "text":
-                            text = event.delta.text
-                            accumulated_text += text
-                            if out_file:
-                                out_file.write(text)
-                                out_file.flush()
-                            live.update(generate_view())
-                        elif event.delta.type == "thought_summary":
-                            current_thought = event.delta.content.text
+            try:
+                with Live(
+                    generate_view(), refresh_per_second=10, console=self.console
+                ) as live:
+
+                    def refresh(report_changed=False):
+                        nonlocal report_view
+                        with timer.phase("render"):
+                            if report_changed:
+                                report_view = render_report()
                             live.update(generate_view())
 
-                    if event.event_type in ["interaction.complete", "error"]:
-                        is_complete = True
-                        live.update(generate_view())
-                        if event.event_type == "error":
-                            error_str = str(event.error)
-                            self.console.print(
-                                f"[bold red]\nError: {event.error}[/bold red]"
-                            )
-                            if "Function call is empty" in error_str:
+                    # Use the robust stream generator
+                    stream = self.stream_events(
+                        prompt,
+                        agent_config=agent_config,
+                        previous_interaction_id=previous_interaction_id,
+                        model=model,
+                        tools=tools,
+                        cancel_token=cancel_token,
+                    )
+                    for event in timer.iterate("network", stream):
+                        if events is not None:
+                            events.append(event.to_log_entry())
+
+                        if event.event_type == "interaction.start":
+                            current_thought = "Research Started..."
+                            refresh()
+
+                        if event.kind == "text":
+                            text = event.text
+                            if first_text_at is None:
+                                first_text_at = time.monotonic()
+                            report_chunks.append(text)
+                            if tail is not None:
+                                tail.append(text)
+                            if report_parser is not None:
+                                report_parser.feed(text)
+                            with timer.phase("io"):
+                                if pipeline is not None:
+                                    pipeline.write(text)
+                                if out_file:
+                                    out_file.write(text)
+                                    out_file.flush()
+                            refresh(report_changed=True)
+                        elif event.kind == "thought_summary":
+                            current_thought = event.thought
+                            self.timeline.record(current_thought)
+                            refresh()
+
+                        if event.is_terminal:
+                            is_complete = True
+                            usage_entry.usage = event.usage
+                            refresh()
+                            if event.error is not None:
                                 self.console.print(
-                                    "[yellow]Tip: This is a known intermittent issue with the Deep Research Preview model. Please try running the command again.[/yellow]"
+                                    f"[bold red]\nError: {event.error}[/bold red]"
                                 )
-                            raise RuntimeError(f"Research error: {error_str}")
+                                if "Function call is empty" in event.error:
+                                    self.console.print(
+                                        "[yellow]Tip: This is a known intermittent issue with the Deep Research Preview model. Please try running the command again.[/yellow]"
+                                    )
+                                raise RuntimeError(f"Research error: {event.error}")
+
+            except ResearchCancelled as e:
+                message = f"Research stopped: {e.reason}"
+                if output_path and report_chunks:
+                    message += f". Partial report saved to {output_path}"
+                self.console.print(f"[yellow]{message}[/yellow]")
+                raise
 
-        finally:
-            if out_file:
-                out_file.close()
+            finally:
+                self.timeline.finish()
+                if report_parser is not None:
+                    report_parser.close()
+                if pipeline is not None:
+                    pipeline.close()
+                if out_file:
+                    out_file.close()
+
+            if self.stream_stats["reconnects"]:
+                self.console.print(
+                    f"[dim]{format_stream_stats(self.stream_stats)}[/dim]"
+                )
+
+            result = ResearchResult(
+                prompt,
+                "completed" if is_complete else "failed",
+                interaction_id=self.interaction_id,
+                chunks=report_chunks,
+                error=None if is_complete else "Stream ended before completion",
+                timings=_timings(started, first_text_at),
+                stream_stats=dict(self.stream_stats),
+                timeline=self.timeline,
+            )
+            usage_entry.outcome = result.status
+            if is_complete:
+                with timer.phase("io"):
+                    self._record_completion(
+                        prompt,
+                        result.report,
+                        agent_config=agent_config,
+                        model=model,
+                        timings={
+                            **result.timings,
+                            "stalls": self.stream_stats["stalls"],
+                            "reconnects": self.stream_stats["reconnects"],
+                        },
+                        events=events,
+                    )
+                if pager:
+                    with self.console.pager(styles=True):
+                        self.console.print(Markdown(result.report))
+            return result
 
     def research_poll(
         self,
@@ -278,155 +715,256 @@ class DeepResearchAgent:
         model=None,
         tools=None,
         poll_interval=5,
+        cancel_token=None,
+        report_parser=None,
+        pipeline=None,
     ):
         """Starts and manages the research task using polling instead of streaming.
 
         Args:
             prompt: The research prompt or follow-up question.
             agent_config: Optional config to override defaults.
-            output_path: Path to save the research report.
+            output_path: Path to save the research report. Text is appended
+                as polls return it, so a partial report is on disk early.
             previous_interaction_id: For follow-up questions on completed research.
             model: Use a model instead of agent. When provided, agent_config is
                 ignored. Typically used with previous_interaction_id for follow-ups.
             tools: List of tools (e.g., file_search) for the agent to use.
             poll_interval: Seconds between status polls (default: 5).
+            cancel_token: Optional CancellationToken. When it fires, polling
+                stops and the remote interaction is cancelled.
+            report_parser: Optional ReportParser fed report text as it arrives.
+            pipeline: Optional OutputPipeline that receives report text as
+                polls return it. It is flushed and closed when polling ends.
+
+        Returns:
+            ResearchResult: The completed report and its interaction ID.
 
         Raises:
-            RuntimeError: If output_path is not writable, research fails, is
-                cancelled, requires action, or completes without output.
+            RuntimeError: If output_path cannot be opened for writing, research
+                fails, requires action, or completes without output.
+            ResearchCancelled: If cancel_token is cancelled or its deadline
+                passes, or the interaction is cancelled remotely.
             TimeoutError: If polling exceeds max_polls (~1 hour at default interval).
         """
-        # Validate output path early (consistent with research() behavior)
-        if output_path:
-            parent_dir = os.path.dirname(output_path) or "."
-            if not os.path.isdir(parent_dir):
-                raise RuntimeError(
-                    f"Cannot write to '{output_path}': directory does not exist"
-                )
-            if not os.access(parent_dir, os.W_OK):
-                raise RuntimeError(
-                    f"Cannot write to '{output_path}': directory not writable"
-                )
+        with self._track_usage(
+            prompt, agent_config=agent_config, model=model
+        ) as usage_entry:
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            out_file = None
+            if output_path:
+                try:
+                    out_file = open(output_path, "w", encoding="utf-8")
+                except OSError as e:
+                    raise RuntimeError(f"Cannot write to '{output_path}': {e}") from e
 
-        merged_config = self._merge_agent_config(agent_config)
+            merged_config = self._merge_agent_config(agent_config)
 
-        # Build request kwargs
-        create_kwargs = {
-            "input": prompt,
-            "background": True,
-            "stream": False,
-        }
+            # Build request kwargs
+            create_kwargs = {
+                "input": prompt,
+                "background": True,
+                "stream": False,
+            }
 
-        if model:
-            create_kwargs["model"] = model
-        else:
-            create_kwargs["agent"] = self.agent_name
-            create_kwargs["agent_config"] = merged_config
+            if model:
+                create_kwargs["model"] = model
+            else:
+                create_kwargs["agent"] = self.agent_name
+                create_kwargs["agent_config"] = merged_config
 
-        if previous_interaction_id:
-            create_kwargs["previous_interaction_id"] = previous_interaction_id
+            if previous_interaction_id:
+                create_kwargs["previous_interaction_id"] = previous_interaction_id
 
-        if tools:
-            create_kwargs["tools"] = tools
+            if tools:
+                create_kwargs["tools"] = tools
 
-        # Create the interaction
-        try:
-            interaction = self.client.interactions.create(**create_kwargs)
-        except Exception as e:
-            self.console.print(f"[bold red]Failed to start research: {e}[/bold red]")
-            raise
+            started = time.monotonic()
+            first_text_at = None
+            timer = self.phase_timer or NULL_TIMER
+            cursor = OutputCursor()
+            report_chunks = []
+            unrendered = ""
+
+            def consume(interaction):
+                """Write and buffer the text added since the previous poll."""
+                nonlocal first_text_at, unrendered
+                for text in cursor.advance(getattr(interaction, "outputs", None)):
+                    if first_text_at is None:
+                        first_text_at = time.monotonic()
+                    report_chunks.append(text)
+                    unrendered += text
+                    if report_parser is not None:
+                        report_parser.feed(text)
+                    with timer.phase("io"):
+                        if pipeline is not None:
+                            pipeline.write(text)
+                        if out_file:
+                            try:
+                                out_file.write(text)
+                                out_file.flush()
+                            except OSError as e:
+                                self.console.print(
+                                    f"[bold red]Failed to save report: {e}[/bold red]"
+                                )
+                                raise RuntimeError(
+                                    f"Failed to save report to '{output_path}': {e}"
+                                ) from e
+
+            def render_new(final=False):
+                """Print new complete Markdown blocks (everything when final)."""
+                nonlocal unrendered
+                if final:
+                    blocks, unrendered = unrendered, ""
+                else:
+                    blocks, unrendered = split_renderable(unrendered)
+                if blocks:
+                    with timer.phase("render"):
+                        self.console.print(Markdown(blocks))
 
-        self.interaction_id = interaction.id
-        current_status = interaction.status
-        poll_count = 0
-        poll_errors = 0
-        max_poll_errors = 3
-        max_polls = 720  # ~1 hour at 5s intervals
-
-        def generate_view():
-            return Panel(
-                Spinner("dots", style="magenta", text=f"Status: {current_status}"),
-                title="Deep Research Agent (Polling)",
-                border_style="blue",
-                padding=(0, 1),
-            )
+            try:
+                # Create the interaction
+                try:
+                    with timer.phase("network"):
+                        interaction = self._call_api(
+                            self.client.interactions.create,
+                            cancel_token,
+                            **create_kwargs,
+                        )
+                except ResearchCancelled:
+                    raise
+                except Exception as e:
+                    self.console.print(
+                        f"[bold red]Failed to start research: {e}[/bold red]"
+                    )
+                    raise
 
-        with Live(generate_view(), refresh_per_second=4, console=self.console) as live:
-            while current_status == "in_progress":
-                if poll_count >= max_polls:
-                    timeout_msg = (
-                        f"Research timed out after {poll_count * poll_interval}s"
+                self.interaction_id = interaction.id
+                current_status = interaction.status
+                consume(interaction)
+                poll_count = 0
+                poll_errors = 0
+                max_poll_errors = 3
+                max_polls = 720  # ~1 hour at 5s intervals
+
+                def generate_view():
+                    status = f"Status: {current_status}"
+                    if report_chunks:
+                        received = sum(len(chunk) for chunk in report_chunks)
+                        status += f" · {received:,} characters received"
+                    return Panel(
+                        Spinner("dots", style="magenta", text=status),
+                        title="Deep Research Agent (Polling)",
+                        border_style="blue",
+                        padding=(0, 1),
                     )
-                    self.console.print(f"[bold red]{timeout_msg}[/bold red]")
-                    raise TimeoutError(timeout_msg)
 
-                time.sleep(poll_interval)
-                poll_count += 1
+                with Live(
+                    generate_view(), refresh_per_second=4, console=self.console
+                ) as live:
+                    while current_status == "in_progress":
+                        if poll_count >= max_polls:
+                            timeout_msg = (
+                                "Research timed out after "
+                                f"{poll_count * poll_interval}s"
+                            )
+                            self.console.print(f"[bold red]{timeout_msg}[/bold red]")
+                            raise TimeoutError(timeout_msg)
 
-                try:
-                    interaction = self.client.interactions.get(id=self.interaction_id)
-                    poll_errors = 0  # Reset on success
-                except (ConnectionError, TimeoutError, OSError) as e:
-                    poll_errors += 1
-                    if poll_errors >= max_poll_errors:
-                        self.console.print(
-                            f"[bold red]Polling failed after {max_poll_errors} "
-                            f"errors: {e}[/bold red]"
-                        )
-                        raise
-                    self.console.print(f"[yellow]Poll error: {e}. Retrying...[/yellow]")
-                    continue
+                        with timer.phase("network"):
+                            if cancel_token is None:
+                                time.sleep(poll_interval)
+                            elif cancel_token.wait(poll_interval):
+                                self.console.print(
+                                    f"[yellow]Research stopped: {cancel_token.reason}[/yellow]"
+                                )
+                                self._abort(cancel_token)
+                        poll_count += 1
 
-                current_status = interaction.status
-                live.update(generate_view())
-
-        # Handle final status
-        if current_status == "requires_action":
-            msg = f"Research requires action. Interaction ID: {self.interaction_id}"
-            self.console.print(f"[yellow]{msg}[/yellow]")
-            raise RuntimeError(msg)
-
-        if current_status == "failed":
-            error_msg = getattr(interaction, "error", None) or "Unknown error"
-            self.console.print(f"[bold red]Research failed: {error_msg}[/bold red]")
-            raise RuntimeError(f"Research failed: {error_msg}")
-
-        if current_status == "cancelled":
-            self.console.print("[yellow]Research was cancelled.[/yellow]")
-            raise RuntimeError("Research was cancelled")
-
-        if current_status == "completed":
-            # Extract final report from text outputs
-            if interaction.outputs:
-                # Find all text outputs and concatenate them
-                text_parts = [
-                    output.text
-                    for output in interaction.outputs
-                    if output.type == "text" and output.text
-                ]
-                if text_parts:
-                    report_text = "".join(text_parts)
-                    self.console.print(Markdown(report_text))
-
-                    if output_path:
                         try:
-                            with open(output_path, "w", encoding="utf-8") as f:
-                                f.write(report_text)
-                            self.console.print(
-                                f"\n[green]Report saved to {output_path}[/green]"
-                            )
-                        except OSError as e:
+                            with timer.phase("network"):
+                                interaction = self._call_api(
+                                    self.client.interactions.get,
+                                    cancel_token,
+                                    id=self.interaction_id,
+                                )
+                            poll_errors = 0  # Reset on success
+                        except (ConnectionError, TimeoutError, OSError) as e:
+                            poll_errors += 1
+                            usage_entry.retries += 1
+                            if poll_errors >= max_poll_errors:
+                                self.console.print(
+                                    f"[bold red]Polling failed after {max_poll_errors} "
+                                    f"errors: {e}[/bold red]"
+                                )
+                                raise
                             self.console.print(
-                                f"[bold red]Failed to save report: {e}[/bold red]"
+                                f"[yellow]Poll error: {e}. Retrying...[/yellow]"
                             )
-                            raise RuntimeError(
-                                f"Failed to save report to '{output_path}': {e}"
-                            ) from e
-                else:
+                            continue
+
+                        current_status = interaction.status
+                        consume(interaction)
+                        # Printed above the status panel, so only new text renders
+                        render_new()
+                        with timer.phase("render"):
+                            live.update(generate_view())
+
+                render_new(final=True)
+            finally:
+                if report_parser is not None:
+                    report_parser.close()
+                if pipeline is not None:
+                    with timer.phase("io"):
+                        pipeline.close()
+                if out_file:
+                    out_file.close()
+
+            usage_entry.usage = usage_totals(getattr(interaction, "usage", None))
+
+            # Handle final status
+            if current_status == "requires_action":
+                msg = f"Research requires action. Interaction ID: {self.interaction_id}"
+                self.console.print(f"[yellow]{msg}[/yellow]")
+                raise RuntimeError(msg)
+
+            if current_status == "failed":
+                error_msg = getattr(interaction, "error", None) or "Unknown error"
+                self.console.print(f"[bold red]Research failed: {error_msg}[/bold red]")
+                raise RuntimeError(f"Research failed: {error_msg}")
+
+            if current_status == "cancelled":
+                self.console.print("[yellow]Research was cancelled.[/yellow]")
+                raise ResearchCancelled("cancelled remotely")
+
+            if current_status == "completed":
+                if not interaction.outputs:
+                    msg = "Research completed but no output was received"
+                    self.console.print(f"[yellow]{msg}[/yellow]")
+                    raise RuntimeError(msg)
+                if not report_chunks:
                     msg = "Research completed but no text output was received"
                     self.console.print(f"[yellow]{msg}[/yellow]")
                     raise RuntimeError(msg)
-            else:
-                msg = "Research completed but no output was received"
-                self.console.print(f"[yellow]{msg}[/yellow]")
-                raise RuntimeError(msg)
+
+                if output_path:
+                    self.console.print(
+                        f"\n[green]Report saved to {output_path}[/green]"
+                    )
+                result = ResearchResult(
+                    prompt,
+                    "completed",
+                    interaction_id=self.interaction_id,
+                    chunks=report_chunks,
+                    timings=_timings(started, first_text_at),
+                )
+                with timer.phase("io"):
+                    self._record_completion(
+                        prompt,
+                        result.report,
+                        agent_config=agent_config,
+                        model=model,
+                        timings=result.timings,
+                    )
+                return result
@@ -0,0 +1,263 @@
+import codecs
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from dataclasses import asdict, dataclass, field
+
+INDEX_FILENAME = "index.jsonl"
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".rfa"
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def request_hash(prompt, agent_name=None, agent_config=None, model=None) -> str:
+    """Stable hash identifying a research request (prompt + agent settings)."""
+    payload = json.dumps(
+        {
+            "prompt": prompt,
+            "agent_name": agent_name,
+            "agent_config": agent_config,
+            "model": model,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ArchiveEntry:
+    """Index record locating one archived report inside a segment file."""
+
+    request_hash: str
+    segment: str
+    offset: int
+    length: int
+    size: int
+    interaction_id: str | None = None
+    agent_name: str | None = None
+    source: str | None = None
+    created_at: float = field(default_factory=time.time)
+    timings: dict = field(default_factory=dict)
+    events_offset: int | None = None
+    events_length: int | None = None
+
+
+class ReportArchive:
+    """Append-only store of compressed reports in rolling segment files.
+
+    Each report (and its optional event log) is written as an independent zlib
+    stream so it can be located by offset and decompressed on its own. An
+    append-only ``index.jsonl`` is loaded into memory on open, giving O(1)
+    lookups by interaction ID or request hash.
+    """
+
+    def __init__(
+        self,
+        root,
+        *,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        compresslevel: int = 6,
+        store_events: bool = False,
+    ):
+        self.root = root
+        self.segment_size = segment_size
+        self.compresslevel = compresslevel
+        self.store_events = store_events
+        self._lock = threading.Lock()
+        self._by_interaction: dict[str, ArchiveEntry] = {}
+        self._by_hash: dict[str, ArchiveEntry] = {}
+        self._entries: list[ArchiveEntry] = []
+        os.makedirs(root, exist_ok=True)
+        self._index_path = os.path.join(root, INDEX_FILENAME)
+        self._load_index()
+        self._segment_number = self._last_segment_number()
+
+    def _load_index(self):
+        if not os.path.exists(self._index_path):
+            return
+        with open(self._index_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = ArchiveEntry(**json.loads(line))
+                except (json.JSONDecodeError, TypeError):
+                    # A torn final line from an interrupted write; the segment
+                    # bytes it pointed to are simply unreachable.
+                    continue
+                self._remember(entry)
+
+    def _remember(self, entry):
+        self._entries.append(entry)
+        self._by_hash[entry.request_hash] = entry
+        if entry.interaction_id:
+            self._by_interaction[entry.interaction_id] = entry
+
+    def _last_segment_number(self):
+        numbers = [
+            int(name[len(SEGMENT_PREFIX) : -len(SEGMENT_SUFFIX)])
+            for name in os.listdir(self.root)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        ]
+        return max(numbers, default=0)
+
+    def _segment_name(self, number):
+        return f"{SEGMENT_PREFIX}{number:05d}{SEGMENT_SUFFIX}"
+
+    def _compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.compresslevel)
+
+    def _append_blobs(self, blobs):
+        """Append blobs to the active segment, rolling over when it is full."""
+        name = self._segment_name(self._segment_number)
+        path = os.path.join(self.root, name)
+        current_size = os.path.getsize(path) if os.path.exists(path) else 0
+        if current_size and current_size + sum(map(len, blobs)) > self.segment_size:
+            self._segment_number += 1
+            name = self._segment_name(self._segment_number)
+            path = os.path.join(self.root, name)
+
+        offsets = []
+        with open(path, "ab") as f:
+            offset = f.tell()
+            for blob in blobs:
+                f.write(blob)
+                offsets.append(offset)
+                offset += len(blob)
+        return name, offsets
+
+    def add(
+        self,
+        report: str,
+        *,
+        prompt=None,
+        interaction_id=None,
+        agent_name=None,
+        agent_config=None,
+        model=None,
+        timings=None,
+        events=None,
+        source=None,
+    ) -> ArchiveEntry:
+        """Compress and append a report (and optional event log) to the archive.
+
+        Args:
+            report: Full report text.
+            prompt: Prompt that produced the report; used for the request hash.
+            interaction_id: Interaction that produced the report.
+            agent_name: Agent (or model) name used.
+            agent_config: Agent config used; part of the request hash.
+            model: Model used for follow-ups; part of the request hash.
+            timings: Dict of timing metrics (seconds).
+            events: Optional iterable of JSON-serializable event dicts. Only
+                stored when the archive was opened with ``store_events=True``.
+            source: Optional origin (e.g. the Markdown path it was imported from).
+
+        Returns:
+            ArchiveEntry: The index record for the new report.
+        """
+        report_blob = self._compress(report.encode("utf-8"))
+        blobs = [report_blob]
+        if events is not None and self.store_events:
+            log = "".join(json.dumps(event) + "\n" for event in events)
+            blobs.append(self._compress(log.encode("utf-8")))
+
+        key = request_hash(
+            prompt if prompt is not None else report, agent_name, agent_config, model
+        )
+        with self._lock:
+            segment, offsets = self._append_blobs(blobs)
+            entry = ArchiveEntry(
+                request_hash=key,
+                segment=segment,
+                offset=offsets[0],
+                length=len(report_blob),
+                size=len(report),
+                interaction_id=interaction_id,
+                agent_name=agent_name or model,
+                source=source,
+                timings=timings or {},
+            )
+            if len(blobs) > 1:
+                entry.events_offset = offsets[1]
+                entry.events_length = len(blobs[1])
+            with open(self._index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(asdict(entry)) + "\n")
+            self._remember(entry)
+        return entry
+
+    def import_file(self, path) -> ArchiveEntry:
+        """Archive an existing Markdown report, keyed by its content."""
+        with open(path, encoding="utf-8") as f:
+            report = f.read()
+        return self.add(report, source=os.path.abspath(path))
+
+    def get(self, key) -> ArchiveEntry | None:
+        """Look up an entry by interaction ID or request hash."""
+        return self._by_interaction.get(key) or self._by_hash.get(key)
+
+    def entries(self) -> list[ArchiveEntry]:
+        return list(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _iter_blob(self, segment, offset, length):
+        decompressor = zlib.decompressobj()
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        with open(os.path.join(self.root, segment), "rb") as f:
+            f.seek(offset)
+            remaining = length
+            while remaining:
+                chunk = f.read(min(READ_CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise RuntimeError(f"Archive segment '{segment}' is truncated")
+                remaining -= len(chunk)
+                text = decoder.decode(decompressor.decompress(chunk))
+                if text:
+                    yield text
+        tail = decoder.decode(decompressor.flush(), final=True)
+        if tail:
+            yield tail
+
+    def iter_report(self, key):
+        """Yield a report's text in chunks without decompressing it all at once.
+
+        Raises:
+            KeyError: If no report matches the key.
+        """
+        entry = self.get(key)
+        if entry is None:
+            raise KeyError(key)
+        yield from self._iter_blob(entry.segment, entry.offset, entry.length)
+
+    def read_report(self, key) -> str:
+        return "".join(self.iter_report(key))
+
+    def iter_events(self, key):
+        """Yield the stored event log for a report, one dict per event.
+
+        Raises:
+            KeyError: If no report matches the key.
+        """
+        entry = self.get(key)
+        if entry is None:
+            raise KeyError(key)
+        if entry.events_offset is None:
+            return
+        pending = ""
+        for text in self._iter_blob(
+            entry.segment, entry.events_offset, entry.events_length
+        ):
+            pending += text
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                if line:
+                    yield json.loads(line)
+        if pending:
+            yield json.loads(pending)
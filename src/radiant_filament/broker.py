@@ -0,0 +1,317 @@
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+from collections import deque
+
+from rich.console import Console
+
+from .agent import DeepResearchAgent
+from .events import StreamEvent
+
+DEFAULT_SOCKET_PATH = os.path.expanduser("~/.radiant-filament/broker.sock")
+DEFAULT_REPLAY_BUFFER = 10_000
+SUBSCRIBER_QUEUE_SIZE = 1024
+
+_END = object()
+# Sent after an interaction's last event; EOF without it means the broker died
+STREAM_END = "stream.end"
+
+try:
+    _UnixStreamServer = socketserver.ThreadingUnixStreamServer
+except AttributeError:  # Not available on Windows: no broker or attach
+    _UnixStreamServer = None
+
+
+class BrokerDisconnected(ConnectionError):
+    """Raised when the broker connection ends before the interaction does."""
+
+
+def _require_unix_sockets():
+    if _UnixStreamServer is None:
+        raise OSError("The event broker needs Unix domain sockets")
+
+
+class _Subscriber:
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.lagged = False
+
+
+class _Channel:
+    """One upstream stream for an interaction, multicast to local subscribers.
+
+    Every event is kept in a bounded replay buffer so late joiners see the run
+    from the start (or from the oldest retained event) before going live.
+    """
+
+    def __init__(self, interaction_id, buffer_size):
+        self.interaction_id = interaction_id
+        self.buffer = deque(maxlen=buffer_size)
+        self.dropped = 0
+        self.finished = False
+        self.abandoned = False  # Every reader left; the pump should stop
+        self.readers = 0
+        self.subscribers: set[_Subscriber] = set()
+        self.lock = threading.Lock()
+
+    def publish(self, entry):
+        with self.lock:
+            if len(self.buffer) == self.buffer.maxlen:
+                self.dropped += 1
+            self.buffer.append(entry)
+            for subscriber in list(self.subscribers):
+                try:
+                    subscriber.queue.put_nowait(entry)
+                except queue.Full:
+                    # Never let one slow reader hold up the others
+                    subscriber.lagged = True
+                    self.subscribers.discard(subscriber)
+
+    def finish(self):
+        with self.lock:
+            self.finished = True
+            for subscriber in self.subscribers:
+                try:
+                    subscriber.queue.put_nowait(_END)
+                except queue.Full:
+                    subscriber.lagged = True
+            self.subscribers.clear()
+
+    def subscribe(self):
+        """Snapshot the replay buffer and register for live events atomically."""
+        subscriber = _Subscriber()
+        with self.lock:
+            self.readers += 1
+            snapshot = list(self.buffer)
+            if self.finished:
+                subscriber.queue.put_nowait(_END)
+            else:
+                self.subscribers.add(subscriber)
+            return snapshot, self.dropped, subscriber
+
+    def unsubscribe(self, subscriber):
+        """Drop a reader; return True if it was the last one."""
+        with self.lock:
+            self.subscribers.discard(subscriber)
+            self.readers -= 1
+            return not self.readers
+
+
+class _BrokerHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline() or "null")
+            interaction_id = request["attach"]
+        except (ValueError, TypeError, KeyError):
+            return
+        try:
+            for entry in self.server.broker.subscribe(interaction_id):
+                self.wfile.write(json.dumps(entry).encode("utf-8") + b"\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+if _UnixStreamServer is not None:
+
+    class _BrokerServer(_UnixStreamServer):
+        daemon_threads = True
+
+        def server_close(self):
+            super().server_close()
+            try:
+                os.unlink(self.server_address)
+            except FileNotFoundError:
+                pass
+
+
+class EventBroker:
+    """Keeps one upstream stream per interaction and fans it out locally.
+
+    The first subscriber for an interaction opens the upstream stream (via
+    :meth:`DeepResearchAgent.attach_stream`, so reconnects are handled once for
+    everyone); later subscribers share it. Events are event-log dicts, as
+    produced by :meth:`StreamEvent.to_log_entry`. A subscriber that falls more
+    than ``SUBSCRIBER_QUEUE_SIZE`` events behind is disconnected with a
+    ``subscriber.lagged`` notice and can re-attach to replay.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        *,
+        buffer_size: int = DEFAULT_REPLAY_BUFFER,
+        console: Console | None = None,
+    ):
+        self.client = client
+        self.buffer_size = buffer_size
+        self.console = console or Console(stderr=True)
+        self._channels: dict[str, _Channel] = {}
+        self._lock = threading.Lock()
+        self.upstreams_opened = 0
+
+    def _join(self, interaction_id):
+        """Subscribe to an interaction's channel, opening it if needed.
+
+        Runs under the broker lock so a channel cannot be dropped by
+        :meth:`_release` between being looked up and being subscribed to.
+        """
+        with self._lock:
+            channel = self._channels.get(interaction_id)
+            if channel is None:
+                channel = _Channel(interaction_id, self.buffer_size)
+                self._channels[interaction_id] = channel
+                self.upstreams_opened += 1
+                threading.Thread(
+                    target=self._pump,
+                    args=(channel,),
+                    name=f"broker-{interaction_id}",
+                    daemon=True,
+                ).start()
+            return channel, *channel.subscribe()
+
+    def _drop(self, channel):
+        # Caller holds self._lock
+        if self._channels.get(channel.interaction_id) is channel:
+            del self._channels[channel.interaction_id]
+
+    def _pump(self, channel):
+        agent = DeepResearchAgent(client=self.client)
+        agent.console = self.console
+        events = agent.attach_stream(channel.interaction_id)
+        try:
+            for event in events:
+                if channel.abandoned:
+                    break
+                channel.publish(StreamEvent.from_sdk(event).to_log_entry())
+        except Exception as e:
+            channel.publish({"type": "error", "event_id": None, "error": str(e)})
+        finally:
+            events.close()  # Closes the upstream stream if we stopped early
+            channel.finish()
+            with self._lock:
+                if not channel.readers:
+                    self._drop(channel)
+
+    def _release(self, channel, subscriber):
+        with self._lock:
+            if channel.unsubscribe(subscriber):
+                # Nobody is reading: stop the upstream and free the replay
+                # buffer. A later subscriber opens a fresh channel.
+                channel.abandoned = True
+                self._drop(channel)
+
+    def subscribe(self, interaction_id):
+        """Yield every event of an interaction: buffered replay, then live.
+
+        A ``stream.end`` entry follows the last event once the upstream stream
+        has finished; a lagging subscriber gets ``subscriber.lagged`` instead.
+        """
+        channel, snapshot, dropped, subscriber = self._join(interaction_id)
+        try:
+            if dropped:
+                yield {"type": "replay.truncated", "event_id": None, "dropped": dropped}
+            yield from snapshot
+            while True:
+                try:
+                    entry = subscriber.queue.get(timeout=0.5)
+                except queue.Empty:
+                    if subscriber.lagged:
+                        entry = None
+                    else:
+                        continue
+                if entry is _END:
+                    yield {"type": STREAM_END, "event_id": None}
+                    return
+                if entry is None:
+                    yield {"type": "subscriber.lagged", "event_id": None}
+                    return
+                yield entry
+        finally:
+            self._release(channel, subscriber)
+
+    def serve(self, socket_path: str = DEFAULT_SOCKET_PATH):
+        """Create (but do not start) a Unix socket server for this broker.
+
+        Clients send one JSON line, ``{"attach": "<interaction_id>"}``, and
+        receive events as JSON lines until the interaction ends.
+
+        A stale socket file left by a dead broker is replaced; a live one is
+        left alone.
+
+        Raises:
+            OSError: If this platform has no Unix domain sockets, or another
+                broker is already listening on socket_path.
+        """
+        _require_unix_sockets()
+        os.makedirs(os.path.dirname(socket_path) or ".", exist_ok=True)
+        if _listening(socket_path):
+            raise OSError(f"A broker is already listening on {socket_path}")
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = _BrokerServer(socket_path, _BrokerHandler)
+        server.broker = self
+        return server
+
+
+def _listening(socket_path):
+    """Return True if a process accepts connections on socket_path."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return False
+    return True
+
+
+def ensure_broker(socket_path: str = DEFAULT_SOCKET_PATH, **kwargs):
+    """Start an embedded broker unless one is already listening on socket_path.
+
+    Returns:
+        The started server (call ``shutdown()`` when done), or None if another
+        process already serves the socket. Keyword arguments go to EventBroker.
+
+    Raises:
+        OSError: If this platform has no Unix domain sockets.
+    """
+    _require_unix_sockets()
+    if _listening(socket_path):
+        return None
+    server = EventBroker(**kwargs).serve(socket_path)
+    threading.Thread(target=server.serve_forever, name="broker", daemon=True).start()
+    return server
+
+
+def attach(interaction_id: str, socket_path: str = DEFAULT_SOCKET_PATH):
+    """Subscribe to an interaction through a running broker.
+
+    Yields:
+        StreamEvent records, replayed then live. Broker notices arrive as
+        ``replay.truncated`` and ``subscriber.lagged`` events.
+
+    Raises:
+        OSError: If no broker is listening on socket_path, or this platform
+            has no Unix domain sockets.
+        BrokerDisconnected: If the connection closes before the interaction
+            has finished (for example, the broker process exited).
+    """
+    _require_unix_sockets()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps({"attach": interaction_id}).encode("utf-8") + b"\n")
+        with sock.makefile("r", encoding="utf-8") as lines:
+            for line in lines:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # Torn line: the broker went away mid-write
+                if entry.get("type") == STREAM_END:
+                    return
+                event = StreamEvent.from_log_entry(entry)
+                yield event
+                if event.event_type == "subscriber.lagged":
+                    return
+    raise BrokerDisconnected("Broker closed the connection before the stream ended")
@@ -0,0 +1,95 @@
+import threading
+import time
+
+
+class ResearchCancelled(RuntimeError):
+    """Raised when a research run is stopped by its cancellation token."""
+
+    def __init__(self, reason: str = "cancelled"):
+        super().__init__(f"Research {reason}")
+        self.reason = reason
+
+
+class CancellationToken:
+    """Thread-safe cancellation signal with an optional wall-clock deadline.
+
+    Callbacks registered with :meth:`add_callback` run once, on the thread that
+    cancels (the deadline timer for deadlines). They are used to close blocked
+    streams so cancellation takes effect immediately rather than at the next
+    event.
+    """
+
+    def __init__(self, deadline: float | None = None):
+        """
+        Args:
+            deadline: Seconds from now after which the token cancels itself.
+        """
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+        self.reason = None
+        self.deadline_at = None
+        self._timer = None
+        if deadline is not None:
+            if deadline <= 0:
+                raise ValueError("deadline must be positive")
+            self.deadline_at = time.monotonic() + deadline
+            self._timer = threading.Timer(
+                deadline, self.cancel, args=(f"deadline of {deadline:g}s exceeded",)
+            )
+            self._timer.daemon = True
+            self._timer.start()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def remaining(self) -> float | None:
+        """Seconds until the deadline, or None if there is no deadline."""
+        if self.deadline_at is None:
+            return None
+        return max(self.deadline_at - time.monotonic(), 0.0)
+
+    def cancel(self, reason: str = "cancelled"):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        if self._timer is not None:
+            self._timer.cancel()
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback):
+        """Run callback on cancellation (immediately if already cancelled).
+
+        Returns:
+            Callable that unregisters the callback.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+
+                def unregister():
+                    with self._lock:
+                        if callback in self._callbacks:
+                            self._callbacks.remove(callback)
+
+                return unregister
+        callback()
+        return lambda: None
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to timeout seconds; return True as soon as cancelled."""
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise ResearchCancelled(self.reason)
+
+    def close(self):
+        """Stop the deadline timer without cancelling."""
+        if self._timer is not None:
+            self._timer.cancel()
@@ -0,0 +1,326 @@
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from rich.console import Console
+
+from .agent import DeepResearchAgent
+from .cancellation import CancellationToken
+from .ratelimit import RateLimiter
+
+BASE_STEP_ID = "base"
+# Step ids name the per-step report files written by write_bundle
+STEP_ID = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+
+class ChainSpecError(ValueError):
+    """Raised when a chain spec is malformed."""
+
+
+@dataclass
+class ChainStep:
+    id: str
+    prompt: str
+    after: str | None = None
+    model: str | None = None
+    agent_name: str | None = None
+    agent_config: dict | None = None
+    tools: list | None = None
+
+
+@dataclass
+class StepResult:
+    id: str
+    after: str | None
+    status: str = "pending"
+    interaction_id: str | None = None
+    text: str = ""
+    error: str | None = None
+    duration: float | None = None
+    path: str | None = None
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "after": self.after,
+            "status": self.status,
+            "interaction_id": self.interaction_id,
+            "error": self.error,
+            "duration": self.duration,
+            "path": self.path,
+        }
+
+
+@dataclass
+class ChainSpec:
+    steps: list[ChainStep]
+    agent_name: str | None = None
+    children: dict[str, list[str]] = field(default_factory=dict)
+
+    @property
+    def base(self) -> ChainStep:
+        return self.steps[0]
+
+
+def _parse_step(raw, index, previous_id):
+    if not isinstance(raw, dict):
+        raise ChainSpecError(f"Step {index} must be an object")
+    prompt = raw.get("prompt")
+    if not prompt or not isinstance(prompt, str):
+        raise ChainSpecError(f"Step {index} is missing a 'prompt'")
+    agent_config = raw.get("agent_config")
+    if agent_config is not None and not isinstance(agent_config, dict):
+        raise ChainSpecError(f"Step {index}: 'agent_config' must be an object")
+    step_id = str(raw.get("id") or f"step-{index}")
+    if not STEP_ID.match(step_id):
+        raise ChainSpecError(
+            f"Step {index}: id '{step_id}' must be letters, digits, '.', '_' or '-'"
+        )
+    return ChainStep(
+        id=step_id,
+        prompt=prompt,
+        after=str(raw.get("after") or previous_id),
+        model=raw.get("model"),
+        agent_name=raw.get("agent_name"),
+        agent_config=agent_config,
+        tools=raw.get("tools"),
+    )
+
+
+def parse_chain_spec(data) -> ChainSpec:
+    """Build a ChainSpec from a decoded JSON/YAML document.
+
+    The document holds the base research (``prompt``, optional ``agent_config``,
+    ``agent_name`` and ``tools``) plus an ordered ``steps`` list. Each step
+    continues from the step listed before it unless ``after`` names another
+    step id (or ``"base"``), so siblings sharing a parent form parallel branches.
+
+    Raises:
+        ChainSpecError: If the document is not a valid chain spec.
+    """
+    if not isinstance(data, dict):
+        raise ChainSpecError("Chain spec must be an object")
+    if data.get("model"):
+        raise ChainSpecError(
+            "The base step cannot use 'model'; models are only valid for follow-ups"
+        )
+
+    base = _parse_step({**data, "id": BASE_STEP_ID}, 0, None)
+    base.after = None
+    steps = [base]
+
+    raw_steps = data.get("steps") or []
+    if not isinstance(raw_steps, list):
+        raise ChainSpecError("'steps' must be a list")
+
+    seen = {BASE_STEP_ID}
+    previous_id = BASE_STEP_ID
+    for index, raw in enumerate(raw_steps, start=1):
+        step = _parse_step(raw, index, previous_id)
+        if step.id in seen:
+            raise ChainSpecError(f"Duplicate step id '{step.id}'")
+        if step.after not in seen:
+            raise ChainSpecError(
+                f"Step '{step.id}' follows unknown or later step '{step.after}'"
+            )
+        seen.add(step.id)
+        steps.append(step)
+        previous_id = step.id
+
+    children = {step.id: [] for step in steps}
+    for step in steps[1:]:
+        children[step.after].append(step.id)
+
+    return ChainSpec(steps=steps, agent_name=data.get("agent_name"), children=children)
+
+
+def load_spec_document(path, error=ChainSpecError):
+    """Read and decode a JSON or YAML spec file (YAML by .yaml/.yml suffix).
+
+    Raises:
+        error: If the file cannot be read or parsed.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+    except OSError as e:
+        raise error(f"Cannot read '{path}': {e}") from None
+
+    if path.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError:
+            raise error(
+                "YAML specs require PyYAML; install radiant-filament[yaml] or use JSON"
+            ) from None
+        try:
+            return yaml.safe_load(content)
+        except yaml.YAMLError as e:
+            raise error(f"Invalid YAML in '{path}': {e}") from None
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError as e:
+        raise error(f"Invalid JSON in '{path}': {e}") from None
+
+
+def load_chain_spec(path) -> ChainSpec:
+    """Load a chain spec from a JSON or YAML file.
+
+    Raises:
+        ChainSpecError: If the file cannot be read or parsed.
+    """
+    return parse_chain_spec(load_spec_document(path))
+
+
+class ChainRunner:
+    """Executes a chain spec, threading interaction IDs between steps.
+
+    Sibling steps (same ``after``) run concurrently once their parent has
+    completed. A failed step marks its descendants as skipped. Cancelling
+    ``cancel_token`` (or reaching its deadline) cancels every running step
+    server-side and skips the rest. A shared ``rate_limiter`` keeps the
+    concurrent branches under one request budget.
+    """
+
+    def __init__(
+        self,
+        spec: ChainSpec,
+        *,
+        client=None,
+        agent_name: str = "deep-research-pro-preview-12-2025",
+        max_workers: int = 4,
+        console: Console | None = None,
+        cancel_token: CancellationToken | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        self.spec = spec
+        self.cancel_token = cancel_token or CancellationToken()
+        self.client = client
+        self.agent_name = spec.agent_name or agent_name
+        self.max_workers = max_workers
+        self.console = console or Console()
+        self.rate_limiter = rate_limiter
+        self.results = {
+            step.id: StepResult(id=step.id, after=step.after) for step in spec.steps
+        }
+        self._steps = {step.id: step for step in spec.steps}
+
+    def _make_agent(self, step):
+        agent = DeepResearchAgent(
+            agent_name=step.agent_name or self.agent_name,
+            client=self.client,
+            rate_limiter=self.rate_limiter,
+        )
+        agent.console = self.console
+        return agent
+
+    def _run_step(self, step, previous_interaction_id):
+        result = self.results[step.id]
+        result.status = "running"
+        agent = self._make_agent(step)
+        outcome = agent.stream_research(
+            step.prompt,
+            agent_config=step.agent_config,
+            previous_interaction_id=previous_interaction_id,
+            model=step.model,
+            tools=step.tools,
+            cancel_token=self.cancel_token,
+        ).result
+        result.status = outcome.status
+        result.error = outcome.error
+        result.duration = outcome.timings["duration"]
+        result.interaction_id = outcome.interaction_id
+        result.text = outcome.report
+        return result
+
+    def _skip_descendants(self, step_id):
+        for child_id in self.spec.children[step_id]:
+            self.results[child_id].status = "skipped"
+            self._skip_descendants(child_id)
+
+    def run(self) -> dict[str, StepResult]:
+        """Run every step and return results keyed by step id."""
+        pending = 0
+        done = threading.Condition()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+
+            def submit(step_id, parent_interaction_id):
+                nonlocal pending
+                with done:
+                    pending += 1
+                future = executor.submit(
+                    self._run_step, self._steps[step_id], parent_interaction_id
+                )
+                future.add_done_callback(lambda f: on_done(step_id, f))
+
+            def on_done(step_id, future):
+                nonlocal pending
+                try:
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # Executor done-callbacks swallow exceptions; record it
+                        result = self.results[step_id]
+                        result.status = "failed"
+                        result.error = str(e) or type(e).__name__
+                    if result.status == "completed" and self.cancel_token.cancelled:
+                        self._skip_descendants(result.id)
+                    elif result.status == "completed":
+                        self.console.print(
+                            f"[green]✓ {result.id}[/green] "
+                            f"({result.duration:.1f}s, "
+                            f"interaction {result.interaction_id})"
+                        )
+                        for child_id in self.spec.children[result.id]:
+                            submit(child_id, result.interaction_id)
+                    else:
+                        self.console.print(f"[red]✗ {result.id}: {result.error}[/red]")
+                        self._skip_descendants(result.id)
+                finally:
+                    with done:
+                        pending -= 1
+                        done.notify_all()
+
+            submit(BASE_STEP_ID, None)
+            try:
+                with done:
+                    done.wait_for(lambda: pending == 0)
+            except KeyboardInterrupt:
+                self.cancel_token.cancel("cancelled by user")
+                raise
+
+        return self.results
+
+    def write_bundle(self, output_dir) -> str:
+        """Write each step's report plus a combined bundle.md and bundle.json.
+
+        Returns:
+            str: Path to the bundle.json manifest.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        sections = []
+        for step in self.spec.steps:
+            result = self.results[step.id]
+            if result.status == "completed":
+                result.path = os.path.join(output_dir, f"{step.id}.md")
+                with open(result.path, "w", encoding="utf-8") as f:
+                    f.write(result.text)
+                sections.append(f"# {step.id}\n\n> {step.prompt}\n\n{result.text}")
+
+        with open(os.path.join(output_dir, "bundle.md"), "w", encoding="utf-8") as f:
+            f.write("\n\n---\n\n".join(sections))
+
+        manifest_path = os.path.join(output_dir, "bundle.json")
+        manifest = {
+            "steps": [
+                {**self.results[step.id].to_dict(), "prompt": step.prompt}
+                for step in self.spec.steps
+            ]
+        }
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        return manifest_path
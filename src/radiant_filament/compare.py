@@ -0,0 +1,222 @@
+import json
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+from rich.text import Text
+
+from .agent import DeepResearchAgent
+from .cancellation import CancellationToken
+from .ratelimit import RateLimiter
+from .report_parser import ReportParser
+
+
+@dataclass
+class Variant:
+    agent_name: str
+    agent_config: dict | None = None
+
+    @property
+    def name(self) -> str:
+        if not self.agent_config:
+            return self.agent_name
+        config = json.dumps(self.agent_config, sort_keys=True, separators=(",", ":"))
+        return f"{self.agent_name} {config}"
+
+
+@dataclass
+class RunResult:
+    variant: str
+    prompt: str
+    status: str = "pending"
+    interaction_id: str | None = None
+    time_to_first_text: float | None = None
+    duration: float | None = None
+    report_chars: int = 0
+    citations: int = 0
+    reconnects: int = 0
+    stalls: int = 0
+    error: str | None = None
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def build_matrix(agent_names, agent_configs) -> list[Variant]:
+    """Every agent name crossed with every config (None = agent defaults)."""
+    return [
+        Variant(agent_name=name, agent_config=config)
+        for name in agent_names
+        for config in (agent_configs or [None])
+    ]
+
+
+def _median(values):
+    values = [v for v in values if v is not None]
+    return round(statistics.median(values), 3) if values else None
+
+
+def summarize(results: list[RunResult]) -> list[dict]:
+    """Aggregate per-variant metrics over completed runs, fastest first."""
+    by_variant: dict[str, list[RunResult]] = {}
+    for result in results:
+        by_variant.setdefault(result.variant, []).append(result)
+    rows = []
+    for variant, runs in by_variant.items():
+        done = [r for r in runs if r.status == "completed"]
+        rows.append(
+            {
+                "variant": variant,
+                "runs": len(runs),
+                "completed": len(done),
+                "median_time_to_first_text": _median(
+                    [r.time_to_first_text for r in done]
+                ),
+                "median_duration": _median([r.duration for r in done]),
+                "mean_report_chars": (
+                    round(statistics.mean(r.report_chars for r in done))
+                    if done
+                    else None
+                ),
+                "mean_citations": (
+                    round(statistics.mean(r.citations for r in done), 1)
+                    if done
+                    else None
+                ),
+                "reconnects": sum(r.reconnects for r in runs),
+            }
+        )
+    rows.sort(key=lambda row: (row["median_duration"] is None, row["median_duration"]))
+    return rows
+
+
+class ComparisonRunner:
+    """Runs every prompt against every variant concurrently and measures each run.
+
+    Per run it records time to first report text, total duration, report
+    length, distinct citations and stream reconnects. Cancelling
+    ``cancel_token`` cancels every running interaction server-side.
+    """
+
+    def __init__(
+        self,
+        prompts: list[str],
+        variants: list[Variant],
+        *,
+        client=None,
+        max_workers: int = 4,
+        console: Console | None = None,
+        cancel_token: CancellationToken | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        self.prompts = prompts
+        self.variants = variants
+        self.client = client
+        self.max_workers = max_workers
+        self.console = console or Console()
+        self.cancel_token = cancel_token or CancellationToken()
+        self.rate_limiter = rate_limiter
+        self.results: list[RunResult] = []
+
+    def _run_one(self, variant, prompt):
+        result = RunResult(variant=variant.name, prompt=prompt, status="running")
+        agent = DeepResearchAgent(
+            agent_name=variant.agent_name,
+            client=self.client,
+            rate_limiter=self.rate_limiter,
+        )
+        agent.console = self.console
+        outcome = agent.stream_research(
+            prompt,
+            agent_config=variant.agent_config,
+            cancel_token=self.cancel_token,
+        ).result
+        parser = ReportParser()
+        for chunk in outcome.chunks:
+            parser.feed(chunk)
+        parser.close()
+        metrics = outcome.metrics
+        result.status = outcome.status
+        result.error = outcome.error
+        result.interaction_id = outcome.interaction_id
+        result.duration = metrics["duration"]
+        result.time_to_first_text = metrics.get("time_to_first_text")
+        result.report_chars = metrics["report_chars"]
+        result.citations = len(parser.citations)
+        result.reconnects = metrics["reconnects"]
+        result.stalls = metrics["stalls"]
+        if result.status == "completed":
+            self.console.print(
+                f"[green]✓ {escape(result.variant)}[/green] ({result.duration:.1f}s)"
+            )
+        else:
+            self.console.print(
+                f"[red]✗ {escape(result.variant)}: {escape(result.error)}[/red]"
+            )
+        return result
+
+    def run(self) -> list[RunResult]:
+        """Run the full prompt × variant matrix; results keep matrix order."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._run_one, variant, prompt)
+                for prompt in self.prompts
+                for variant in self.variants
+            ]
+            try:
+                self.results = [future.result() for future in futures]
+            except KeyboardInterrupt:
+                self.cancel_token.cancel("cancelled by user")
+                raise
+        return self.results
+
+    def summary(self) -> list[dict]:
+        return summarize(self.results)
+
+    def to_dict(self) -> dict:
+        return {
+            "prompts": self.prompts,
+            "variants": [
+                {
+                    "name": v.name,
+                    "agent_name": v.agent_name,
+                    "agent_config": v.agent_config,
+                }
+                for v in self.variants
+            ],
+            "summary": self.summary(),
+            "runs": [result.to_dict() for result in self.results],
+        }
+
+    def write_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def _seconds(value):
+    return "-" if value is None else f"{value:.1f}s"
+
+
+def summary_table(rows: list[dict]) -> Table:
+    table = Table(title="Variant comparison")
+    table.add_column("Variant")
+    table.add_column("OK", justify="right")
+    table.add_column("First text", justify="right")
+    table.add_column("Duration", justify="right")
+    table.add_column("Chars", justify="right")
+    table.add_column("Citations", justify="right")
+    table.add_column("Reconnects", justify="right")
+    for row in rows:
+        table.add_row(
+            Text(row["variant"]),
+            f"{row['completed']}/{row['runs']}",
+            _seconds(row["median_time_to_first_text"]),
+            _seconds(row["median_duration"]),
+            "-" if row["mean_report_chars"] is None else str(row["mean_report_chars"]),
+            "-" if row["mean_citations"] is None else str(row["mean_citations"]),
+            str(row["reconnects"]),
+        )
+    return table
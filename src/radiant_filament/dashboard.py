@@ -0,0 +1,315 @@
+import os
+import select
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from rich import box
+from rich.console import Console, Group
+from rich.live import Live
+from rich.markdown import Markdown
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
+
+from .agent import DeepResearchAgent
+from .cancellation import CancellationToken
+from .ratelimit import RateLimiter
+from .result import ResearchResult
+from .viewport import ViewportBuffer
+
+try:
+    import termios
+    import tty
+except ImportError:  # Windows: no key-driven drill-down
+    termios = tty = None
+
+DEFAULT_REFRESH_PER_SECOND = 4
+DEFAULT_TAIL_LINES = 20
+STATUS_STYLES = {
+    "queued": "dim",
+    "running": "cyan",
+    "completed": "green",
+    "failed": "red",
+    "cancelled": "yellow",
+}
+
+
+def _format_bytes(n) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024 or unit == "MB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def _format_elapsed(seconds) -> str:
+    if seconds is None:
+        return "-"
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}:{seconds:02d}"
+
+
+@dataclass(eq=False)
+class DashboardSession:
+    """Live state of one research run on the dashboard.
+
+    Only counters and the report's trailing lines are kept here, so a row (and
+    the drill-down view) costs the same to render whatever the report size.
+    The full report is in ``result`` once the run ends.
+    """
+
+    prompt: str
+    label: str
+    tail_lines: int = DEFAULT_TAIL_LINES
+    kwargs: dict = field(default_factory=dict, repr=False)
+    status: str = "queued"
+    thought: str = ""
+    interaction_id: str | None = None
+    bytes_received: int = 0
+    reconnects: int = 0
+    started_at: float | None = None
+    finished_at: float | None = None
+    error: str | None = None
+    result: ResearchResult | None = field(default=None, repr=False)
+    version: int = 0
+
+    def __post_init__(self):
+        self.tail = ViewportBuffer(self.tail_lines)
+
+    @property
+    def elapsed(self) -> float | None:
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def append(self, text):
+        self.tail.append(text)
+        self.bytes_received += len(text.encode("utf-8"))
+        self.version += 1
+
+    def finish(self, result: ResearchResult):
+        self.result = result
+        self.status = result.status
+        self.error = result.error
+        self.interaction_id = result.interaction_id or self.interaction_id
+        self.finished_at = time.monotonic()
+        self.thought = "" if result.ok else (result.error or "")
+
+
+class ResearchDashboard:
+    """Runs several research sessions under one shared Live display.
+
+    Sessions run concurrently on a thread pool through the UI-free
+    ``stream_research``. Only the calling thread draws, from one refresh loop,
+    so sessions neither fight over the terminal nor each start a refresh
+    thread. Each session gets a compact row; ``focus`` (a session index, or
+    None for the overview) also shows that session's report tail.
+
+    On a terminal, keys switch the drill-down while sessions run: 1-9 open a
+    session, n/p step through them and 0 or Esc return to the overview.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        *,
+        agent_name: str = "deep-research-pro-preview-12-2025",
+        max_workers: int = 4,
+        refresh_per_second: float = DEFAULT_REFRESH_PER_SECOND,
+        tail_lines: int = DEFAULT_TAIL_LINES,
+        console: Console | None = None,
+        cancel_token: CancellationToken | None = None,
+        rate_limiter: RateLimiter | None = None,
+        interactive: bool | None = None,
+    ):
+        self.client = client
+        self.agent_name = agent_name
+        self.max_workers = max_workers
+        self.refresh_per_second = refresh_per_second
+        self.tail_lines = tail_lines
+        self.console = console or Console()
+        self.cancel_token = cancel_token or CancellationToken()
+        self.rate_limiter = rate_limiter
+        if interactive is None:
+            interactive = termios is not None and sys.stdin.isatty()
+        self.interactive = interactive
+        self.sessions: list[DashboardSession] = []
+        self.focus: int | None = None
+        self._report_view = (None, None)
+
+    def add(self, prompt, *, label=None, **kwargs) -> DashboardSession:
+        """Queue a session; kwargs are passed to ``stream_research``."""
+        session = DashboardSession(
+            prompt,
+            label or " ".join(prompt.split()),
+            tail_lines=self.tail_lines,
+            kwargs=kwargs,
+        )
+        self.sessions.append(session)
+        return session
+
+    def _run_session(self, session) -> ResearchResult:
+        agent = DeepResearchAgent(
+            agent_name=self.agent_name,
+            client=self.client,
+            rate_limiter=self.rate_limiter,
+        )
+        # Reconnects are counted on the row instead of printed
+        agent.console = Console(quiet=True)
+        session.status = "running"
+        session.thought = "Connecting..."
+        session.started_at = time.monotonic()
+
+        def on_reconnect(attempt, error):
+            session.reconnects += 1
+            session.thought = f"Reconnecting (attempt {attempt})..."
+
+        stream = agent.stream_research(
+            session.prompt,
+            cancel_token=self.cancel_token,
+            on_reconnect=on_reconnect,
+            **session.kwargs,
+        )
+        for record in stream:
+            if record.event_type == "interaction.start":
+                session.interaction_id = agent.interaction_id
+                session.thought = "Research started..."
+            elif record.kind == "text":
+                session.append(record.text)
+            else:
+                session.thought = record.thought
+        session.finish(stream.result)
+        return session.result
+
+    def handle_key(self, key):
+        """Switch the drill-down view in response to a key press."""
+        count = len(self.sessions)
+        if key.isdigit():
+            index = int(key) - 1
+            self.focus = index if 0 <= index < count else None
+        elif key in ("n", "p") and count:
+            step = 1 if key == "n" else -1
+            start = self.focus if self.focus is not None else (-1 if step > 0 else 0)
+            self.focus = (start + step) % count
+        elif key == "\x1b":
+            self.focus = None
+
+    def _visible_sessions(self, max_rows):
+        """At most max_rows sessions, keeping the focused one in view."""
+        start = 0
+        if self.focus is not None and self.focus >= max_rows:
+            start = self.focus - max_rows + 1
+        stop = min(start + max_rows, len(self.sessions))
+        return [(index, self.sessions[index]) for index in range(start, stop)]
+
+    def _table(self, max_rows) -> Table:
+        table = Table(box=box.SIMPLE_HEAD, expand=True, pad_edge=False)
+        table.add_column("#", justify="right", width=3)
+        table.add_column("Session", ratio=2, no_wrap=True, overflow="ellipsis")
+        table.add_column("Status", width=9)
+        table.add_column("Elapsed", justify="right", width=7)
+        table.add_column("Received", justify="right", width=9)
+        table.add_column("Reconn.", justify="right", width=7)
+        table.add_column("Current thought", ratio=3, no_wrap=True, overflow="ellipsis")
+        for index, session in self._visible_sessions(max_rows):
+            style = STATUS_STYLES.get(session.status, "")
+            table.add_row(
+                str(index + 1),
+                Text(session.label),
+                Text(session.status, style=style),
+                _format_elapsed(session.elapsed),
+                _format_bytes(session.bytes_received),
+                str(session.reconnects),
+                Text(" ".join(session.thought.split()), style="dim"),
+                style="reverse" if index == self.focus else None,
+            )
+        return table
+
+    def _focused_report(self, session) -> Markdown:
+        # Re-parsed only when the focused session receives text
+        key = (id(session), session.version, self.console.width)
+        if self._report_view[0] != key:
+            text = session.tail.text(
+                max_rows=self.tail_lines, width=max(1, self.console.width - 4)
+            )
+            self._report_view = (key, Markdown(text))
+        return self._report_view[1]
+
+    def render(self) -> Group:
+        """One frame: a row per visible session plus the focused report tail."""
+        focused = None
+        if self.focus is not None and self.focus < len(self.sessions):
+            focused = self.sessions[self.focus]
+        reserved = 6 + (self.tail_lines + 2 if focused else 0)
+        max_rows = max(1, self.console.height - reserved)
+        elements = [self._table(max_rows)]
+        hidden = len(self.sessions) - min(len(self.sessions), max_rows)
+        if hidden:
+            elements.append(Text(f"  … {hidden} more session(s)", style="dim"))
+        if focused is not None:
+            elements.append(
+                Panel(
+                    self._focused_report(focused),
+                    title=Text(focused.label, overflow="ellipsis", no_wrap=True),
+                    subtitle=focused.interaction_id,
+                    border_style="blue",
+                    height=self.tail_lines + 2,
+                )
+            )
+        elif self.interactive:
+            elements.append(
+                Text("1-9 open a report · n/p next/previous · Esc back", style="dim")
+            )
+        return Group(*elements)
+
+    @contextmanager
+    def _key_reader(self):
+        """Yield read_key(timeout) -> str | None; sleeps when not interactive."""
+        if not self.interactive:
+
+            def sleep(timeout):
+                time.sleep(timeout)
+
+            yield sleep
+            return
+        fd = sys.stdin.fileno()
+        saved = termios.tcgetattr(fd)
+        tty.setcbreak(fd)
+
+        def read_key(timeout):
+            ready, _, _ = select.select([fd], [], [], timeout)
+            return os.read(fd, 1).decode(errors="ignore") if ready else None
+
+        try:
+            yield read_key
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+    def run(self) -> list[ResearchResult]:
+        """Run every session; results keep the order sessions were added in."""
+        interval = 1 / self.refresh_per_second
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="session"
+        ) as executor:
+            futures = [
+                executor.submit(self._run_session, session) for session in self.sessions
+            ]
+            try:
+                with (
+                    self._key_reader() as read_key,
+                    Live(
+                        self.render(), console=self.console, auto_refresh=False
+                    ) as live,
+                ):
+                    while not all(future.done() for future in futures):
+                        key = read_key(interval)
+                        if key:
+                            self.handle_key(key)
+                        live.update(self.render(), refresh=True)
+                    live.update(self.render(), refresh=True)
+                return [future.result() for future in futures]
+            except KeyboardInterrupt:
+                self.cancel_token.cancel("cancelled by user")
+                raise
@@ -0,0 +1,98 @@
+import time
+from dataclasses import dataclass
+
+TERMINAL_EVENT_TYPES = ("interaction.complete", "error")
+USAGE_FIELDS = (
+    "total_input_tokens",
+    "total_output_tokens",
+    "total_reasoning_tokens",
+    "total_cached_tokens",
+    "total_tool_use_tokens",
+    "total_tokens",
+)
+
+
+def usage_totals(usage) -> dict | None:
+    """Token totals from an SDK Usage object, or None if none are reported."""
+    if usage is None:
+        return None
+    totals = {
+        name: value
+        for name in USAGE_FIELDS
+        if isinstance(value := getattr(usage, name, None), int)
+    }
+    return totals or None
+
+
+@dataclass(slots=True)
+class StreamEvent:
+    """Compact record of the fields the agent reads from an SDK stream event.
+
+    Converting at ingress lets buffered events (event logs, replay buffers)
+    drop the SDK's nested ``delta``/``interaction``/``error`` objects, and
+    lets consumers branch on plain attributes instead of attribute chains.
+    """
+
+    event_type: str
+    event_id: str | None = None
+    kind: str | None = None
+    text: str | None = None
+    thought: str | None = None
+    error: str | None = None
+    interaction_id: str | None = None
+    usage: dict | None = None
+
+    @classmethod
+    def from_sdk(cls, event) -> "StreamEvent":
+        event_type = event.event_type
+        record = cls(event_type, event.event_id)
+        if event_type == "content.delta":
+            delta = event.delta
+            record.kind = delta.type
+            if record.kind == "text":
+                record.text = delta.text
+            elif record.kind == "thought_summary":
+                record.thought = delta.content.text
+        elif event_type == "interaction.start":
+            record.interaction_id = event.interaction.id
+        elif event_type == "interaction.complete":
+            record.usage = usage_totals(getattr(event.interaction, "usage", None))
+        elif event_type == "error":
+            record.error = str(event.error)
+        return record
+
+    @classmethod
+    def from_log_entry(cls, entry: dict) -> "StreamEvent":
+        """Inverse of :meth:`to_log_entry` (the timestamp is dropped)."""
+        kind = entry.get("delta")
+        return cls(
+            entry["type"],
+            entry.get("event_id"),
+            kind=kind,
+            text=entry.get("text") if kind == "text" else None,
+            thought=entry.get("text") if kind == "thought_summary" else None,
+            error=entry.get("error"),
+            interaction_id=entry.get("interaction_id"),
+            usage=entry.get("usage"),
+        )
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.event_type in TERMINAL_EVENT_TYPES
+
+    def to_log_entry(self) -> dict:
+        """Small JSON-serializable dict for event logs."""
+        entry = {"type": self.event_type, "event_id": self.event_id, "ts": time.time()}
+        if self.kind is not None:
+            entry["delta"] = self.kind
+            if self.kind == "text":
+                entry["text"] = self.text
+            elif self.kind == "thought_summary":
+                entry["text"] = self.thought
+        elif self.error is not None:
+            entry["error"] = self.error
+        if self.interaction_id is not None:
+            entry["interaction_id"] = self.interaction_id
+        if self.usage is not None:
+            entry["usage"] = self.usage
+        return entry
@@ -0,0 +1,336 @@
+import fnmatch
+import hashlib
+import json
+import mimetypes
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+from .ratelimit import is_rate_limit_error, retry_after
+
+DEFAULT_MANIFEST_DIR = os.path.expanduser("~/.radiant-filament/ingest")
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 3
+HASH_CHUNK_SIZE = 1024 * 1024
+# Below this many files, a process pool costs more to start than it saves
+POOL_THRESHOLD = 64
+# Persist the manifest every N uploads so an interrupted run resumes cheaply
+CHECKPOINT_EVERY = 50
+MANIFEST_VERSION = 1
+
+
+def hash_file(path) -> str:
+    """SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def default_manifest_path(store_name) -> str:
+    """Per-store manifest under ~/.radiant-filament/ingest."""
+    return os.path.join(DEFAULT_MANIFEST_DIR, store_name.split("/")[-1] + ".json")
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """True for errors worth retrying: quota, 5xx and connection failures."""
+    if is_rate_limit_error(exc):
+        return True
+    code = getattr(exc, "code", None)
+    if isinstance(code, int) and code >= 500:
+        return True
+    return isinstance(exc, (ConnectionError, TimeoutError))
+
+
+@dataclass
+class LocalFile:
+    path: str
+    relpath: str
+    size: int
+    mtime_ns: int
+    sha256: str | None = None
+
+
+@dataclass
+class IngestResult:
+    store: str
+    scanned: int = 0
+    hashed: int = 0
+    unchanged: int = 0
+    duplicates: int = 0
+    uploaded: int = 0
+    replaced: int = 0
+    failed: list[tuple[str, str]] = field(default_factory=list)
+
+
+class IngestManifest:
+    """Local record of what has been hashed and uploaded for one store.
+
+    ``files`` maps a path (relative to the ingested root) to its size, mtime
+    and content hash, so unchanged files skip hashing entirely. ``documents``
+    maps content hashes to the uploaded document name, so identical content
+    is uploaded once however many paths it lives at.
+    """
+
+    def __init__(self, path, store=None):
+        self.path = path
+        self.store = store
+        self.files: dict[str, list] = {}
+        self.documents: dict[str, str | None] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.store = self.store or data.get("store")
+            self.files = data.get("files", {})
+            self.documents = data.get("documents", {})
+
+    def cached_hash(self, local: LocalFile) -> str | None:
+        record = self.files.get(local.relpath)
+        if record and record[0] == local.size and record[1] == local.mtime_ns:
+            return record[2]
+        return None
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": MANIFEST_VERSION,
+                    "store": self.store,
+                    "files": self.files,
+                    "documents": self.documents,
+                },
+                f,
+            )
+        os.replace(tmp_path, self.path)
+
+
+def scan_directory(root, include=None) -> list[LocalFile]:
+    """List regular files under root, skipping hidden files and directories.
+
+    Args:
+        root: Directory to walk.
+        include: Optional glob patterns matched against the file name.
+    """
+    root = os.path.abspath(root)
+    found = []
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    if include and not any(
+                        fnmatch.fnmatch(entry.name, pattern) for pattern in include
+                    ):
+                        continue
+                    stat = entry.stat()
+                    found.append(
+                        LocalFile(
+                            entry.path,
+                            os.path.relpath(entry.path, root),
+                            stat.st_size,
+                            stat.st_mtime_ns,
+                        )
+                    )
+    found.sort(key=lambda local: local.relpath)
+    return found
+
+
+class DirectoryIngester:
+    """Hash a directory tree and upload new content to a file search store.
+
+    Files whose size and mtime match the manifest reuse the recorded hash;
+    the rest are hashed in a process pool. Content already uploaded (by hash)
+    is skipped, and the remainder is uploaded by ``concurrency`` threads with
+    exponential backoff on transient errors. When a file's content changes,
+    the document for its previous content is deleted once the new content is
+    in the store, unless another file still has that content.
+    """
+
+    def __init__(
+        self,
+        client,
+        store=None,
+        *,
+        manifest_path=None,
+        display_name=None,
+        include=None,
+        concurrency=DEFAULT_CONCURRENCY,
+        hash_workers=None,
+        retries=DEFAULT_RETRIES,
+        rate_limiter=None,
+        poll_interval=1.0,
+        console=None,
+    ):
+        self.client = client
+        self.store = store
+        self.manifest_path = manifest_path
+        self.display_name = display_name
+        self.include = include
+        self.concurrency = concurrency
+        self.hash_workers = hash_workers
+        self.retries = retries
+        self.rate_limiter = rate_limiter
+        self.poll_interval = poll_interval
+        self.console = console
+
+    def _log(self, message):
+        if self.console is not None:
+            self.console.print(message)
+
+    def _api(self, fn, **kwargs):
+        if self.rate_limiter is None:
+            return fn(**kwargs)
+        return self.rate_limiter.call(fn, **kwargs)
+
+    def _ensure_store(self, root) -> str:
+        if self.store is None:
+            store = self._api(
+                self.client.file_search_stores.create,
+                config={
+                    "display_name": self.display_name
+                    or os.path.basename(os.path.abspath(root))
+                },
+            )
+            self.store = store.name
+            self._log(f"Created file search store {self.store}")
+        return self.store
+
+    def _hash_all(self, pending: list[LocalFile]):
+        paths = [local.path for local in pending]
+        if len(paths) < POOL_THRESHOLD or self.hash_workers == 1:
+            digests = list(map(hash_file, paths))
+        else:
+            workers = self.hash_workers or os.cpu_count() or 1
+            chunksize = max(1, len(paths) // (workers * 8))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                digests = list(pool.map(hash_file, paths, chunksize=chunksize))
+        for local, digest in zip(pending, digests, strict=True):
+            local.sha256 = digest
+
+    def _upload(self, local: LocalFile) -> str | None:
+        """Upload one file and wait for indexing; returns the document name."""
+        delay = 1.0
+        for attempt in range(1, self.retries + 2):
+            try:
+                operation = self._api(
+                    self.client.file_search_stores.upload_to_file_search_store,
+                    file_search_store_name=self.store,
+                    file=local.path,
+                    config={
+                        "display_name": local.relpath,
+                        "mime_type": mimetypes.guess_type(local.path)[0]
+                        or "text/plain",
+                        "custom_metadata": [
+                            {"key": "sha256", "string_value": local.sha256}
+                        ],
+                    },
+                )
+                while not operation.done:
+                    time.sleep(self.poll_interval)
+                    operation = self._api(
+                        self.client.operations.get, operation=operation
+                    )
+                if operation.error:
+                    raise RuntimeError(f"Indexing failed: {operation.error}")
+                response = operation.response
+                return getattr(response, "document_name", None)
+            except Exception as e:
+                if attempt > self.retries or not is_transient_error(e):
+                    raise
+                wait = retry_after(e) or delay
+                self._log(
+                    f"[yellow]Upload of {local.relpath} failed: {e}. "
+                    f"Retrying in {wait:.0f}s ({attempt}/{self.retries})...[/yellow]"
+                )
+                time.sleep(wait)
+                delay *= 2
+
+    def _delete(self, manifest, content_hash, local: LocalFile, result):
+        """Delete the stored document for content no file has any more."""
+        document = manifest.documents[content_hash]
+        if document:
+            try:
+                self._api(
+                    self.client.file_search_stores.documents.delete,
+                    name=document,
+                    config={"force": True},
+                )
+            except Exception as e:
+                result.failed.append(
+                    (local.relpath, f"Could not delete previous version: {e}")
+                )
+                return
+        del manifest.documents[content_hash]
+        result.replaced += 1
+
+    def ingest(self, root) -> IngestResult:
+        """Ingest every file under root; see the class docstring."""
+        store = self._ensure_store(root)
+        manifest = IngestManifest(
+            self.manifest_path or default_manifest_path(store), store
+        )
+        result = IngestResult(store)
+
+        files = scan_directory(root, self.include)
+        result.scanned = len(files)
+        pending = []
+        for local in files:
+            local.sha256 = manifest.cached_hash(local)
+            if local.sha256 is None:
+                pending.append(local)
+        self._hash_all(pending)
+        result.hashed = len(pending)
+        # Previous content of edited files: old hash -> files that had it
+        replaced = {}
+        for local in files:
+            record = manifest.files.get(local.relpath)
+            if record and record[2] != local.sha256:
+                replaced.setdefault(record[2], []).append(local)
+        manifest.files = {
+            local.relpath: [local.size, local.mtime_ns, local.sha256] for local in files
+        }
+        current = {local.sha256 for local in files}
+
+        uploads = {}
+        for local in files:
+            if local.sha256 in manifest.documents:
+                result.unchanged += 1
+            elif local.sha256 in uploads:
+                result.duplicates += 1
+            else:
+                uploads[local.sha256] = local
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                futures = {
+                    pool.submit(self._upload, local): local
+                    for local in uploads.values()
+                }
+                for future in as_completed(futures):
+                    local = futures[future]
+                    try:
+                        document = future.result()
+                    except Exception as e:
+                        result.failed.append((local.relpath, str(e)))
+                        continue
+                    manifest.documents[local.sha256] = document
+                    result.uploaded += 1
+                    if result.uploaded % CHECKPOINT_EVERY == 0:
+                        manifest.save()
+            for old_hash, edited in replaced.items():
+                if old_hash in current or old_hash not in manifest.documents:
+                    continue
+                # Keep the old version until every edit of it is in the store
+                if all(local.sha256 in manifest.documents for local in edited):
+                    self._delete(manifest, old_hash, edited[0], result)
+        finally:
+            manifest.save()
+        return result
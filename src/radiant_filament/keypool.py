@@ -0,0 +1,379 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from google import genai
+
+from .ratelimit import is_rate_limit_error, retry_after
+
+DEFAULT_COOLDOWN = 30
+DEFAULT_PIN_PATH = os.path.expanduser("~/.radiant-filament/key_pins.jsonl")
+# Interaction -> key pins kept in memory and in the pin file
+MAX_PINS = 10_000
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+
+def _fingerprint(api_key: str) -> str:
+    # Pins are persisted by a hash, never the key itself
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+def _pin_record(interaction_id, key) -> str:
+    return json.dumps({"interaction_id": interaction_id, "key": key.fingerprint}) + "\n"
+
+
+def _is_not_found(exc: BaseException) -> bool:
+    for attr in ("code", "status_code"):
+        if getattr(exc, attr, None) == 404:
+            return True
+    return getattr(exc, "status", None) == "NOT_FOUND"
+
+
+@dataclass
+class PooledKey:
+    label: str
+    client: object
+    fingerprint: str = ""
+    active: set[str] = field(default_factory=set)
+    pending: int = 0
+    interactions: int = 0
+    requests: int = 0
+    throttled: int = 0
+    cooldown_until: float = 0.0
+
+    @property
+    def load(self) -> int:
+        return len(self.active) + self.pending
+
+
+class KeyPool:
+    """Several API keys (or projects) behind one client-like object.
+
+    Pass a pool as the ``client`` of a DeepResearchAgent. New interactions go
+    to the least-loaded key, skipping keys that recently hit a quota error;
+    if a create is rejected with 429, the next key is tried. Reconnections,
+    polls, cancels and follow-ups (``previous_interaction_id``) are pinned to
+    the key that created the interaction. Load is the number of interactions
+    a key has in flight.
+
+    With ``pin_path``, pins are also appended to a JSONL file (keyed by a
+    hash of the API key), so a follow-up, ``attach`` or cancel from another
+    process reaches the same key. The most recent ``max_pins`` are kept. An
+    interaction with no known pin is looked up on each key in turn until one
+    does not answer 404.
+    """
+
+    def __init__(
+        self,
+        api_keys: list[str],
+        *,
+        client_factory=None,
+        cooldown: float = DEFAULT_COOLDOWN,
+        clock=None,
+        pin_path: str | None = None,
+        max_pins: int = MAX_PINS,
+    ):
+        if not api_keys:
+            raise ValueError("KeyPool needs at least one API key")
+        factory = client_factory or (lambda key: genai.Client(api_key=key))
+        self.keys = [
+            PooledKey(
+                label=f"key-{i} (...{key[-4:]})",
+                client=factory(key),
+                fingerprint=_fingerprint(key),
+            )
+            for i, key in enumerate(api_keys, start=1)
+        ]
+        self.cooldown = cooldown
+        self.pin_path = pin_path
+        self.max_pins = max_pins
+        self._clock = clock or time.monotonic
+        self._lock = threading.Lock()
+        self._pins: OrderedDict[str, PooledKey] = OrderedDict()
+        self._pins_written = 0
+        self._load_pins()
+        self.interactions = _PooledInteractions(self)
+
+    @classmethod
+    def from_env(cls, environ=None, **kwargs) -> "KeyPool | None":
+        """Build a pool from comma-separated GEMINI_API_KEYS, if set.
+
+        Pins are persisted to DEFAULT_PIN_PATH unless ``pin_path`` is given.
+        """
+        value = (environ if environ is not None else os.environ).get(
+            "GEMINI_API_KEYS", ""
+        )
+        keys = [key.strip() for key in value.split(",") if key.strip()]
+        kwargs.setdefault("pin_path", DEFAULT_PIN_PATH)
+        return cls(keys, **kwargs) if keys else None
+
+    def _load_pins(self):
+        if not self.pin_path:
+            return
+        by_fingerprint = {key.fingerprint: key for key in self.keys}
+        try:
+            with open(self.pin_path, encoding="utf-8") as f:
+                for line in f:
+                    self._pins_written += 1
+                    try:
+                        record = json.loads(line)
+                        key = by_fingerprint.get(record["key"])
+                        interaction_id = record["interaction_id"]
+                    except (ValueError, KeyError, TypeError):
+                        continue  # Torn line
+                    if key is not None:
+                        self._remember(interaction_id, key)
+        except OSError:
+            pass
+
+    def _remember(self, interaction_id, key):
+        # Caller holds the lock (or is __init__)
+        self._pins[interaction_id] = key
+        self._pins.move_to_end(interaction_id)
+        while len(self._pins) > self.max_pins:
+            self._pins.popitem(last=False)
+
+    def _lookup(self, interaction_id) -> "PooledKey | None":
+        # Caller holds the lock
+        key = self._pins.get(interaction_id)
+        if key is not None:
+            self._pins.move_to_end(interaction_id)
+        return key
+
+    def _save_pin(self, interaction_id, key):
+        # Caller holds the lock. Best effort: an unwritable file only costs
+        # cross-process pinning.
+        if not self.pin_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.pin_path) or ".", exist_ok=True)
+            if self._pins_written >= 2 * self.max_pins:
+                # Compact to the pins still held in memory
+                tmp_path = self.pin_path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    for pinned_id, pinned in self._pins.items():
+                        f.write(_pin_record(pinned_id, pinned))
+                os.replace(tmp_path, self.pin_path)
+                self._pins_written = len(self._pins)
+            else:
+                with open(self.pin_path, "a", encoding="utf-8") as f:
+                    f.write(_pin_record(interaction_id, key))
+                self._pins_written += 1
+        except OSError:
+            pass
+
+    def __getattr__(self, name):
+        # Anything other than interactions (e.g. file search stores) uses the
+        # first key's client.
+        return getattr(self.keys[0].client, name)
+
+    def _choose(self, exclude=()) -> PooledKey:
+        now = self._clock()
+        candidates = [key for key in self.keys if key not in exclude] or self.keys
+        key = min(
+            candidates,
+            key=lambda k: (k.cooldown_until > now, k.load, k.interactions),
+        )
+        key.pending += 1
+        return key
+
+    def key_for(self, interaction_id: str) -> PooledKey:
+        """Key that created interaction_id (least-loaded key if unknown)."""
+        with self._lock:
+            key = self._lookup(interaction_id)
+            if key is None:
+                key = self._choose()
+                key.pending -= 1
+            return key
+
+    def _call_pinned(self, interaction_id, call):
+        """Run call(key) on the interaction's key.
+
+        Without a pin, keys are tried in turn while they answer 404, and the
+        key that knows the interaction is pinned.
+        """
+        with self._lock:
+            pinned = self._lookup(interaction_id)
+        if pinned is not None:
+            keys = [pinned]
+        else:
+            first = self.key_for(interaction_id)
+            keys = [first] + [key for key in self.keys if key is not first]
+        for attempt, key in enumerate(keys, start=1):
+            try:
+                result = call(key)
+            except Exception as e:
+                self._record_request(key, e)
+                if pinned is None and attempt < len(keys) and _is_not_found(e):
+                    continue
+                raise
+            self._record_request(key)
+            if pinned is None:
+                with self._lock:
+                    self._remember(interaction_id, key)
+                    self._save_pin(interaction_id, key)
+            return key, result
+
+    def _pin(self, key, interaction_id):
+        with self._lock:
+            key.pending -= 1
+            key.interactions += 1
+            key.active.add(interaction_id)
+            self._remember(interaction_id, key)
+            self._save_pin(interaction_id, key)
+
+    def _activate(self, key, interaction_id):
+        with self._lock:
+            key.active.add(interaction_id)
+
+    def _release_pending(self, key):
+        with self._lock:
+            key.pending -= 1
+
+    def _finish(self, interaction_id, key=None):
+        with self._lock:
+            key = key or self._pins.get(interaction_id)
+            if key is not None:
+                key.active.discard(interaction_id)
+
+    def _record_request(self, key, error=None):
+        with self._lock:
+            key.requests += 1
+            if error is not None and is_rate_limit_error(error):
+                key.throttled += 1
+                key.cooldown_until = self._clock() + (
+                    retry_after(error) or self.cooldown
+                )
+                return True
+        return False
+
+    def utilization(self) -> list[dict]:
+        """Per-key load, request counts and share of interactions created."""
+        with self._lock:
+            total = sum(key.interactions for key in self.keys)
+            return [
+                {
+                    "key": key.label,
+                    "active": key.load,
+                    "interactions": key.interactions,
+                    "requests": key.requests,
+                    "throttled": key.throttled,
+                    "share": key.interactions / total if total else 0.0,
+                }
+                for key in self.keys
+            ]
+
+
+class _PooledInteractions:
+    """The ``interactions`` surface of genai.Client, routed through a KeyPool."""
+
+    def __init__(self, pool: KeyPool):
+        self._pool = pool
+
+    def create(self, **kwargs):
+        pool = self._pool
+        previous = kwargs.get("previous_interaction_id")
+        tried = []
+        while True:
+            with pool._lock:
+                pinned = pool._lookup(previous) if previous else None
+                if pinned is not None:
+                    pinned.pending += 1
+                    key = pinned
+                else:
+                    key = pool._choose(exclude=tried)
+            try:
+                result = key.client.interactions.create(**kwargs)
+            except Exception as e:
+                pool._release_pending(key)
+                throttled = pool._record_request(key, e)
+                tried.append(key)
+                # An unpinned follow-up may belong to another key: try it
+                retry = throttled or (previous and _is_not_found(e))
+                if retry and pinned is None and len(tried) < len(pool.keys):
+                    continue
+                raise
+            pool._record_request(key)
+            if kwargs.get("stream"):
+                return _TrackedStream(pool, key, result)
+            pool._pin(key, result.id)
+            if result.status in TERMINAL_STATUSES:
+                pool._finish(result.id)
+            return result
+
+    def get(self, id, **kwargs):
+        pool = self._pool
+        key, result = pool._call_pinned(
+            id, lambda key: key.client.interactions.get(id=id, **kwargs)
+        )
+        if kwargs.get("stream"):
+            return _TrackedStream(pool, key, result, interaction_id=id)
+        if result.status in TERMINAL_STATUSES:
+            pool._finish(id, key)
+        return result
+
+    def cancel(self, id, **kwargs):
+        pool = self._pool
+        key, result = pool._call_pinned(
+            id, lambda key: key.client.interactions.cancel(id=id, **kwargs)
+        )
+        pool._finish(id, key)
+        return result
+
+
+class _TrackedStream:
+    """Wraps an event stream to pin its interaction and release it when done.
+
+    The interaction counts toward its key's load while the stream is open. It
+    is released on a terminal event, when the stream ends or fails, and on
+    close(); a reconnect stream counts it again.
+    """
+
+    def __init__(self, pool, key, stream, interaction_id=None):
+        self._pool = pool
+        self._key = key
+        self._stream = stream
+        self._iterator = iter(stream)
+        self.interaction_id = interaction_id
+        self._pending = interaction_id is None
+        self._released = False
+        if interaction_id is not None:
+            pool._activate(key, interaction_id)
+
+    def __iter__(self):
+        return self
+
+    def _release(self):
+        if self._released:
+            return
+        self._released = True
+        if self._pending:
+            # Ended before the interaction was announced
+            self._pending = False
+            self._pool._release_pending(self._key)
+        elif self.interaction_id:
+            self._pool._finish(self.interaction_id, self._key)
+
+    def __next__(self):
+        try:
+            event = next(self._iterator)
+        except BaseException:
+            self._release()
+            raise
+        if event.event_type == "interaction.start" and self._pending:
+            self._pending = False
+            self.interaction_id = event.interaction.id
+            self._pool._pin(self._key, self.interaction_id)
+        elif event.event_type in ("interaction.complete", "error"):
+            self._release()
+        return event
+
+    def close(self):
+        self._release()
+        close = getattr(self._stream, "close", None)
+        if close is not None:
+            close()
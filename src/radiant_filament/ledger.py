@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+from rich.table import Table
+from rich.text import Text
+
+DEFAULT_LEDGER_PATH = os.path.expanduser("~/.radiant-filament/ledger.jsonl")
+GROUP_BY = ("day", "agent", "tag", "prompt")
+PROMPT_PREVIEW_CHARS = 80
+
+
+def config_hash(agent_name=None, agent_config=None, model=None) -> str:
+    """Short stable hash of the agent settings a run used (prompt excluded)."""
+    payload = json.dumps(
+        {"agent_name": agent_name, "agent_config": agent_config, "model": model},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def prompt_hash(prompt) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+
+
+@dataclass
+class LedgerEntry:
+    """Usage and outcome of one finished interaction."""
+
+    prompt_hash: str
+    prompt_preview: str
+    agent_name: str
+    config_hash: str
+    outcome: str | None = None
+    interaction_id: str | None = None
+    duration: float | None = None
+    retries: int = 0
+    usage: dict | None = None
+    tags: list[str] = field(default_factory=list)
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def for_run(cls, prompt, agent_name, agent_config=None, model=None, tags=()):
+        return cls(
+            prompt_hash=prompt_hash(prompt),
+            prompt_preview=" ".join(prompt.split())[:PROMPT_PREVIEW_CHARS],
+            agent_name=model or agent_name,
+            config_hash=config_hash(agent_name, agent_config, model),
+            tags=list(tags),
+        )
+
+    @property
+    def day(self) -> str:
+        return datetime.fromtimestamp(self.created_at).strftime("%Y-%m-%d")
+
+    def group_keys(self, by) -> list[str]:
+        if by == "day":
+            return [self.day]
+        if by == "agent":
+            return [self.agent_name]
+        if by == "tag":
+            return self.tags or ["(untagged)"]
+        return [f"{self.prompt_hash}  {self.prompt_preview}"]
+
+
+class UsageLedger:
+    """Append-only JSONL ledger of per-interaction usage.
+
+    One line is appended per finished run (completed, failed or cancelled),
+    in a single write, so several processes can share a ledger file. ``tags``
+    are attached to every entry this instance records.
+    """
+
+    def __init__(self, path=DEFAULT_LEDGER_PATH, *, tags=()):
+        self.path = path
+        self.tags = list(tags)
+        self._lock = threading.Lock()
+
+    def record(self, entry: LedgerEntry):
+        entry.tags = sorted({*entry.tags, *self.tags})
+        line = json.dumps(asdict(entry), separators=(",", ":")) + "\n"
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def entries(self, since: float | None = None) -> list[LedgerEntry]:
+        """Every recorded entry, oldest first; torn lines are skipped."""
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = LedgerEntry(**json.loads(line))
+                except (ValueError, TypeError):
+                    continue
+                if since is None or entry.created_at >= since:
+                    entries.append(entry)
+        return entries
+
+    def summarize(self, by="day", since: float | None = None) -> list[dict]:
+        """Aggregate entries by day, agent, tag or prompt, costliest first."""
+        if by not in GROUP_BY:
+            raise ValueError(f"by must be one of {', '.join(GROUP_BY)}")
+        groups: dict[str, dict] = {}
+        for entry in self.entries(since):
+            usage = entry.usage or {}
+            for key in entry.group_keys(by):
+                row = groups.setdefault(
+                    key,
+                    {
+                        "key": key,
+                        "runs": 0,
+                        "completed": 0,
+                        "failed": 0,
+                        "cancelled": 0,
+                        "duration": 0.0,
+                        "retries": 0,
+                        "input_tokens": 0,
+                        "output_tokens": 0,
+                        "total_tokens": 0,
+                    },
+                )
+                row["runs"] += 1
+                if entry.outcome in ("completed", "failed", "cancelled"):
+                    row[entry.outcome] += 1
+                row["duration"] = round(row["duration"] + (entry.duration or 0), 3)
+                row["retries"] += entry.retries
+                row["input_tokens"] += usage.get("total_input_tokens", 0)
+                row["output_tokens"] += usage.get("total_output_tokens", 0)
+                row["total_tokens"] += usage.get("total_tokens", 0)
+        rows = list(groups.values())
+        if by == "day":
+            rows.sort(key=lambda row: row["key"])
+        else:
+            rows.sort(key=lambda row: (-row["total_tokens"], -row["duration"]))
+        return rows
+
+
+def summary_table(rows: list[dict], by: str) -> Table:
+    table = Table(title=f"Usage by {by}")
+    table.add_column(by.capitalize())
+    table.add_column("Runs", justify="right")
+    table.add_column("OK", justify="right")
+    table.add_column("Failed", justify="right")
+    table.add_column("Retries", justify="right")
+    table.add_column("Hours", justify="right")
+    table.add_column("Input tok", justify="right")
+    table.add_column("Output tok", justify="right")
+    table.add_column("Total tok", justify="right")
+    for row in rows:
+        table.add_row(
+            Text(row["key"]),
+            str(row["runs"]),
+            str(row["completed"]),
+            str(row["failed"] + row["cancelled"]),
+            str(row["retries"]),
+            f"{row['duration'] / 3600:.2f}",
+            f"{row['input_tokens']:,}",
+            f"{row['output_tokens']:,}",
+            f"{row['total_tokens']:,}",
+        )
+    return table
@@ -1,9 +1,73 @@
 import argparse
 import json
 import os
+import sqlite3
 import sys
+import time
+from contextlib import nullcontext
+from datetime import datetime
 
-from .agent import DeepResearchAgent
+from rich.console import Console
+from rich.markdown import Markdown
+from rich.markup import escape
+from rich.table import Table
+from rich.text import Text
+
+from .agent import DEFAULT_IDLE_TIMEOUT, DeepResearchAgent
+from .archive import ReportArchive
+from .broker import (
+    DEFAULT_REPLAY_BUFFER,
+    DEFAULT_SOCKET_PATH,
+    BrokerDisconnected,
+    EventBroker,
+    attach,
+    ensure_broker,
+)
+from .cancellation import CancellationToken, ResearchCancelled
+from .chain import ChainRunner, ChainSpecError, load_chain_spec
+from .compare import ComparisonRunner, build_matrix, summary_table
+from .dashboard import DEFAULT_TAIL_LINES, ResearchDashboard
+from .ingest import DEFAULT_CONCURRENCY, DEFAULT_RETRIES, DirectoryIngester
+from .keypool import KeyPool
+from .ledger import DEFAULT_LEDGER_PATH, GROUP_BY, UsageLedger
+from .ledger import summary_table as ledger_table
+from .ndjson import research_ndjson
+from .paths import sidecar_path
+from .profiling import PROFILE_MODES, Profiler, format_breakdown
+from .ratelimit import RateLimiter
+from .replay import ReplayClient
+from .report_parser import ReportParser
+from .scheduler import (
+    DEFAULT_STORE_DIR,
+    ResearchScheduler,
+    ScheduleSpecError,
+    VersionStore,
+    load_schedule_specs,
+)
+from .search import DEFAULT_INDEX_PATH, ReportIndex, query_terms
+from .sinks import (
+    DEFAULT_QUEUE_SIZE,
+    OVERFLOW_POLICIES,
+    OutputPipeline,
+    create_sink,
+    parse_sink_spec,
+)
+from .soak import (
+    DEFAULT_FAILURE_RATE,
+    DEFAULT_SAMPLE_EVERY,
+    DEFAULT_SESSIONS,
+    SoakRunner,
+    samples_table,
+)
+from .speculative import (
+    DEFAULT_CACHE_DIR,
+    DEFAULT_FOLLOWUP_MODEL,
+    DEFAULT_FOLLOWUPS,
+    FollowUpCache,
+    SpeculativeFollowUps,
+)
+from .timeline import timeline_path
+from .watchdog import close_quietly
 
 
 def parse_agent_config(value):
@@ -59,7 +123,1081 @@ def validate_file_search_store(value):
     return value
 
 
-def main():
+def run_chain(argv):
+    """Run a chain spec of research + follow-up steps and write a bundle."""
+    parser = argparse.ArgumentParser(
+        prog="radiant-filament chain",
+        description="Run a base research prompt followed by chained follow-ups",
+    )
+    parser.add_argument("spec", help="Path to a chain spec (JSON or YAML)")
+    parser.add_argument(
+        "--output-dir",
+        metavar="DIR",
+        required=True,
+        help="Directory to write step reports, bundle.md and bundle.json",
+    )
+    parser.add_argument(
+        "--agent-name",
+        default="deep-research-pro-preview-12-2025",
+        help="Default agent for steps without agent_name (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=4,
+        help="Maximum number of branches to run in parallel (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=parse_deadline,
+        metavar="SECONDS",
+        help="Cancel every running step server-side after this many seconds",
+    )
+    add_rate_limit_arguments(parser)
+    args = parser.parse_args(argv)
+    rate_limiter = build_rate_limiter(parser, args)
+
+    try:
+        spec = load_chain_spec(args.spec)
+    except ChainSpecError as e:
+        parser.error(str(e))
+
+    try:
+        runner = ChainRunner(
+            spec,
+            client=DeepResearchAgent(agent_name=args.agent_name).client,
+            agent_name=args.agent_name,
+            max_workers=args.max_workers,
+            cancel_token=CancellationToken(deadline=args.deadline),
+            rate_limiter=rate_limiter,
+        )
+        results = runner.run()
+        manifest = runner.write_bundle(args.output_dir)
+    except KeyboardInterrupt:
+        print("\nChain cancelled by user.")
+        sys.exit(0)
+    except Exception as e:
+        print(f"An error occurred: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Bundle written to {manifest}")
+    print_key_utilization(runner.client, runner.console)
+    if any(result.status != "completed" for result in results.values()):
+        sys.exit(1)
+
+
+def run_compare(argv):
+    """Run prompts across a matrix of agents and configs and compare metrics."""
+    parser = argparse.ArgumentParser(
+        prog="radiant-filament compare",
+        description="Benchmark agent names and agent configs against each other",
+    )
+    parser.add_argument("prompts", nargs="*", metavar="PROMPT")
+    parser.add_argument(
+        "--prompt-file",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help="File containing one prompt (can be repeated)",
+    )
+    parser.add_argument(
+        "--agent-name",
+        action="append",
+        metavar="NAME",
+        dest="agent_names",
+        help="Agent to compare (can be repeated; default: "
+        "deep-research-pro-preview-12-2025)",
+    )
+    parser.add_argument(
+        "--agent-config",
+        action="append",
+        default=[],
+        metavar="JSON",
+        dest="agent_configs",
+        help="Agent config as JSON string or file (can be repeated; each is "
+        "crossed with every --agent-name)",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=4,
+        help="Maximum number of runs in parallel (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="PATH",
+        help="Write per-run results and the summary as JSON (default: stdout)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=parse_deadline,
+        metavar="SECONDS",
+        help="Cancel every running interaction server-side after this many seconds",
+    )
+    add_rate_limit_arguments(parser)
+    args = parser.parse_args(argv)
+    rate_limiter = build_rate_limiter(parser, args)
+
+    prompts = list(args.prompts)
+    for path in args.prompt_file:
+        try:
+            with open(path, encoding="utf-8") as f:
+                prompts.append(f.read())
+        except OSError as e:
+            parser.error(f"Cannot read prompt file '{path}': {e}")
+    if not prompts:
+        parser.error("Must provide at least one prompt or --prompt-file")
+    try:
+        configs = [parse_agent_config(value) for value in args.agent_configs]
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    agent_names = args.agent_names or ["deep-research-pro-preview-12-2025"]
+
+    try:
+        runner = ComparisonRunner(
+            prompts,
+            build_matrix(agent_names, configs),
+            client=DeepResearchAgent(agent_name=agent_names[0]).client,
+            max_workers=args.max_workers,
+            cancel_token=CancellationToken(deadline=args.deadline),
+            rate_limiter=rate_limiter,
+        )
+        runner.run()
+    except KeyboardInterrupt:
+        print("\nComparison cancelled by user.")
+        sys.exit(0)
+    except Exception as e:
+        print(f"An error occurred: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    runner.console.print(summary_table(runner.summary()))
+    if args.output:
+        runner.write_json(args.output)
+        print(f"Results written to {args.output}")
+    else:
+        print(json.dumps(runner.to_dict(), indent=2))
+
+
+def run_dashboard(argv):
+    """Run several research sessions side by side in one live dashboard."""
+    parser = argparse.ArgumentParser(
+        prog="radiant-filament dashboard",
+        description="Run research prompts concurrently with one row per session",
+    )
+    parser.add_argument("prompts", nargs="*", metavar="PROMPT")
+    parser.add_argument(
+        "--prompt-file",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help="File containing one prompt (can be repeated)",
+    )
+    parser.add_argument(
+        "--agent-name",
+        default="deep-research-pro-preview-12-2025",
+        help="Name of the agent to use (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--agent-config",
+        metavar="JSON",
+        help="Agent config for every session, as JSON string or file",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=4,
+        help="Maximum number of sessions in parallel (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--focus",
+        type=int,
+        metavar="N",
+        help="Start with session N's report open (keys 1-9, n/p and Esc switch "
+        "it on a terminal)",
+    )
+    parser.add_argument(
+        "--tail-lines",
+        type=int,
+        default=DEFAULT_TAIL_LINES,
+        metavar="ROWS",
+        help="Report rows shown for the open session (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--output-dir",
+        metavar="DIR",
+        help="Write each completed report to DIR/<N>.md",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=parse_deadline,
+        metavar="SECONDS",
+        help="Cancel every running interaction server-side after this many seconds",
+    )
+    add_rate_limit_arguments(parser)
+    args = parser.parse_args(argv)
+    rate_limiter = build_rate_limiter(parser, args)
+
+    prompts = list(args.prompts)
+    for path in args.prompt_file:
+        try:
+            with open(path, encoding="utf-8") as f:
+                prompts.append(f.read())
+        except OSError as e:
+            parser.error(f"Cannot read prompt file '{path}': {e}")
+    if not prompts:
+        parser.error("Must provide at least one prompt or --prompt-file")
+    if args.max_workers < 1:
+        parser.error("--max-workers must be at least 1")
+    if args.tail_lines < 1:
+        parser.error("--tail-lines must be at least 1")
+    if args.focus is not None and not 1 <= args.focus <= len(prompts):
+        parser.error(f"--focus must be between 1 and {len(prompts)}")
+    try:
+        agent_config = parse_agent_config(args.agent_config)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    try:
+        dashboard = ResearchDashboard(
+            DeepResearchAgent(agent_name=args.agent_name).client,
+            agent_name=args.agent_name,
+            max_workers=args.max_workers,
+            tail_lines=args.tail_lines,
+            cancel_token=CancellationToken(deadline=args.deadline),
+            rate_limiter=rate_limiter,
+        )
+        for prompt in prompts:
+            dashboard.add(prompt, agent_config=agent_config)
+        if args.focus is not None:
+            dashboard.focus = args.focus - 1
+        results = dashboard.run()
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+            for number, result in enumerate(results, 1):
+                if result.ok:
+                    path = os.path.join(args.output_dir, f"{number}.md")
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write(result.report)
+    except KeyboardInterrupt:
+        print("\nDashboard cancelled by user.")
+        sys.exit(0)
+    except Exception as e:
+        print(f"An error occurred: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    console = dashboard.console
+    for number, result in enumerate(results, 1):
+        if result.ok:
+            console.print(f"[green]✓ {number}[/green] {result.interaction_id}")
+        else:
+            console.print(f"[red]✗ {number}: {escape(result.error or '')}[/red]")
+    if args.output_dir:
+        console.print(f"[green]Reports written to {args.output_dir}[/green]")
+    print_key_utilization(dashboard.client, console)
+    if not all(result.ok for result in results):
+        sys.exit(1)
+
+
+def run_attach(argv):
+    """Follow an interaction's stream through the local fan-out broker."""
+    parser = argparse.ArgumentParser(
+        prog="radiant-filament attach",
+        description=(
+            "Attach to a running (or finished) interaction. Viewers share one "
+            "upstream stream via a local broker; late joiners replay from the start."
+        ),
+    )
+    parser.add_argument("interaction_id", help="Interaction ID to follow")
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        default=DEFAULT_SOCKET_PATH,
+        help="Broker socket; started in-process if none is running "
+        "(default: %(default)s)",
+    )
+    parser.add_argument("--output", metavar="PATH", help="Also write the report here")
+    parser.add_argument(
+        "--no-thoughts", action="store_true", help="Hide thought summaries"
+    )
+    args = parser.parse_args(argv)
+    console = Console(stderr=True)
+
+    output = None
+    if args.output:
+        try:
+            output = open(args.output, "w", encoding="utf-8")
+        except OSError as e:
+            print(f"Cannot write to '{args.output}': {e}", file=sys.stderr)
+            sys.exit(1)
+    try:
+        server = ensure_broker(args.socket, console=console)
+    except OSError as e:
+        if output:
+            output.close()
+        print(f"Cannot start a broker on '{args.socket}': {e}", file=sys.stderr)
+        sys.exit(1)
+    failed = False
+    try:
+        for event in attach(args.interaction_id, args.socket):
+            if event.kind == "text":
+                sys.stdout.write(event.text)
+                sys.stdout.flush()
+                if output:
+                    output.write(event.text)
+            elif event.kind == "thought_summary" and not args.no_thoughts:
+                console.print(f"[dim]{escape(event.thought)}[/dim]")
+            elif event.event_type == "replay.truncated":
+                console.print(
+                    "[yellow]Replay buffer overflowed; earliest events omitted.[/yellow]"
+                )
+            elif event.event_type == "subscriber.lagged":
+                console.print(
+                    "[red]Fell too far behind the live stream; re-attach to resume.[/red]"
+                )
+                failed = True
+            elif event.error:
+                console.print(f"[red]Error: {escape(event.error)}[/red]")
+                failed = True
+    except BrokerDisconnected as e:
+        console.print(f"[red]{escape(str(e))}; the report is incomplete.[/red]")
+        failed = True
+    except KeyboardInterrupt:
+        console.print("\nDetached.")
+    finally:
+        if output:
+            output.close()
+        if server:
+            server.shutdown()
+            server.server_close()
+    print()
+    if failed:
+        sys.exit(1)
+
+
+def run_broker(argv):
+    """Run a long-lived fan-out broker for `attach` viewers."""
+    parser = argparse.ArgumentParser(
+        prog="radiant-filament broker",
+        description="Serve interaction streams to local attach viewers",
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        default=DEFAULT_SOCKET_PATH,
+        help="Socket to listen on (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--buffer",
+        type=int,
+        default=DEFAULT_REPLAY_BUFFER,
+        metavar="EVENTS",
+        help="Events kept per interaction for late joiners (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+    if args.buffer < 1:
+        parser.error("--buffer must be at least 1")
+
+    try:
+        server = EventBroker(buffer_size=args.buffer).serve(args.socket)
+    except OSError as e:
+        print(f"Cannot listen on '{args.socket}': {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Broker listening on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nBroker stopped.")
+    finally:
+        server.server_close()
+
+
+def run_ingest(argv):
+    """Upload a directory tree into a file search store, skipping known content."""
+    parser = argparse.ArgumentParser(
+        prog="radiant-filament ingest",
+        description=(
+            "Hash a directory in parallel and upload new or changed files to a "
+            "file search store for use with --file-search"
+        ),
+    )
+    parser.add_argument("directory", help="Directory to ingest")
+    parser.add_argument(
+        "--store",
+        type=validate_file_search_store,
+        help="Existing store to add to (default: create a new one)",
+    )
+    parser.add_argument(
+        "--display-name", help="Display name for a new store (default: directory name)"
+    )
+    parser.add_argument(
+        "--manifest",
+        metavar="PATH",
+        help="Local manifest of hashed/uploaded files "
+        "(default: ~/.radiant-filament/ingest/<store>.json)",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        metavar="GLOB",
+        help="Only ingest file names matching GLOB (repeatable)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Parallel uploads (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--hash-workers",
+        type=int,
+        metavar="N",
+        help="Hashing processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help="Retries per file on transient errors (default: %(default)s)",
+    )
+    add_rate_limit_arguments(parser)
+    args = parser.parse_args(argv)
+    if not os.path.isdir(args.directory):
+        parser.error(f"Not a directory: {args.directory}")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    rate_limiter = build_rate_limiter(parser, args)
+
+    agent = DeepResearchAgent()
+    ingester = DirectoryIngester(
+        agent.client,
+        args.store,
+        manifest_path=args.manifest,
+        display_name=args.display_name,
+        include=args.include,
+        concurrency=args.concurrency,
+        hash_workers=args.hash_workers,
+        retries=args.retries,
+        rate_limiter=rate_limiter,
+        console=agent.console,
+    )
+    try:
+        result = ingester.ingest(args.directory)
+    except KeyboardInterrupt:
+        print("\nIngest cancelled by user; re-run to resume.")
+        sys.exit(0)
+    except Exception as e:
+        print(f"An error occurred: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(
+        f"Scanned {result.scanned} files: {result.uploaded} uploaded, "
+        f"{result.unchanged} already in store, {result.duplicates} duplicate, "
+        f"{result.replaced} old versions deleted, "
+        f"{len(result.failed)} failed ({result.hashed} hashed)"
+    )
+    for relpath, error in result.failed:
+        print(f"  failed: {relpath}: {error}", file=sys.stderr)
+    print(f"--file-search {result.store}")
+    if result.failed:
+        sys.exit(1)
+
+
+def run_archive(argv):
+    """Import, list, or extract reports from a compressed report archive."""
+    parser = argparse.ArgumentParser(
+        prog="radiant-filament archive",
+        description="Manage the compressed report archive",
+    )
+    parser.add_argument("root", metavar="DIR", help="Archive directory")
+    actions = parser.add_subparsers(dest="action", required=True)
+    import_parser = actions.add_parser("import", help="Archive Markdown reports")
+    import_parser.add_argument("paths", nargs="+", metavar="PATH")
+    actions.add_parser("list", help="List archived reports")
+    show_parser = actions.add_parser("show", help="Print an archived report")
+    show_parser.add_argument("key", help="Interaction ID or request hash")
+    args = parser.parse_args(argv)
+
+    archive = ReportArchive(args.root)
+    if args.action == "import":
+        for path in args.paths:
+            try:
+                entry = archive.import_file(path)
+            except OSError as e:
+                print(f"Cannot import '{path}': {e}", file=sys.stderr)
+                sys.exit(1)
+            print(f"{entry.request_hash}  {path}")
+    elif args.action == "list":
+        for entry in archive.entries():
+            label = entry.source or entry.agent_name or ""
+            print(
+                f"{entry.request_hash[:12]}  {entry.interaction_id or '-'}  "
+                f"{entry.size:>9}  {label}"
+            )
+    else:
+        try:
+            for chunk in archive.iter_report(args.key):
+                sys.stdout.write(chunk)
+        except KeyError:
+            print(f"No archived report matches '{args.key}'", file=sys.stderr)
+            sys.exit(1)
+
+
+def print_version_history(store, name, console):
+    versions = store.versions(name)
+    if not versions:
+        raise KeyError(name)
+    table = Table(title=f"Versions of {name}")
+    table.add_column("Version", justify="right")
+    table.add_column("Date")
+    table.add_column("Changed", justify="right")
+    table.add_column("Stored as")
+    table.add_column("Bytes", justify="right")
+    table.add_column("Interaction ID")
+    for version in versions:
+        table.add_row(
+            f"v{version.number}",
+            f"{datetime.fromtimestamp(version.created_at):%Y-%m-%d %H:%M}",
+            f"+{version.added} -{version.removed}",
+            version.kind,
+            f"{version.length:,} / {version.size:,}",
+            Text(version.interaction_id or "-"),
+        )
+    console.print(table)
+    stats = store.stats(name)
+    ratio = stats["stored_bytes"] / stats["full_bytes"] if stats["full_bytes"] else 0
+    console.print(
+        f"[dim]{stats['stored_bytes']:,} bytes stored for {stats['full_bytes']:,} "
+        f"bytes of reports ({ratio:.1%}); {stats['deltas']} of "
+        f"{stats['versions']} versions stored as deltas[/dim]"
+    )
+
+
+def print_diff(lines, console):
+    styles = {"+": "green", "-": "red", "@": "cyan"}
+    for line in lines:
+        style = styles.get(line[:1])
+        if line.startswith(("+++", "---")):
+            style = "bold"
+        console.print(Text(line.rstrip("\n"), style=style or ""), soft_wrap=True)
+
+
+def run_schedule(argv):
+    """Run research specs on cron schedules and review their version history."""
+    parser = argparse.ArgumentParser(
+        prog="radiant-filament schedule",
+        description="Re-run research on a schedule and keep delta-compressed versions",
+    )
+    parser.add_argument(
+        "--store",
+        metavar="DIR",
+        default=DEFAULT_STORE_DIR,
+        help="Version store directory (default: %(default)s)",
+    )
+    actions = parser.add_subparsers(dest="action", required=True)
+    run_parser = actions.add_parser("run", help="Run specs on their schedules")
+    run_parser.add_argument("spec", help="Schedule spec file (JSON or YAML)")
+    mode = run_parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--once",
+        action="store_true",
+        help="Run the specs that are due, then exit (for cron or systemd timers)",
+    )
+    mode.add_argument(
+        "--now", action="store_true", help="Run every spec immediately, then exit"
+    )
+    run_parser.add_argument(
+        "--agent-name",
+        default="deep-research-pro-preview-12-2025",
+        help="Default agent for specs without agent_name (default: %(default)s)",
+    )
+    run_parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=4,
+        help="Maximum number of specs to run in parallel (default: %(default)s)",
+    )
+    run_parser.add_argument(
+        "--deadline",
+        type=parse_deadline,
+        metavar="SECONDS",
+        help="Cancel every running interaction server-side after this many seconds",
+    )
+    add_rate_limit_arguments(run_parser)
+    actions.add_parser("list", help="List specs with stored versions")
+    history_parser = actions.add_parser("history", help="List a spec's versions")
+    history_parser.add_argument("name")
+    show_parser = actions.add_parser("show", help="Print one version in full")
+    show_parser.add_argument("name")
+    show_parser.add_argument(
+        "version", nargs="?", type=int, help="Version number (default: latest)"
+    )
+    diff_parser = actions.add_parser("diff", help="Show what changed between versions")
+    diff_parser.add_argument("name")
+    diff_parser.add_argument(
+        "old", nargs="?", type=int, help="Older version (default: the one before new)"
+    )
+    diff_parser.add_argument(
+        "new", nargs="?", type=int, help="Newer version (default: latest)"
+    )
+    diff_parser.add_argument(
+        "--context",
+        type=int,
+        default=3,
+        metavar="LINES",
+        help="Unchanged lines shown around each change (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    store = VersionStore(args.store)
+    console = Console()
+    if args.action == "list":
+        for name in store.names():
+            versions = store.versions(name)
+            latest = datetime.fromtimestamp(versions[-1].created_at)
+            print(f"{name}  {len(versions)} versions  latest {latest:%Y-%m-%d %H:%M}")
+        return
+    if args.action != "run":
+        try:
+            if args.action == "history":
+                print_version_history(store, args.name, console)
+            elif args.action == "show":
+                sys.stdout.write(store.read(args.name, args.version))
+            else:
+                lines = store.diff(args.name, args.old, args.new, args.context)
+                if lines:
+                    print_diff(lines, console)
+                else:
+                    console.print("[green]No changes.[/green]")
+        except (KeyError, ValueError):
+            print(f"No stored version matches '{args.name}'", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    rate_limiter = build_rate_limiter(parser, args)
+    try:
+        specs = load_schedule_specs(args.spec)
+    except ScheduleSpecError as e:
+        parser.error(str(e))
+    try:
+        scheduler = ResearchScheduler(
+            specs,
+            store,
+            client=DeepResearchAgent(agent_name=args.agent_name).client,
+            agent_name=args.agent_name,
+            max_workers=args.max_workers,
+            console=console,
+            cancel_token=CancellationToken(deadline=args.deadline),
+            rate_limiter=rate_limiter,
+        )
+        if args.now:
+            results = scheduler.run_pending(specs)
+        elif args.once:
+            results = scheduler.run_pending()
+        else:
+            for spec in specs:
+                next_run = datetime.fromtimestamp(scheduler.next_run(spec))
+                console.print(
+                    f"{escape(spec.name)}  [dim]{spec.schedule.expression}[/dim]  "
+                    f"next run {next_run:%Y-%m-%d %H:%M}"
+                )
+            scheduler.run_forever()
+            return
+    except KeyboardInterrupt:
+        print("\nScheduler stopped by user.")
+        sys.exit(0)
+    except Exception as e:
+        print(f"An error occurred: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if not results:
+        console.print("[dim]Nothing due.[/dim]")
+    if any(version is None for version in results.values()):
+        sys.exit(1)
+
+
+def run_soak(argv):
+    """Soak-test the agent offline and fail if resource usage trends upward."""
+    parser = argparse.ArgumentParser(
+        prog="radiant-filament soak",
+        description=(
+            "Drive thousands of synthetic sessions (with injected failures) through "
+            "one agent and check RSS, file descriptors, threads, traced memory, "
+            "unclosed streams and live stream generators for leaks"
+        ),
+    )
+    parser.add_argument(
+        "--sessions",
+        type=int,
+        default=DEFAULT_SESSIONS,
+        help="Number of sessions to run (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=DEFAULT_FAILURE_RATE,
+        metavar="RATE",
+        help="Fraction of sessions with an injected failure (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--sample-every",
+        type=int,
+        default=DEFAULT_SAMPLE_EVERY,
+        metavar="N",
+        help="Sample resource usage every N sessions (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Random seed (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--json", metavar="PATH", help="Also write the samples and verdict as JSON"
+    )
+    args = parser.parse_args(argv)
+    if args.sample_every < 1:
+        parser.error("--sample-every must be at least 1")
+    if args.sessions < 3 * args.sample_every:
+        parser.error("--sessions must be at least 3 x --sample-every")
+    if not 0 <= args.failure_rate <= 1:
+        parser.error("--failure-rate must be between 0 and 1")
+
+    console = Console()
+    try:
+        report = SoakRunner(
+            args.sessions,
+            failure_rate=args.failure_rate,
+            sample_every=args.sample_every,
+            seed=args.seed,
+        ).run()
+    except KeyboardInterrupt:
+        print("\nSoak test cancelled by user.")
+        sys.exit(0)
+
+    console.print(samples_table(report.samples))
+    outcomes = ", ".join(f"{k}: {v}" for k, v in sorted(report.outcomes.items()))
+    console.print(f"{report.sessions} sessions in {report.duration:.1f}s ({outcomes})")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, indent=2)
+    if not report.ok:
+        for leak in report.leaks:
+            console.print(f"[red]✗ {escape(leak)}[/red]")
+        sys.exit(1)
+    console.print("[green]✓ No upward resource trends[/green]")
+
+
+def parse_since(value):
+    """Parse --since as YYYY-MM-DD or a number of days ago (epoch seconds)."""
+    try:
+        return time.time() - float(value) * 86400
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid date: {value}. Expected YYYY-MM-DD or a number of days"
+        ) from None
+
+
+def run_ledger(argv):
+    """Summarize the local usage ledger by day, agent, tag or prompt."""
+    parser = argparse.ArgumentParser(
+        prog="radiant-filament ledger",
+        description="Summarize token usage and outcomes of past runs",
+    )
+    parser.add_argument(
+        "path",
+        nargs="?",
+        default=DEFAULT_LEDGER_PATH,
+        help="Ledger file (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--by", choices=GROUP_BY, default="day", help="Grouping (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--since",
+        type=parse_since,
+        metavar="DATE",
+        help="Only runs since YYYY-MM-DD, or since this many days ago",
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="Print the summary rows as JSON"
+    )
+    args = parser.parse_args(argv)
+
+    rows = UsageLedger(args.path).summarize(by=args.by, since=args.since)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    elif not rows:
+        print("No ledger entries.")
+    else:
+        Console().print(ledger_table(rows, args.by))
+
+
+def run_search(argv):
+    """Search the local full-text index of past reports."""
+    parser = argparse.ArgumentParser(
+        prog="radiant-filament search",
+        description="Search past research reports",
+    )
+    parser.add_argument("query", nargs="?", help="Free-text search query")
+    parser.add_argument(
+        "--index",
+        metavar="PATH",
+        default=DEFAULT_INDEX_PATH,
+        help="Path to the report index database (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--add",
+        action="append",
+        metavar="DIR",
+        default=[],
+        help="Index (or re-index) Markdown reports under DIR before searching",
+    )
+    parser.add_argument(
+        "--limit", type=int, default=10, help="Maximum hits (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--raw", action="store_true", help="Treat the query as FTS5 syntax"
+    )
+    args = parser.parse_args(argv)
+    if not args.query and not args.add:
+        parser.error("Must provide a query and/or --add DIR")
+
+    with ReportIndex(args.index) as index:
+        for root in args.add:
+            updated, removed = index.index_directory(root)
+            print(f"Indexed {updated} new or changed reports under {root}", end="")
+            print(f" ({removed} removed)" if removed else "")
+        if not args.query:
+            return
+        try:
+            hits = index.search(args.query, limit=args.limit, raw=args.raw)
+        except sqlite3.OperationalError as e:
+            parser.error(f"Invalid query: {e}")
+
+    if not hits:
+        print("No matching reports.")
+    for hit in hits:
+        label = hit.interaction_id or hit.source
+        print(
+            f"{hit.score:7.2f}  {hit.title}\n         {label}\n         {hit.snippet}"
+        )
+
+
+# Fewest prompt terms a past report must share to be listed as similar
+SIMILAR_MIN_TERMS = 2
+
+
+def print_similar_reports(index, prompt, console, limit=3):
+    """Pre-flight check: show already-indexed reports similar to the prompt.
+
+    A report must share at least half of the prompt's terms, and no fewer
+    than SIMILAR_MIN_TERMS, so one common word does not make it similar.
+    """
+    terms = len(query_terms(prompt))
+    hits = index.search(
+        prompt, limit=limit, min_terms=max(SIMILAR_MIN_TERMS, (terms + 1) // 2)
+    )
+    if not hits:
+        return
+    console.print("[yellow]Similar reports found:[/yellow]")
+    for hit in hits:
+        label = hit.interaction_id or hit.source
+        console.print(
+            f"  [bold]{escape(hit.title)}[/bold] ({escape(label)})\n"
+            f"    [dim]{escape(hit.snippet)}[/dim]"
+        )
+
+
+def print_cached_followup(cached, output_path, console):
+    """Answer a follow-up from the speculative cache instead of the API."""
+    console.print(
+        "[dim]Answered from the follow-up cache "
+        f"(precomputed {datetime.fromtimestamp(cached.created_at):%Y-%m-%d %H:%M})"
+        "[/dim]\n"
+    )
+    console.print(Markdown(cached.report))
+    if output_path:
+        try:
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(cached.report)
+        except OSError as e:
+            raise RuntimeError(f"Failed to save report to '{output_path}': {e}") from e
+        console.print(f"\n[green]Report saved to {output_path}[/green]")
+    if cached.followup_interaction_id:
+        console.print(f"\n[dim]Interaction ID: {cached.followup_interaction_id}[/dim]")
+
+
+def wait_for_followups(followups, console):
+    """Let speculative follow-ups finish so their answers land in the cache."""
+    running = [key for key, status in followups.statuses.items() if status == "running"]
+    if not running:
+        return
+    console.print(
+        f"\n[dim]Precomputing {len(running)} follow-up(s) (Ctrl-C to skip)...[/dim]"
+    )
+    statuses = followups.wait()
+    for interaction_id, prompt in running:
+        status = statuses[interaction_id, prompt]
+        style = "green" if status == "completed" else "yellow"
+        line = f"  [{style}]{status}[/{style}] {escape(prompt)}"
+        if error := followups.errors.get((interaction_id, prompt)):
+            line += f" [dim]({escape(error)})[/dim]"
+        console.print(line)
+
+
+SUBCOMMANDS = {
+    "archive": run_archive,
+    "attach": run_attach,
+    "broker": run_broker,
+    "chain": run_chain,
+    "compare": run_compare,
+    "dashboard": run_dashboard,
+    "ingest": run_ingest,
+    "ledger": run_ledger,
+    "schedule": run_schedule,
+    "search": run_search,
+    "soak": run_soak,
+}
+
+
+def parse_viewport(value):
+    """Parse --viewport: a positive row count or 'auto'."""
+    if value == "auto":
+        return value
+    try:
+        rows = int(value)
+    except ValueError:
+        rows = 0
+    if rows < 1:
+        raise argparse.ArgumentTypeError(
+            f"Invalid viewport: {value}. Expected a positive number or 'auto'"
+        )
+    return rows
+
+
+def parse_deadline(value):
+    """Parse --deadline as a positive number of seconds."""
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = 0
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError(
+            f"Invalid deadline: {value}. Expected a positive number of seconds"
+        )
+    return seconds
+
+
+def parse_idle_timeout(value):
+    """Parse --idle-timeout seconds; 0 disables the stall watchdog."""
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = -1
+    if seconds < 0:
+        raise argparse.ArgumentTypeError(
+            f"Invalid idle timeout: {value}. Expected seconds >= 0"
+        )
+    return seconds
+
+
+def parse_rate_limit(value):
+    """Parse --rate-limit as a positive number of requests per minute."""
+    try:
+        per_minute = float(value)
+    except ValueError:
+        per_minute = 0
+    if per_minute <= 0:
+        raise argparse.ArgumentTypeError(
+            f"Invalid rate limit: {value}. Expected requests per minute > 0"
+        )
+    return per_minute
+
+
+def add_rate_limit_arguments(parser):
+    parser.add_argument(
+        "--rate-limit",
+        type=parse_rate_limit,
+        metavar="PER_MINUTE",
+        help="Admit at most this many API requests per minute, backing off "
+        "automatically on quota (429) errors",
+    )
+    parser.add_argument(
+        "--rate-limit-file",
+        metavar="PATH",
+        help="Share the --rate-limit budget with other processes using this file",
+    )
+
+
+def build_rate_limiter(parser, args):
+    if args.rate_limit_file and not args.rate_limit:
+        parser.error("--rate-limit-file requires --rate-limit")
+    if not args.rate_limit:
+        return None
+    try:
+        return RateLimiter(args.rate_limit / 60, state_path=args.rate_limit_file)
+    except RuntimeError as e:
+        parser.error(str(e))
+
+
+def parse_sink(value):
+    """Parse --sink into a (kind, target) pair; the sink is opened later."""
+    try:
+        return parse_sink_spec(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def print_key_utilization(client, console):
+    """Print per-key load when research ran through a KeyPool."""
+    if not isinstance(client, KeyPool):
+        return
+    for stats in client.utilization():
+        line = (
+            f"{stats['key']}: {stats['interactions']} interactions "
+            f"({stats['share']:.0%}), {stats['requests']} requests"
+        )
+        if stats["throttled"]:
+            line += f", {stats['throttled']} throttled"
+        console.print(f"[dim]{line}[/dim]")
+
+
+def open_sinks(specs):
+    """Open every --sink; if one fails, close the ones already opened."""
+    sinks = []
+    try:
+        for kind, target in specs:
+            sinks.append(create_sink(kind, target))
+    except Exception:
+        for sink in sinks:
+            close_quietly(sink)
+        raise
+    return sinks
+
+
+def print_sink_metrics(pipeline, console):
+    for name, stats in pipeline.metrics().items():
+        line = (
+            f"Sink {escape(name)}: {stats['written']} chunks, "
+            f"avg {stats['latency_avg'] * 1000:.1f}ms, "
+            f"max {stats['latency_max'] * 1000:.1f}ms"
+        )
+        if stats["dropped"]:
+            line += f", {stats['dropped']} dropped"
+        if stats["spilled"]:
+            line += f", {stats['spilled']} spilled"
+        if stats["error"]:
+            line += f", failed: {escape(stats['error'])}"
+        console.print(f"[dim]{line}[/dim]")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    # A prompt that is exactly a subcommand name needs "--" first
+    if argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
+
     parser = argparse.ArgumentParser(
         description="Deep Research Agent CLI",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -77,6 +1215,9 @@ Examples:
   # Research using a prompt file
   %(prog)s --prompt-file prompt.md --output report.md
 
+  # Research a one-word prompt that is also a subcommand name
+  %(prog)s -- compare
+
   # Follow-up on previous research
   %(prog)s "Elaborate on point 2" --previous-interaction-id <id>
 
@@ -86,8 +1227,67 @@ Examples:
   # Research with file search
   %(prog)s "Analyze our Q1 report" --file-search fileSearchStores/my-store
 
+  # Upload a document tree to a file search store (re-runs skip unchanged files)
+  %(prog)s ingest docs/ --store fileSearchStores/my-store
+
   # Custom agent config
   %(prog)s "Research topic" --agent-config '{"thinking_summaries": "none"}'
+
+  # Run a chain of follow-ups from a spec file
+  %(prog)s chain chain.json --output-dir bundle/
+
+  # Compare two agent configs on the same prompt
+  %(prog)s compare "Research topic" --agent-config '{"thinking_summaries": "none"}' --agent-config '{"thinking_summaries": "auto"}'
+
+  # Run several prompts at once, one live row per session
+  %(prog)s dashboard "Topic A" "Topic B" "Topic C" --output-dir reports/
+
+  # Re-run monitoring prompts weekly; review only what changed
+  %(prog)s schedule run monitors.yaml
+  %(prog)s schedule diff cve-landscape
+
+  # Watch a running interaction (several terminals can attach at once)
+  %(prog)s attach <interaction_id>
+
+  # Stop (and cancel server-side) if the run takes longer than 30 minutes
+  %(prog)s "Research topic" --deadline 1800
+
+  # Record token usage per team, then summarize spend by tag
+  %(prog)s "Research topic" --ledger --tag team-search
+  %(prog)s ledger --by tag --since 30
+
+  # Precompute likely follow-ups; asking one later is answered from the cache
+  %(prog)s "Research topic" --speculate
+  %(prog)s "Summarize in 3 bullets" --previous-interaction-id <id> --model gemini-2.5-pro
+
+  # One JSON line per event for scripts and orchestrators
+  %(prog)s "Research topic" --format ndjson
+
+  # Long reports: render only what fits on screen, then page the full report
+  %(prog)s "Research topic" --viewport --pager
+
+  # Save the thought-summary timeline next to the report (report.timeline.json)
+  %(prog)s "Research topic" --output report.md --timeline json
+
+  # Also write sections, TOC and citations as report.structure.json
+  %(prog)s "Research topic" --output report.md --structure
+
+  # Check for similar past reports first, then index the new one
+  %(prog)s "Research topic" --index ~/.radiant-filament/reports.db
+  %(prog)s search "solid-state batteries" --add docs/reports
+
+  # Tee the report to a gzip file and a webhook as it streams
+  %(prog)s "Research topic" --sink gzip:report.md.gz --sink https://example.com/hook
+
+  # Keep several concurrent runs under a shared 30 requests/minute budget
+  %(prog)s "Research topic" --rate-limit 30 --rate-limit-file /tmp/rf-quota.json
+
+  # Profile a run, or replay an archived run offline under the profiler
+  %(prog)s "Research topic" --profile prof --archive ~/.radiant-filament/archive --archive-events
+  %(prog)s "Research topic" --archive ~/.radiant-filament/archive --replay <id> --profile prof
+
+  # Archive the report (compressed, indexed by interaction ID)
+  %(prog)s "Research topic" --archive ~/.radiant-filament/archive
 """,
     )
     parser.add_argument(
@@ -138,8 +1338,168 @@ Examples:
         action="store_true",
         help="Use polling mode instead of streaming",
     )
+    parser.add_argument(
+        "--deadline",
+        type=parse_deadline,
+        metavar="SECONDS",
+        help="Stop and cancel the interaction server-side after this many seconds",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=parse_idle_timeout,
+        default=DEFAULT_IDLE_TIMEOUT,
+        metavar="SECONDS",
+        help="Resume a stream after this long without events; 0 disables "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--viewport",
+        nargs="?",
+        const="auto",
+        type=parse_viewport,
+        metavar="ROWS",
+        help="While streaming, render only the last ROWS rows of the report "
+        "(default when given without ROWS: fit the terminal)",
+    )
+    parser.add_argument(
+        "--pager",
+        action="store_true",
+        help="Open the full report in a pager once streaming completes",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["rich", "ndjson"],
+        default="rich",
+        help="Terminal rendering, or one JSON line per event on stdout for "
+        "scripts (status messages go to stderr) (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--timeline",
+        choices=["json", "markdown"],
+        help="Write the thought-summary timeline next to --output in this format",
+    )
+    parser.add_argument(
+        "--structure",
+        action="store_true",
+        help="Write sections, table of contents and citations as JSON next to "
+        "--output (report.structure.json)",
+    )
+    parser.add_argument(
+        "--archive",
+        metavar="DIR",
+        help="Write the completed report into a compressed report archive",
+    )
+    parser.add_argument(
+        "--archive-events",
+        action="store_true",
+        help="Also store the event log in the archive (requires --archive)",
+    )
+    parser.add_argument(
+        "--index",
+        metavar="PATH",
+        help="Report search index: show similar past reports before starting "
+        "and index the new report when it completes",
+    )
+    parser.add_argument(
+        "--ledger",
+        nargs="?",
+        const=DEFAULT_LEDGER_PATH,
+        metavar="PATH",
+        help="Append token usage and outcome to a usage ledger "
+        f"(default when given without PATH: {DEFAULT_LEDGER_PATH})",
+    )
+    parser.add_argument(
+        "--tag",
+        action="append",
+        default=[],
+        dest="tags",
+        help="Tag the ledger entry, e.g. a team or project (can be repeated)",
+    )
+    parser.add_argument(
+        "--speculate",
+        action="store_true",
+        help="When the research completes, run likely follow-ups in the "
+        f"background and cache them (default: {'; '.join(DEFAULT_FOLLOWUPS)})",
+    )
+    parser.add_argument(
+        "--speculate-prompt",
+        action="append",
+        default=[],
+        metavar="PROMPT",
+        dest="speculate_prompts",
+        help="Follow-up to precompute instead of the defaults; implies "
+        "--speculate (can be repeated)",
+    )
+    parser.add_argument(
+        "--speculate-model",
+        default=DEFAULT_FOLLOWUP_MODEL,
+        metavar="NAME",
+        help="Model that answers speculative follow-ups (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--followup-cache",
+        default=DEFAULT_CACHE_DIR,
+        metavar="DIR",
+        help="Where speculative follow-up answers are cached (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not answer a --model follow-up from the follow-up cache",
+    )
+    parser.add_argument(
+        "--sink",
+        action="append",
+        type=parse_sink,
+        metavar="SPEC",
+        dest="sinks",
+        help="Also stream the report to file:PATH, gzip:PATH, stdout, "
+        "tcp:HOST:PORT, unix:PATH or an http(s) URL (can be repeated)",
+    )
+    parser.add_argument(
+        "--sink-overflow",
+        choices=OVERFLOW_POLICIES,
+        default="block",
+        help="What to do when a slow sink's queue is full (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--sink-queue",
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        metavar="CHUNKS",
+        help="Per-sink queue size in text chunks (default: %(default)s)",
+    )
+
+    add_rate_limit_arguments(parser)
+    parser.add_argument(
+        "--profile",
+        metavar="PREFIX",
+        help="Profile the run: writes PREFIX.json (phase breakdown and top "
+        "allocations) plus PREFIX.pstats or PREFIX.folded",
+    )
+    parser.add_argument(
+        "--profile-mode",
+        choices=PROFILE_MODES,
+        default="deterministic",
+        help="cProfile (pstats) or low-overhead stack sampling (folded stacks "
+        "for flame graphs) (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="KEY",
+        help="Replay an archived run's event log instead of calling the API "
+        "(requires --archive; the report must be archived with --archive-events)",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=0.0,
+        metavar="FACTOR",
+        help="Replay pacing: 0 as fast as possible, 1 original timing "
+        "(default: %(default)s)",
+    )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Validation: exactly one of prompt or --prompt-file required
     if args.prompt and args.prompt_file:
@@ -159,6 +1519,33 @@ Examples:
     if args.model and not args.previous_interaction_id:
         parser.error("--model requires --previous-interaction-id")
 
+    if args.archive_events and not args.archive:
+        parser.error("--archive-events requires --archive")
+    if args.tags and not args.ledger:
+        parser.error("--tag requires --ledger")
+    speculate = args.speculate or bool(args.speculate_prompts)
+
+    if args.no_stream and (args.viewport or args.pager or args.timeline):
+        parser.error("--viewport, --pager and --timeline require streaming mode")
+    ndjson = args.format == "ndjson"
+    if ndjson and (args.no_stream or args.viewport or args.pager):
+        parser.error(
+            "--format ndjson cannot be combined with --no-stream, --viewport or --pager"
+        )
+    if ndjson and any(kind == "stdout" for kind, _ in args.sinks or ()):
+        parser.error("--format ndjson cannot be combined with --sink stdout")
+    if args.timeline and not args.output:
+        parser.error("--timeline requires --output")
+    if args.structure and not args.output:
+        parser.error("--structure requires --output")
+    if args.sink_queue < 1:
+        parser.error("--sink-queue must be at least 1")
+    rate_limiter = build_rate_limiter(parser, args)
+    if args.replay and not args.archive:
+        parser.error("--replay requires --archive")
+    if args.replay_speed < 0:
+        parser.error("--replay-speed must be >= 0")
+
     # Parse agent config
     try:
         agent_config = parse_agent_config(args.agent_config)
@@ -175,23 +1562,144 @@ Examples:
             }
         ]
 
+    replay_client = None
+    if args.replay:
+        try:
+            replay_client = ReplayClient.from_archive(
+                ReportArchive(args.archive), args.replay, speed=args.replay_speed
+            )
+        except KeyError:
+            parser.error(f"No archived report matches '{args.replay}'")
+        except ValueError as e:
+            parser.error(str(e))
+
+    cache = FollowUpCache(args.followup_cache)
+    # A follow-up that was precomputed is answered without calling the API
+    if args.model and not (args.no_cache or ndjson or replay_client):
+        cached = cache.get(args.previous_interaction_id, args.prompt, args.model)
+        if cached is not None:
+            try:
+                print_cached_followup(cached, args.output, Console())
+            except RuntimeError as e:
+                print(f"An error occurred: {e}", file=sys.stderr)
+                sys.exit(1)
+            return
+
+    agent = None
+    search_index = None
+    pipeline = None
+    profiler = None
+    followups = None
+    cancel_token = CancellationToken(deadline=args.deadline) if args.deadline else None
     try:
-        agent = DeepResearchAgent(agent_name=args.agent_name)
-        research_method = agent.research_poll if args.no_stream else agent.research
-        research_method(
-            args.prompt,
-            agent_config=agent_config,
-            output_path=args.output,
-            previous_interaction_id=args.previous_interaction_id,
-            model=args.model,
-            tools=tools,
+        archive = None
+        # A replayed run is not archived a second time
+        if args.archive and replay_client is None:
+            archive = ReportArchive(args.archive, store_events=args.archive_events)
+        search_index = ReportIndex(args.index) if args.index else None
+        ledger = None
+        # Nor does it incur usage
+        if args.ledger and replay_client is None:
+            ledger = UsageLedger(args.ledger, tags=args.tags)
+        if args.profile:
+            profiler = Profiler(args.profile, mode=args.profile_mode)
+        # Nor is it followed up
+        if speculate and replay_client is None:
+            followups = SpeculativeFollowUps(
+                args.speculate_prompts or DEFAULT_FOLLOWUPS,
+                model=args.speculate_model,
+                cache=cache,
+            )
+        agent = DeepResearchAgent(
+            agent_name=args.agent_name,
+            client=replay_client,
+            archive=archive,
+            search_index=search_index,
+            idle_timeout=args.idle_timeout,
+            rate_limiter=rate_limiter,
+            phase_timer=profiler.timer if profiler else None,
+            ledger=ledger,
+            followups=followups,
         )
+        if ndjson:
+            # Keep stdout for event lines only
+            agent.console = Console(stderr=True)
+        if search_index is not None:
+            print_similar_reports(search_index, args.prompt, agent.console)
+        if args.sinks:
+            pipeline = OutputPipeline(
+                open_sinks(args.sinks),
+                queue_size=args.sink_queue,
+                overflow=args.sink_overflow,
+            )
+        research_kwargs = {
+            "agent_config": agent_config,
+            "output_path": args.output,
+            "previous_interaction_id": args.previous_interaction_id,
+            "model": args.model,
+            "tools": tools,
+            "cancel_token": cancel_token,
+            "report_parser": ReportParser() if args.structure else None,
+            "pipeline": pipeline,
+        }
+        with profiler or nullcontext():
+            if ndjson:
+                result = research_ndjson(agent, args.prompt, **research_kwargs)
+                if not result.ok:
+                    sys.exit(1)
+            elif args.no_stream:
+                agent.research_poll(args.prompt, **research_kwargs)
+            else:
+                agent.research(
+                    args.prompt,
+                    viewport=args.viewport,
+                    pager=args.pager,
+                    **research_kwargs,
+                )
+        if profiler is not None:
+            agent.console.print(f"[dim]{format_breakdown(profiler.report)}[/dim]")
+            agent.console.print(
+                f"[green]Profile saved to {', '.join(profiler.paths)}[/green]"
+            )
+        if args.timeline:
+            path = timeline_path(args.output, args.timeline)
+            agent.timeline.write(path, args.timeline)
+            agent.console.print(f"[green]Timeline saved to {path}[/green]")
+        if args.structure:
+            path = sidecar_path(args.output, "structure.json")
+            research_kwargs["report_parser"].write_json(path)
+            agent.console.print(f"[green]Structure saved to {path}[/green]")
+        if pipeline is not None:
+            print_sink_metrics(pipeline, agent.console)
+        print_key_utilization(agent.client, agent.console)
+        if agent.interaction_id:
+            agent.console.print(f"\n[dim]Interaction ID: {agent.interaction_id}[/dim]")
+        if followups is not None:
+            try:
+                wait_for_followups(followups, agent.console)
+            except KeyboardInterrupt:
+                agent.console.print("[yellow]Skipped remaining follow-ups.[/yellow]")
     except KeyboardInterrupt:
-        print("\nResearch cancelled by user.")
+        out = sys.stderr if ndjson else sys.stdout
+        print("\nResearch cancelled by user.", file=out)
+        if agent is not None and agent.cancel():
+            print(
+                f"Cancelled interaction {agent.interaction_id} server-side.", file=out
+            )
         sys.exit(0)
+    except ResearchCancelled as e:
+        print(f"Research stopped: {e.reason}", file=sys.stderr)
+        sys.exit(1)
     except Exception as e:
         print(f"An error occurred: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if pipeline is not None:
+            pipeline.close()
+        if followups is not None:
+            followups.close()
+        if search_index is not None:
+            search_index.close()
 
 
 if __name__ == "__main__":
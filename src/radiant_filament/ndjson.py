@@ -0,0 +1,126 @@
+import json
+import sys
+import time
+
+from .result import ResearchResult
+
+SCHEMA_VERSION = 1
+
+
+class NdjsonWriter:
+    """Writes research progress to a text stream, one JSON object per line.
+
+    Every line carries the same envelope::
+
+        {"v": 1, "type": ..., "ts": <unix seconds>,
+         "interaction_id": <str|null>, "last_event_id": <str|null>, ...}
+
+    ``last_event_id`` is the resume point for ``get(..., last_event_id=...)``.
+    Types and their extra fields:
+
+    - ``start``: the interaction was created.
+    - ``text``: ``text``, a report delta.
+    - ``thought``: ``text``, a thought summary.
+    - ``reconnect``: ``attempt`` and ``error``; the stream dropped and is about
+      to be resumed.
+    - ``complete``: ``status`` ("completed") and ``metrics``. Last line of a
+      successful run.
+    - ``error``: ``status`` ("failed" or "cancelled") and ``error``. Last line
+      of an unsuccessful run.
+
+    Within a schema version, fields are only ever added, never renamed or
+    removed. Each line is flushed as soon as it is written.
+    """
+
+    def __init__(self, stream=None, *, clock=time.time):
+        self.stream = stream or sys.stdout
+        self.clock = clock
+        self.interaction_id = None
+        self.last_event_id = None
+
+    def emit(self, event_type, **fields):
+        line = {
+            "v": SCHEMA_VERSION,
+            "type": event_type,
+            "ts": round(self.clock(), 3),
+            "interaction_id": self.interaction_id,
+            "last_event_id": self.last_event_id,
+            **fields,
+        }
+        self.stream.write(json.dumps(line, separators=(",", ":")) + "\n")
+        self.stream.flush()
+
+
+def research_ndjson(
+    agent,
+    prompt,
+    *,
+    stream=None,
+    output_path=None,
+    report_parser=None,
+    pipeline=None,
+    **kwargs,
+) -> ResearchResult:
+    """Run research and report it as NDJSON lines instead of rendering.
+
+    Args:
+        agent: The DeepResearchAgent to run.
+        prompt: The research prompt or follow-up question.
+        stream: Text stream to write lines to (default: stdout).
+        output_path: Optional path the report is also written to as it arrives.
+        report_parser: Optional ReportParser fed every text delta.
+        pipeline: Optional OutputPipeline that receives every text delta. It
+            is flushed and closed when the run ends.
+        **kwargs: Passed to :meth:`DeepResearchAgent.stream_research`.
+
+    Returns:
+        ResearchResult: The outcome; failures are reported, not raised.
+
+    Raises:
+        RuntimeError: If output_path cannot be opened for writing.
+    """
+    writer = NdjsonWriter(stream)
+    out_file = None
+    if output_path:
+        try:
+            out_file = open(output_path, "w", encoding="utf-8")
+        except OSError as e:
+            raise RuntimeError(f"Cannot write to '{output_path}': {e}") from e
+
+    def on_reconnect(attempt, error):
+        writer.last_event_id = agent.last_event_id
+        writer.emit("reconnect", attempt=attempt, error=str(error))
+
+    research = agent.stream_research(prompt, on_reconnect=on_reconnect, **kwargs)
+    try:
+        for record in research:
+            writer.interaction_id = record.interaction_id or agent.interaction_id
+            writer.last_event_id = record.event_id or writer.last_event_id
+            if record.event_type == "interaction.start":
+                writer.emit("start")
+            elif record.kind == "text":
+                writer.emit("text", text=record.text)
+                if report_parser is not None:
+                    report_parser.feed(record.text)
+                if pipeline is not None:
+                    pipeline.write(record.text)
+                if out_file:
+                    out_file.write(record.text)
+            else:
+                writer.emit("thought", text=record.thought)
+    finally:
+        if report_parser is not None:
+            report_parser.close()
+        if pipeline is not None:
+            pipeline.close()
+        if out_file:
+            out_file.close()
+
+    result = research.result
+    writer.interaction_id = result.interaction_id
+    writer.last_event_id = agent.last_event_id
+    if result.ok:
+        writer.emit("complete", status=result.status, metrics=result.metrics)
+    else:
+        writer.emit("error", status=result.status, error=result.error)
+    return result
@@ -0,0 +1,4 @@
+def sidecar_path(output_path: str, suffix: str) -> str:
+    """Path for a file stored next to a report, e.g. report.md -> report.<suffix>."""
+    base = output_path[:-3] if output_path.endswith(".md") else output_path
+    return f"{base}.{suffix}"
@@ -0,0 +1,55 @@
+class OutputCursor:
+    """Tracks how much of a polled interaction's text outputs was consumed.
+
+    Each poll returns the interaction's full output list. Outputs only ever
+    grow: new outputs are appended and the last text output may gain more
+    text between polls. :meth:`advance` returns just the part not seen on an
+    earlier poll, so callers write and render new text instead of the whole
+    report again.
+    """
+
+    def __init__(self):
+        self.outputs = 0  # Text outputs seen, including a partly consumed one
+        self.offset = 0  # Characters consumed from the last of them
+
+    def advance(self, outputs) -> list[str]:
+        """Return the new text in ``outputs`` as one string per output."""
+        texts = [
+            output.text
+            for output in outputs or ()
+            if output.type == "text" and output.text
+        ]
+        if not texts:
+            return []
+        start = max(self.outputs - 1, 0)
+        offset = self.offset if self.outputs else 0
+        new = []
+        for text in texts[start:]:
+            if len(text) > offset:
+                new.append(text[offset:])
+            offset = 0
+        if len(texts) >= self.outputs:
+            self.outputs = len(texts)
+            self.offset = len(texts[-1])
+        return new
+
+
+def split_renderable(text: str) -> tuple[str, str]:
+    """Split text into (complete Markdown blocks, trailing remainder).
+
+    Text is cut at the last blank line outside a fenced code block, so each
+    rendered piece closes its paragraphs, lists, tables and code fences.
+    """
+    cut = 0
+    in_fence = False
+    position = 0
+    for line in text.splitlines(keepends=True):
+        position += len(line)
+        if not line.endswith("\n"):
+            break
+        stripped = line.strip()
+        if stripped.startswith(("```", "~~~")):
+            in_fence = not in_fence
+        elif not stripped and not in_fence:
+            cut = position
+    return text[:cut], text[cut:]
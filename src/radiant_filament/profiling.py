@@ -0,0 +1,226 @@
+import cProfile
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+# Time not attributed to another phase is reported as "handling"
+PHASES = ("network", "handling", "render", "io")
+PROFILE_MODES = ("deterministic", "sampling")
+DEFAULT_SAMPLE_INTERVAL = 0.005
+TOP_ALLOCATIONS = 25
+
+
+class PhaseTimer:
+    """Accumulates wall time spent in named phases of a research run.
+
+    ``network`` covers waiting on the API (stream reads, create/get calls and
+    poll sleeps), ``render`` the Rich view updates, and ``io`` file, sink and
+    archive writes. Whatever remains of the wall time between :meth:`start`
+    and :meth:`stop` is ``handling``.
+    """
+
+    def __init__(self, *, clock=None):
+        self._clock = clock or time.perf_counter
+        self.totals = dict.fromkeys(PHASES, 0.0)
+        self.counts = dict.fromkeys(PHASES, 0)
+        self.started_at = None
+        self.stopped_at = None
+
+    def start(self):
+        self.started_at = self._clock()
+
+    def stop(self):
+        self.stopped_at = self._clock()
+
+    @contextmanager
+    def phase(self, name):
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.totals[name] += self._clock() - started
+            self.counts[name] += 1
+
+    def iterate(self, name, iterable):
+        """Yield from iterable, charging the time spent in next() to name."""
+        iterator = iter(iterable)
+        while True:
+            started = self._clock()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.totals[name] += self._clock() - started
+                self.counts[name] += 1
+            yield item
+
+    def breakdown(self) -> dict:
+        end = self.stopped_at if self.stopped_at is not None else self._clock()
+        total = end - (self.started_at if self.started_at is not None else end)
+        totals = dict(self.totals)
+        totals["handling"] = max(0.0, total - sum(totals.values()))
+        return {
+            "total": round(total, 4),
+            "phases": {
+                name: {
+                    "seconds": round(totals[name], 4),
+                    "share": round(totals[name] / total, 4) if total else 0.0,
+                    "count": self.counts[name],
+                }
+                for name in PHASES
+            },
+        }
+
+
+class _NullTimer:
+    """PhaseTimer stand-in used when profiling is off; adds no overhead."""
+
+    _context = nullcontext()
+
+    def phase(self, name):
+        return self._context
+
+    def iterate(self, name, iterable):
+        return iterable
+
+
+NULL_TIMER = _NullTimer()
+
+
+class _StackSampler:
+    """Samples one thread's stack at a fixed interval into folded stacks."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="profile-sampler", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_filename}:{code.co_name}")
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def write(self, path):
+        """Write collapsed stacks (flamegraph.pl / speedscope input)."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class Profiler:
+    """CPU + memory profile of a block of code, with a per-phase breakdown.
+
+    ``deterministic`` mode runs cProfile and writes ``<prefix>.pstats``;
+    ``sampling`` mode samples the calling thread's stack every
+    ``sample_interval`` seconds and writes collapsed stacks to
+    ``<prefix>.folded``. Both modes trace allocations with tracemalloc and
+    write the phase breakdown and top allocation sites to ``<prefix>.json``.
+    Only the calling thread is CPU-profiled; Rich's refresh thread is not.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        *,
+        mode: str = "deterministic",
+        sample_interval: float = DEFAULT_SAMPLE_INTERVAL,
+    ):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        self.prefix = prefix
+        self.mode = mode
+        self.sample_interval = sample_interval
+        self.timer = PhaseTimer()
+        self.paths: list[str] = []
+        self._profile = None
+        self._sampler = None
+        self._baseline = None
+        self._started_tracing = False
+
+    def __enter__(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._baseline = tracemalloc.take_snapshot()
+        if self.mode == "deterministic":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._sampler = _StackSampler(threading.get_ident(), self.sample_interval)
+            self._sampler.start()
+        self.timer.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timer.stop()
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if self._started_tracing:
+            tracemalloc.stop()
+        self._write(snapshot, current, peak)
+
+    def _write(self, snapshot, current, peak):
+        if self._profile is not None:
+            path = f"{self.prefix}.pstats"
+            self._profile.dump_stats(path)
+            self.paths.append(path)
+        if self._sampler is not None:
+            path = f"{self.prefix}.folded"
+            self._sampler.write(path)
+            self.paths.append(path)
+        top = snapshot.compare_to(self._baseline, "lineno")[:TOP_ALLOCATIONS]
+        self.report = {
+            "mode": self.mode,
+            **self.timer.breakdown(),
+            "memory": {
+                "current_bytes": current,
+                "peak_bytes": peak,
+                "top_allocations": [
+                    {
+                        "location": str(stat.traceback),
+                        "size_diff": stat.size_diff,
+                        "count_diff": stat.count_diff,
+                    }
+                    for stat in top
+                ],
+            },
+        }
+        path = f"{self.prefix}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report, f, indent=2)
+        self.paths.append(path)
+
+
+def format_breakdown(breakdown: dict) -> str:
+    """One-line phase summary, e.g. 'network 82% (41.0s), render 9% ...'."""
+    parts = [
+        f"{name} {phase['share']:.0%} ({phase['seconds']:.1f}s)"
+        for name, phase in breakdown["phases"].items()
+    ]
+    return f"Total {breakdown['total']:.1f}s: " + ", ".join(parts)
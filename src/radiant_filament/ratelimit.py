@@ -0,0 +1,191 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+from .cancellation import ResearchCancelled
+
+# AIMD tuning: halve the rate on a quota error, then recover linearly
+DECREASE_FACTOR = 0.5
+INCREASE_FRACTION = 0.05
+MIN_RATE_FRACTION = 0.1
+DEFAULT_MAX_ATTEMPTS = 5
+# Refill arithmetic can land a hair below a whole token
+_EPSILON = 1e-9
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """True if exc is an HTTP 429 / RESOURCE_EXHAUSTED quota error."""
+    for attr in ("code", "status_code"):
+        if getattr(exc, attr, None) == 429:
+            return True
+    if getattr(exc, "status", None) == "RESOURCE_EXHAUSTED":
+        return True
+    return "RESOURCE_EXHAUSTED" in str(exc)
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """Seconds from a Retry-After header on the error's response, if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return max(0.0, float(headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Token-bucket admission control for API calls, adapted on quota errors.
+
+    ``rate`` is the ceiling in requests per second and ``burst`` the bucket
+    size. A quota error halves the current rate and pauses admissions for the
+    Retry-After period (or one token interval); each success then raises the
+    rate by a small fixed step back toward the ceiling.
+
+    One instance is thread-safe and can be shared by every agent in a process.
+    With ``state_path``, the bucket lives in a file guarded by ``fcntl.flock``
+    so all processes on the host that use the same path share one budget.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        *,
+        min_rate: float | None = None,
+        state_path: str | None = None,
+        clock=None,
+        sleep=None,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        if state_path and fcntl is None:
+            raise RuntimeError("A shared rate-limit file requires fcntl (POSIX)")
+        self.max_rate = rate
+        self.min_rate = min_rate or rate * MIN_RATE_FRACTION
+        self.burst = burst
+        self.state_path = state_path
+        # Wall time is the only clock processes can agree on
+        self._clock = clock or (time.time if state_path else time.monotonic)
+        self._sleep = sleep or time.sleep
+        self._lock = threading.Lock()
+        self._state = self._initial_state()
+        self.stats = {"admitted": 0, "throttled": 0, "waited": 0.0}
+
+    def _initial_state(self):
+        return {
+            "tokens": float(self.burst),
+            "updated": self._clock(),
+            "rate": self.max_rate,
+            "paused_until": 0.0,
+        }
+
+    @contextmanager
+    def _locked_state(self):
+        """Yield the mutable bucket state, persisting it when file-backed."""
+        with self._lock:
+            if not self.state_path:
+                yield self._state
+                return
+            fd = os.open(self.state_path, os.O_RDWR | os.O_CREAT, 0o644)
+            with os.fdopen(fd, "r+", encoding="utf-8") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    try:
+                        state = json.loads(f.read() or "null") or self._initial_state()
+                    except json.JSONDecodeError:
+                        state = self._initial_state()
+                    yield state
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    @property
+    def rate(self) -> float:
+        """Current admission rate in requests per second."""
+        with self._locked_state() as state:
+            return state["rate"]
+
+    def _try_acquire(self) -> float:
+        """Take a token if available; otherwise return seconds until one is."""
+        with self._locked_state() as state:
+            now = self._clock()
+            elapsed = max(0.0, now - state["updated"])
+            state["tokens"] = min(self.burst, state["tokens"] + elapsed * state["rate"])
+            state["updated"] = now
+            if now < state["paused_until"]:
+                return state["paused_until"] - now
+            if state["tokens"] >= 1 - _EPSILON:
+                state["tokens"] = max(0.0, state["tokens"] - 1)
+                return 0.0
+            return (1 - state["tokens"]) / state["rate"]
+
+    def acquire(self, cancel_token=None) -> float:
+        """Block until a request may be sent. Returns the seconds waited.
+
+        Raises:
+            ResearchCancelled: If cancel_token fires while waiting.
+        """
+        waited = 0.0
+        while True:
+            delay = self._try_acquire()
+            if delay <= 0:
+                with self._lock:
+                    self.stats["admitted"] += 1
+                    self.stats["waited"] += waited
+                return waited
+            if cancel_token is None:
+                self._sleep(delay)
+            elif cancel_token.wait(delay):
+                raise ResearchCancelled(cancel_token.reason)
+            waited += delay
+
+    def on_success(self):
+        with self._locked_state() as state:
+            state["rate"] = min(
+                self.max_rate, state["rate"] + self.max_rate * INCREASE_FRACTION
+            )
+
+    def on_rate_limited(self, delay: float | None = None):
+        """Back off after a quota error: cut the rate and pause admissions."""
+        with self._locked_state() as state:
+            state["rate"] = max(self.min_rate, state["rate"] * DECREASE_FACTOR)
+            pause = delay if delay is not None else 1 / state["rate"]
+            state["paused_until"] = max(state["paused_until"], self._clock() + pause)
+            state["tokens"] = 0.0
+        with self._lock:
+            self.stats["throttled"] += 1
+
+    def call(
+        self, fn, *args, cancel_token=None, max_attempts=DEFAULT_MAX_ATTEMPTS, **kwargs
+    ):
+        """Call fn under admission control, retrying quota errors.
+
+        Raises:
+            ResearchCancelled: If cancel_token fires while waiting.
+            Exception: The last quota error after max_attempts, or any other
+                error from fn unchanged.
+        """
+        for attempt in range(1, max_attempts + 1):
+            self.acquire(cancel_token)
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == max_attempts:
+                    raise
+                self.on_rate_limited(retry_after(e))
+                continue
+            self.on_success()
+            return result
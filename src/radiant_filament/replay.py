@@ -0,0 +1,92 @@
+import time
+from types import SimpleNamespace
+
+from .archive import ReportArchive
+
+
+def event_from_log(entry: dict, interaction_id: str):
+    """Rebuild an API-like event object from an event log entry."""
+    delta_type = entry.get("delta")
+    text = entry.get("text")
+    usage = entry.get("usage")
+    return SimpleNamespace(
+        event_type=entry["type"],
+        event_id=entry.get("event_id"),
+        interaction=SimpleNamespace(
+            id=interaction_id, usage=SimpleNamespace(**usage) if usage else None
+        ),
+        delta=SimpleNamespace(
+            type=delta_type,
+            text=text if delta_type == "text" else None,
+            content=SimpleNamespace(text=text),
+        ),
+        error=entry.get("error"),
+    )
+
+
+class ReplayClient:
+    """Stands in for genai.Client by replaying one recorded event log.
+
+    Useful for profiling and testing rendering offline. ``speed`` 0 replays as
+    fast as possible; 1.0 reproduces the recorded gaps between events.
+    Polling-mode requests complete immediately with the recorded report.
+    """
+
+    def __init__(self, events: list[dict], *, interaction_id="replay", speed=0.0):
+        self.events = events
+        self.interaction_id = interaction_id
+        self.speed = speed
+        self.interactions = self
+
+    @classmethod
+    def from_archive(cls, archive: ReportArchive, key: str, **kwargs):
+        """Replay the event log stored for an archived report.
+
+        Raises:
+            KeyError: If no report matches the key.
+            ValueError: If the report was archived without its event log.
+        """
+        entry = archive.get(key)
+        if entry is None:
+            raise KeyError(key)
+        events = list(archive.iter_events(key))
+        if not events:
+            raise ValueError(
+                f"No event log stored for '{key}'; archive runs with --archive-events"
+            )
+        return cls(events, interaction_id=entry.interaction_id or "replay", **kwargs)
+
+    def _stream(self, last_event_id=None):
+        events = self.events
+        if last_event_id is not None:
+            ids = [entry.get("event_id") for entry in events]
+            if last_event_id in ids:
+                events = events[ids.index(last_event_id) + 1 :]
+        previous_ts = None
+        for entry in events:
+            ts = entry.get("ts")
+            if self.speed and previous_ts is not None and ts is not None:
+                time.sleep(max(0.0, ts - previous_ts) / self.speed)
+            previous_ts = ts
+            yield event_from_log(entry, self.interaction_id)
+
+    def _completed(self):
+        report = "".join(
+            entry.get("text", "")
+            for entry in self.events
+            if entry.get("delta") == "text"
+        )
+        return SimpleNamespace(
+            id=self.interaction_id,
+            status="completed",
+            outputs=[SimpleNamespace(type="text", text=report)],
+        )
+
+    def create(self, stream=False, **kwargs):
+        return self._stream() if stream else self._completed()
+
+    def get(self, id, stream=False, last_event_id=None, **kwargs):
+        return self._stream(last_event_id) if stream else self._completed()
+
+    def cancel(self, id, **kwargs):
+        return None
@@ -0,0 +1,166 @@
+import json
+import re
+from dataclasses import asdict, dataclass, field
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s{0,3}(`{3,}|~{3,})")
+_LINK = re.compile(r"\[([^\]]*)\]\((https?://[^)\s]+)\)")
+_BARE_URL = re.compile(r"https?://[^\s<>()\[\]\"']+")
+_TRAILING_PUNCTUATION = ".,;:!?"
+
+
+def slugify(title: str) -> str:
+    """GitHub-style heading anchor."""
+    slug = re.sub(r"[^\w\- ]", "", title.lower()).strip()
+    return re.sub(r"\s", "-", slug)
+
+
+@dataclass
+class Section:
+    index: int
+    level: int
+    title: str
+    anchor: str
+    body: str = ""
+
+
+@dataclass
+class Citation:
+    index: int
+    url: str
+    label: str | None
+    section: str | None
+    count: int = 1
+
+
+@dataclass
+class _OpenSection:
+    level: int
+    title: str
+    lines: list[str] = field(default_factory=list)
+
+
+class ReportParser:
+    """Single-pass, incremental parser for streamed Markdown reports.
+
+    Feed it text deltas as they arrive. Work is done per completed line, so the
+    cost of a delta is proportional to its own length. Headings inside fenced
+    code blocks are ignored. A section is finalized (and ``on_section`` called)
+    when the next heading starts or the parser is closed; each URL is reported
+    to ``on_citation`` the first time it appears.
+    """
+
+    def __init__(self, on_section=None, on_citation=None):
+        self.on_section = on_section
+        self.on_citation = on_citation
+        self.sections: list[Section] = []
+        self.citations: dict[str, Citation] = {}
+        self._pending: list[str] = []
+        self._current = _OpenSection(level=0, title="")
+        self._fence = None
+        self._anchors: dict[str, int] = {}
+        self._closed = False
+
+    def feed(self, text: str):
+        if "\n" not in text:
+            self._pending.append(text)
+            return
+        first, *rest = text.split("\n")
+        self._pending.append(first)
+        self._process_line("".join(self._pending))
+        *complete, tail = rest
+        for line in complete:
+            self._process_line(line)
+        self._pending = [tail] if tail else []
+
+    def close(self):
+        """Flush the last partial line and finalize the open section."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._pending:
+            self._process_line("".join(self._pending))
+            self._pending = []
+        self._finalize_section()
+
+    def _process_line(self, line: str):
+        fence = _FENCE.match(line)
+        if fence:
+            marker = fence.group(1)
+            if self._fence is None:
+                self._fence = marker[0]
+            elif marker[0] == self._fence:
+                self._fence = None
+        elif self._fence is None:
+            heading = _HEADING.match(line)
+            if heading:
+                self._finalize_section()
+                self._current = _OpenSection(
+                    level=len(heading.group(1)), title=heading.group(2)
+                )
+                return
+        self._current.lines.append(line)
+        if "http" in line:
+            self._collect_citations(line)
+
+    def _collect_citations(self, line: str):
+        for label, url in _LINK.findall(line):
+            self._add_citation(url, label or None)
+        for url in _BARE_URL.findall(_LINK.sub("", line)):
+            self._add_citation(url.rstrip(_TRAILING_PUNCTUATION), None)
+
+    def _add_citation(self, url, label):
+        citation = self.citations.get(url)
+        if citation is not None:
+            citation.count += 1
+            return
+        citation = Citation(
+            index=len(self.citations) + 1,
+            url=url,
+            label=label,
+            section=self._current.title or None,
+        )
+        self.citations[url] = citation
+        if self.on_citation:
+            self.on_citation(citation)
+
+    def _unique_anchor(self, title):
+        anchor = slugify(title)
+        seen = self._anchors.get(anchor, 0)
+        self._anchors[anchor] = seen + 1
+        return f"{anchor}-{seen}" if seen else anchor
+
+    def _finalize_section(self):
+        current = self._current
+        body = "\n".join(current.lines).strip("\n")
+        if current.level == 0 and not body.strip():
+            return
+        section = Section(
+            index=len(self.sections),
+            level=current.level,
+            title=current.title,
+            anchor=self._unique_anchor(current.title) if current.level else "",
+            body=body,
+        )
+        self.sections.append(section)
+        if self.on_section:
+            self.on_section(section)
+
+    @property
+    def toc(self) -> list[dict]:
+        return [
+            {"level": s.level, "title": s.title, "anchor": s.anchor}
+            for s in self.sections
+            if s.level
+        ]
+
+    def to_dict(self) -> dict:
+        return {
+            "toc": self.toc,
+            "sections": [asdict(s) for s in self.sections],
+            "citations": [asdict(c) for c in self.citations.values()],
+        }
+
+    def write_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
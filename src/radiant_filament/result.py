@@ -0,0 +1,171 @@
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+
+from .cancellation import ResearchCancelled
+from .timeline import ThoughtTimeline
+
+
+def _timings(started, first_text_at=None):
+    """Build a timings dict (seconds) from monotonic timestamps."""
+    timings = {"duration": round(time.monotonic() - started, 3)}
+    if first_text_at is not None:
+        timings["time_to_first_text"] = round(first_text_at - started, 3)
+    return timings
+
+
+@dataclass(eq=False)
+class ResearchResult:
+    """Outcome of one research run, independent of any rendering.
+
+    ``status`` is "completed", "failed" or "cancelled" (with ``error`` set for
+    the latter two). The report is kept as the streamed chunks and joined only
+    when ``report`` is first read.
+    """
+
+    prompt: str
+    status: str
+    interaction_id: str | None = None
+    chunks: list[str] = field(default_factory=list, repr=False)
+    error: str | None = None
+    timings: dict = field(default_factory=dict)
+    stream_stats: dict = field(default_factory=dict)
+    timeline: ThoughtTimeline | None = field(default=None, repr=False)
+
+    @cached_property
+    def report(self) -> str:
+        return "".join(self.chunks)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "completed"
+
+    @property
+    def metrics(self) -> dict:
+        """Timings plus stream health and report size, as one flat dict."""
+        return {
+            **self.timings,
+            "stalls": self.stream_stats.get("stalls", 0),
+            "reconnects": self.stream_stats.get("reconnects", 0),
+            "report_chars": sum(len(chunk) for chunk in self.chunks),
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "prompt": self.prompt,
+            "status": self.status,
+            "interaction_id": self.interaction_id,
+            "error": self.error,
+            "metrics": self.metrics,
+            "timeline": self.timeline.to_dict() if self.timeline is not None else None,
+            "report": self.report,
+        }
+
+
+class ResearchStream:
+    """Iterator over a research run's text chunks and thought summaries.
+
+    Yields StreamEvent records as they arrive: the ``interaction.start``
+    record, then those whose ``kind`` is "text" or "thought_summary". Nothing
+    is rendered. Once iteration ends, ``result`` holds
+    the ResearchResult. Reading ``result`` first consumes the whole run::
+
+        stream = agent.stream_research("Research topic")
+        for chunk in stream:
+            if chunk.kind == "text":
+                print(chunk.text, end="")
+        print(stream.result.interaction_id, stream.result.metrics)
+
+    Errors and cancellation end iteration and are reported through
+    ``result.status`` and ``result.error`` rather than raised.
+    """
+
+    def __init__(self, agent, prompt, **kwargs):
+        self.agent = agent
+        self.prompt = prompt
+        self.kwargs = kwargs
+        self._result = None
+        self._records = self._run()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._records)
+
+    @property
+    def result(self) -> ResearchResult:
+        if self._result is None:
+            for _ in self:
+                pass
+        return self._result
+
+    def close(self):
+        """Stop consuming the stream early (the remote run is left running)."""
+        self._records.close()
+
+    def _run(self):
+        agent = self.agent
+        chunks = []
+        agent.timeline = timeline = ThoughtTimeline(agent.timeline_capacity)
+        archive = agent.archive
+        events = [] if archive is not None and archive.store_events else None
+        started = time.monotonic()
+        first_text_at = None
+        status = "failed"
+        error = "Stream ended before the interaction completed"
+        with agent._track_usage(
+            self.prompt,
+            agent_config=self.kwargs.get("agent_config"),
+            model=self.kwargs.get("model"),
+        ) as usage_entry:
+            try:
+                for event in agent.stream_events(self.prompt, **self.kwargs):
+                    if events is not None:
+                        events.append(event.to_log_entry())
+                    if event.event_type == "interaction.start":
+                        yield event
+                    elif event.kind == "text":
+                        if first_text_at is None:
+                            first_text_at = time.monotonic()
+                        chunks.append(event.text)
+                        yield event
+                    elif event.kind == "thought_summary":
+                        timeline.record(event.thought)
+                        yield event
+                    elif event.error is not None:
+                        error = f"Research error: {event.error}"
+                    elif event.is_terminal:
+                        status, error = "completed", None
+                        usage_entry.usage = event.usage
+            except ResearchCancelled as e:
+                status, error = "cancelled", e.reason
+            except GeneratorExit:
+                status, error = "cancelled", "Stream closed by caller"
+                raise
+            except Exception as e:
+                error = str(e)
+            finally:
+                timeline.finish()
+                usage_entry.outcome = status
+                usage_entry.error = error
+                self._result = ResearchResult(
+                    self.prompt,
+                    status,
+                    interaction_id=agent.interaction_id,
+                    chunks=chunks,
+                    error=error,
+                    timings=_timings(started, first_text_at),
+                    stream_stats=dict(agent.stream_stats),
+                    timeline=timeline,
+                )
+
+        if status == "completed":
+            agent._record_completion(
+                self.prompt,
+                self._result.report,
+                agent_config=self.kwargs.get("agent_config"),
+                model=self.kwargs.get("model"),
+                timings=self._result.metrics,
+                events=events,
+            )
@@ -0,0 +1,590 @@
+import difflib
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+from rich.console import Console
+from rich.markup import escape
+
+from .agent import DeepResearchAgent
+from .cancellation import CancellationToken
+from .chain import load_spec_document
+from .ratelimit import RateLimiter
+
+DEFAULT_STORE_DIR = os.path.expanduser("~/.radiant-filament/schedules")
+DEFAULT_KEYFRAME_INTERVAL = 20
+INDEX_FILENAME = "versions.jsonl"
+DATA_FILENAME = "versions.rfv"
+LAST_RUN_FILENAME = "last_run"
+LOCK_FILENAME = "lock"
+MAX_SLEEP = 60.0
+
+CRON_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+    "@yearly": "0 0 1 1 *",
+}
+MONTH_NAMES = {
+    name: number
+    for number, name in enumerate(
+        "jan feb mar apr may jun jul aug sep oct nov dec".split(), start=1
+    )
+}
+DAY_NAMES = {
+    name: number for number, name in enumerate("sun mon tue wed thu fri sat".split())
+}
+SPEC_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+
+class ScheduleSpecError(ValueError):
+    """Raised when a cron expression or schedule spec is malformed."""
+
+
+def _parse_cron_field(value, low, high, names=None):
+    values = set()
+    for part in value.lower().split(","):
+        body, _, step = part.partition("/")
+        try:
+            step = int(step) if step else 1
+        except ValueError:
+            raise ScheduleSpecError(f"Invalid step in '{part}'") from None
+        if step < 1:
+            raise ScheduleSpecError(f"Invalid step in '{part}'")
+
+        def number(token):
+            if names and token in names:
+                return names[token]
+            try:
+                return int(token)
+            except ValueError:
+                raise ScheduleSpecError(f"Invalid value '{token}'") from None
+
+        if body == "*":
+            start, end = low, high
+        elif "-" in body:
+            first, _, last = body.partition("-")
+            start, end = number(first), number(last)
+        else:
+            start = number(body)
+            end = high if step > 1 else start
+        if not low <= start <= end <= high:
+            raise ScheduleSpecError(f"'{part}' is outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class CronSchedule:
+    """A five-field cron expression: minute hour day-of-month month day-of-week.
+
+    Fields accept ``*``, numbers, ranges (``1-5``), steps (``*/15``, ``0-30/10``),
+    comma lists and month/day names (``jan``, ``mon``); day-of-week 0 and 7 are
+    Sunday. As in cron, when both day fields are restricted a day matching
+    either one is due. ``@hourly``, ``@daily``, ``@weekly``, ``@monthly`` and
+    ``@yearly`` are accepted as shorthands. Times are local.
+    """
+
+    expression: str
+    minutes: frozenset
+    hours: frozenset
+    days: frozenset
+    months: frozenset
+    weekdays: frozenset
+    any_day: bool
+    any_weekday: bool
+
+    @classmethod
+    def parse(cls, expression) -> "CronSchedule":
+        """Raises ScheduleSpecError if the expression is not valid cron."""
+        fields = CRON_ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ScheduleSpecError(
+                f"Cron expression '{expression}' must have 5 fields "
+                "(minute hour day-of-month month day-of-week)"
+            )
+        minute, hour, day, month, weekday = fields
+        weekdays = _parse_cron_field(weekday, 0, 7, DAY_NAMES)
+        return cls(
+            expression=expression,
+            minutes=_parse_cron_field(minute, 0, 59),
+            hours=_parse_cron_field(hour, 0, 23),
+            days=_parse_cron_field(day, 1, 31),
+            months=_parse_cron_field(month, 1, 12, MONTH_NAMES),
+            weekdays=frozenset(d % 7 for d in weekdays),
+            any_day=day == "*",
+            any_weekday=weekday == "*",
+        )
+
+    def _day_matches(self, dt):
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.weekday() + 1) % 7 in self.weekdays
+        if not self.any_day and not self.any_weekday:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, dt: datetime) -> datetime:
+        """The first matching minute strictly after dt.
+
+        Raises:
+            ScheduleSpecError: If nothing matches within five years (e.g. Feb 30).
+        """
+        dt = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=5 * 366)
+        while dt < limit:
+            if dt.month not in self.months:
+                year, month = divmod(dt.month, 12)
+                dt = dt.replace(year=dt.year + year, month=month + 1, day=1)
+                dt = dt.replace(hour=0, minute=0)
+            elif not self._day_matches(dt):
+                dt = (dt + timedelta(days=1)).replace(hour=0, minute=0)
+            elif dt.hour not in self.hours:
+                dt = (dt + timedelta(hours=1)).replace(minute=0)
+            elif dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+            else:
+                return dt
+        raise ScheduleSpecError(f"'{self.expression}' never matches")
+
+
+@dataclass
+class ScheduledResearch:
+    name: str
+    schedule: CronSchedule
+    prompt: str
+    agent_name: str | None = None
+    agent_config: dict | None = None
+    tools: list | None = None
+
+
+def parse_schedule_specs(data) -> list[ScheduledResearch]:
+    """Build scheduled research specs from a decoded JSON/YAML document.
+
+    The document is one spec or ``{"specs": [...]}``. Each spec needs a
+    ``name`` (used as its version history key), a cron ``schedule`` and a
+    ``prompt``; ``agent_name``, ``agent_config`` and ``tools`` are optional.
+
+    Raises:
+        ScheduleSpecError: If the document is not a valid schedule spec.
+    """
+    raw_specs = data.get("specs") if isinstance(data, dict) else None
+    if raw_specs is None:
+        raw_specs = [data]
+    if not isinstance(raw_specs, list):
+        raise ScheduleSpecError("'specs' must be a list")
+    specs = []
+    for index, raw in enumerate(raw_specs, start=1):
+        if not isinstance(raw, dict):
+            raise ScheduleSpecError(f"Spec {index} must be an object")
+        name = raw.get("name")
+        if not isinstance(name, str) or not SPEC_NAME.match(name):
+            raise ScheduleSpecError(
+                f"Spec {index} needs a 'name' of letters, digits, '.', '_' or '-'"
+            )
+        if not raw.get("prompt") or not isinstance(raw["prompt"], str):
+            raise ScheduleSpecError(f"Spec '{name}' is missing a 'prompt'")
+        if not isinstance(raw.get("schedule"), str):
+            raise ScheduleSpecError(f"Spec '{name}' is missing a cron 'schedule'")
+        agent_config = raw.get("agent_config")
+        if agent_config is not None and not isinstance(agent_config, dict):
+            raise ScheduleSpecError(f"Spec '{name}': 'agent_config' must be an object")
+        if any(spec.name == name for spec in specs):
+            raise ScheduleSpecError(f"Duplicate spec name '{name}'")
+        specs.append(
+            ScheduledResearch(
+                name=name,
+                schedule=CronSchedule.parse(raw["schedule"]),
+                prompt=raw["prompt"],
+                agent_name=raw.get("agent_name"),
+                agent_config=agent_config,
+                tools=raw.get("tools"),
+            )
+        )
+    return specs
+
+
+def load_schedule_specs(path) -> list[ScheduledResearch]:
+    """Load scheduled research specs from a JSON or YAML file.
+
+    Raises:
+        ScheduleSpecError: If the file cannot be read or parsed.
+    """
+    return parse_schedule_specs(load_spec_document(path, ScheduleSpecError))
+
+
+def _lines(text):
+    return text.splitlines(keepends=True)
+
+
+def make_delta(old: str, new: str) -> tuple[list, int, int]:
+    """Encode new as edits against old.
+
+    Ops are ``[start, end]`` (copy those lines of old) or a string (insert it),
+    from SequenceMatcher opcodes; deleted lines are simply not copied.
+
+    Returns:
+        tuple: The ops, plus the number of lines added and removed.
+    """
+    old_lines, new_lines = _lines(old), _lines(new)
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    ops = []
+    added = removed = 0
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+            continue
+        removed += i2 - i1
+        added += j2 - j1
+        if j2 > j1:
+            ops.append("".join(new_lines[j1:j2]))
+    return ops, added, removed
+
+
+def apply_delta(old: str, ops: list) -> str:
+    old_lines = _lines(old)
+    parts = []
+    for op in ops:
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(old_lines[op[0] : op[1]])
+    return "".join(parts)
+
+
+@dataclass
+class ReportVersion:
+    """Index record for one stored version of a scheduled report.
+
+    ``kind`` is "full" (the zlib-compressed report) or "delta" (compressed
+    edits against the previous version). ``added``/``removed`` count changed
+    lines relative to the previous version.
+    """
+
+    number: int
+    kind: str
+    offset: int
+    length: int
+    size: int
+    sha256: str
+    interaction_id: str | None = None
+    added: int = 0
+    removed: int = 0
+    created_at: float = field(default_factory=time.time)
+
+
+class VersionStore:
+    """Version history of scheduled reports, stored as compressed deltas.
+
+    Each spec name gets a directory holding an append-only data file and a
+    ``versions.jsonl`` index. A version is stored as a delta against its
+    predecessor unless that would not be smaller, and every
+    ``keyframe_interval``-th version is stored in full, so reconstructing any
+    version replays a bounded number of deltas. Adding a version holds an
+    ``fcntl.flock`` on the spec directory where available, so separate
+    processes sharing the store cannot interleave appends.
+    """
+
+    def __init__(
+        self,
+        root=DEFAULT_STORE_DIR,
+        *,
+        keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+        compresslevel: int = 9,
+    ):
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1")
+        self.root = root
+        self.keyframe_interval = keyframe_interval
+        self.compresslevel = compresslevel
+        self._lock = threading.Lock()
+
+    def _dir(self, name):
+        if not SPEC_NAME.match(name):
+            raise ValueError(f"Invalid spec name '{name}'")
+        return os.path.join(self.root, name)
+
+    @contextmanager
+    def _locked(self, directory):
+        """Hold the store's thread lock and, on POSIX, the directory's file lock."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            fd = os.open(
+                os.path.join(directory, LOCK_FILENAME), os.O_RDWR | os.O_CREAT, 0o644
+            )
+            with os.fdopen(fd, "r+b") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def names(self) -> list[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name
+            for name in os.listdir(self.root)
+            if os.path.exists(os.path.join(self.root, name, INDEX_FILENAME))
+        )
+
+    def versions(self, name) -> list[ReportVersion]:
+        """Every stored version of name, oldest first; torn lines are skipped."""
+        path = os.path.join(self._dir(name), INDEX_FILENAME)
+        if not os.path.exists(path):
+            return []
+        versions = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    versions.append(ReportVersion(**json.loads(line)))
+                except (ValueError, TypeError):
+                    continue
+        return versions
+
+    def last_run(self, name) -> float | None:
+        """When name last ran (successfully or not); None if it never did."""
+        try:
+            with open(
+                os.path.join(self._dir(name), LAST_RUN_FILENAME), encoding="utf-8"
+            ) as f:
+                return float(f.read())
+        except (OSError, ValueError):
+            pass
+        versions = self.versions(name)
+        return versions[-1].created_at if versions else None
+
+    def mark_run(self, name, when: float):
+        """Record a run attempt, so separate ``--once`` processes share it."""
+        directory = self._dir(name)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, LAST_RUN_FILENAME)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(repr(when))
+        os.replace(path + ".tmp", path)
+
+    def _read_blob(self, name, version) -> bytes:
+        with open(os.path.join(self._dir(name), DATA_FILENAME), "rb") as f:
+            f.seek(version.offset)
+            blob = f.read(version.length)
+        if len(blob) != version.length:
+            raise RuntimeError(f"Version data for '{name}' is truncated")
+        return zlib.decompress(blob)
+
+    def _reconstruct(self, name, versions, number) -> str:
+        by_number = {v.number: v for v in versions}
+        if number not in by_number:
+            raise KeyError(f"{name} v{number}")
+        start = number
+        while by_number[start].kind != "full":
+            start -= 1
+        text = ""
+        for n in range(start, number + 1):
+            data = self._read_blob(name, by_number[n])
+            if by_number[n].kind == "full":
+                text = data.decode("utf-8")
+            else:
+                text = apply_delta(text, json.loads(data))
+        if hashlib.sha256(text.encode("utf-8")).hexdigest() != by_number[number].sha256:
+            raise RuntimeError(f"Version {number} of '{name}' failed its checksum")
+        return text
+
+    def read(self, name, number=None) -> str:
+        """Reconstruct a version (default: the latest).
+
+        Raises:
+            KeyError: If the spec or version does not exist.
+        """
+        versions = self.versions(name)
+        if not versions:
+            raise KeyError(name)
+        if number is None:
+            number = versions[-1].number
+        return self._reconstruct(name, versions, number)
+
+    def add(self, name, report: str, *, interaction_id=None) -> ReportVersion:
+        """Store report as the next version of name."""
+        directory = self._dir(name)
+        os.makedirs(directory, exist_ok=True)
+        with self._locked(directory):
+            versions = self.versions(name)
+            number = versions[-1].number + 1 if versions else 1
+            full_blob = zlib.compress(report.encode("utf-8"), self.compresslevel)
+            blob, kind, added, removed = full_blob, "full", len(_lines(report)), 0
+            if versions:
+                previous = self._reconstruct(name, versions, versions[-1].number)
+                ops, added, removed = make_delta(previous, report)
+                if (number - 1) % self.keyframe_interval:
+                    delta = json.dumps(ops, separators=(",", ":")).encode("utf-8")
+                    delta_blob = zlib.compress(delta, self.compresslevel)
+                    if len(delta_blob) < len(full_blob):
+                        blob, kind = delta_blob, "delta"
+
+            with open(os.path.join(directory, DATA_FILENAME), "ab") as f:
+                offset = f.tell()
+                f.write(blob)
+            version = ReportVersion(
+                number=number,
+                kind=kind,
+                offset=offset,
+                length=len(blob),
+                size=len(report),
+                sha256=hashlib.sha256(report.encode("utf-8")).hexdigest(),
+                interaction_id=interaction_id,
+                added=added,
+                removed=removed,
+            )
+            with open(
+                os.path.join(directory, INDEX_FILENAME), "a", encoding="utf-8"
+            ) as f:
+                f.write(json.dumps(asdict(version)) + "\n")
+            return version
+
+    def diff(self, name, old=None, new=None, context: int = 3) -> list[str]:
+        """Unified diff between two versions (default: latest vs. the one before).
+
+        Raises:
+            KeyError: If the spec or either version does not exist.
+        """
+        versions = self.versions(name)
+        if not versions:
+            raise KeyError(name)
+        if new is None:
+            new = versions[-1].number
+        if old is None:
+            old = new - 1
+        old_text = self._reconstruct(name, versions, old) if old >= 1 else ""
+        new_text = self._reconstruct(name, versions, new)
+        return list(
+            difflib.unified_diff(
+                _lines(old_text),
+                _lines(new_text),
+                fromfile=f"{name} v{old}",
+                tofile=f"{name} v{new}",
+                n=context,
+            )
+        )
+
+    def stats(self, name) -> dict:
+        """Stored bytes versus the uncompressed size of every version."""
+        versions = self.versions(name)
+        return {
+            "versions": len(versions),
+            "stored_bytes": sum(v.length for v in versions),
+            "full_bytes": sum(v.size for v in versions),
+            "deltas": sum(v.kind == "delta" for v in versions),
+        }
+
+
+class ResearchScheduler:
+    """Runs scheduled research specs on their cron schedules.
+
+    A spec is due when it has never run, or when its schedule has a slot
+    between its last run and now; missed slots collapse into one run. Run
+    attempts are recorded in ``store``, so each ``--once`` invocation sees
+    the previous ones. Completed reports become new versions in ``store``;
+    failed runs are retried at the next slot. Due specs run concurrently, up
+    to ``max_workers``.
+    """
+
+    def __init__(
+        self,
+        specs: list[ScheduledResearch],
+        store: VersionStore,
+        *,
+        client=None,
+        agent_name: str = "deep-research-pro-preview-12-2025",
+        max_workers: int = 4,
+        console: Console | None = None,
+        cancel_token: CancellationToken | None = None,
+        rate_limiter: RateLimiter | None = None,
+        clock=time.time,
+    ):
+        self.specs = specs
+        self.store = store
+        self.client = client
+        self.agent_name = agent_name
+        self.max_workers = max_workers
+        self.console = console or Console()
+        self.cancel_token = cancel_token or CancellationToken()
+        self.rate_limiter = rate_limiter
+        self.clock = clock
+        self.started = clock()
+        self.last_run = {spec.name: store.last_run(spec.name) for spec in specs}
+
+    def next_run(self, spec) -> float:
+        last = self.last_run[spec.name]
+        if last is None:
+            return self.started
+        return spec.schedule.next_after(datetime.fromtimestamp(last)).timestamp()
+
+    def due(self) -> list[ScheduledResearch]:
+        now = self.clock()
+        return [spec for spec in self.specs if self.next_run(spec) <= now]
+
+    def run_spec(self, spec) -> ReportVersion | None:
+        """Run one spec now; returns the stored version, or None on failure."""
+        agent = DeepResearchAgent(
+            agent_name=spec.agent_name or self.agent_name,
+            client=self.client,
+            rate_limiter=self.rate_limiter,
+        )
+        agent.console = self.console
+        self.console.print(f"[cyan]▶ {escape(spec.name)}[/cyan] started")
+        result = agent.stream_research(
+            spec.prompt,
+            agent_config=spec.agent_config,
+            tools=spec.tools,
+            cancel_token=self.cancel_token,
+        ).result
+        self.last_run[spec.name] = self.clock()
+        self.store.mark_run(spec.name, self.last_run[spec.name])
+        if not result.ok:
+            self.console.print(
+                f"[red]✗ {escape(spec.name)}: {escape(result.error)}[/red]"
+            )
+            return None
+        version = self.store.add(
+            spec.name, result.report, interaction_id=result.interaction_id
+        )
+        self.console.print(
+            f"[green]✓ {escape(spec.name)} v{version.number}[/green] "
+            f"(+{version.added} -{version.removed} lines, {version.kind}, "
+            f"{version.length:,} of {version.size:,} bytes stored)"
+        )
+        return version
+
+    def run_pending(self, specs=None) -> dict[str, ReportVersion | None]:
+        """Run every due spec (or the given ones) and wait for them."""
+        specs = self.due() if specs is None else specs
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                spec.name: executor.submit(self.run_spec, spec) for spec in specs
+            }
+            try:
+                return {name: future.result() for name, future in futures.items()}
+            except KeyboardInterrupt:
+                self.cancel_token.cancel("cancelled by user")
+                raise
+
+    def run_forever(self, sleep=time.sleep):
+        """Run due specs as their slots come up, until interrupted."""
+        while not self.cancel_token.cancelled:
+            self.run_pending()
+            wake = min(self.next_run(spec) for spec in self.specs)
+            sleep(max(0.0, min(MAX_SLEEP, wake - self.clock())))
@@ -0,0 +1,258 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+DEFAULT_INDEX_PATH = os.path.join("~", ".radiant-filament", "reports.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL UNIQUE,
+    interaction_id TEXT,
+    title TEXT,
+    mtime REAL,
+    size INTEGER,
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reports_interaction ON reports(interaction_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS reports_fts USING fts5(
+    title, prompt, body, tokenize = 'porter unicode61'
+);
+"""
+
+# Candidates ranked per requested hit when filtering by matched terms
+SEARCH_CANDIDATES = 10
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_STOP_WORDS = frozenset(
+    """
+    a an and are as at be but by can do does for from how i in into is it its
+    me my of on or our please research should that the their them then there
+    these this to up us was we what when where which who why will with you your
+    """.split()
+)
+
+
+@dataclass
+class SearchHit:
+    source: str
+    interaction_id: str | None
+    title: str
+    score: float
+    snippet: str
+
+
+def _title_of(text):
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            return line.lstrip("#").strip()[:200]
+    return ""
+
+
+def query_terms(text: str) -> list[str]:
+    """Distinct non-stop words of free text, as quoted FTS5 terms."""
+    terms = []
+    seen = set()
+    for word in _WORD.findall(text.lower()):
+        if len(word) < 3 or word in _STOP_WORDS or word in seen:
+            continue
+        seen.add(word)
+        terms.append(f'"{word}"')
+    return terms
+
+
+def match_query(text: str) -> str:
+    """Turn free text (e.g. a research prompt) into an FTS5 OR-query.
+
+    Each distinct non-stop word is quoted, so punctuation in prompts cannot
+    produce FTS syntax errors. Returns an empty string if no terms remain.
+    """
+    return " OR ".join(query_terms(text))
+
+
+class ReportIndex:
+    """Local SQLite FTS5 full-text index over research reports.
+
+    Reports are keyed by ``source``: an absolute file path for Markdown files,
+    or ``interaction:<id>`` for reports recorded by the agent. Re-indexing a
+    file whose mtime and size are unchanged is a no-op.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        path = os.path.expanduser(path)
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+    def _upsert(self, source, text, *, interaction_id, prompt, mtime, size):
+        title = _title_of(text)
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT id FROM reports WHERE source = ?", (source,)
+            ).fetchone()
+            if row:
+                rowid = row[0]
+                self._db.execute(
+                    "UPDATE reports SET interaction_id = ?, title = ?, mtime = ?, "
+                    "size = ?, indexed_at = ? WHERE id = ?",
+                    (interaction_id, title, mtime, size, time.time(), rowid),
+                )
+                self._db.execute("DELETE FROM reports_fts WHERE rowid = ?", (rowid,))
+            else:
+                rowid = self._db.execute(
+                    "INSERT INTO reports "
+                    "(source, interaction_id, title, mtime, size, indexed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (source, interaction_id, title, mtime, size, time.time()),
+                ).lastrowid
+            self._db.execute(
+                "INSERT INTO reports_fts (rowid, title, prompt, body) "
+                "VALUES (?, ?, ?, ?)",
+                (rowid, title, prompt or "", text),
+            )
+
+    def add_report(self, text, *, interaction_id=None, prompt=None, source=None):
+        """Index a report produced by the agent (or any other text)."""
+        if source is None:
+            if not interaction_id:
+                raise ValueError("add_report needs a source or an interaction_id")
+            source = f"interaction:{interaction_id}"
+        self._upsert(
+            source,
+            text,
+            interaction_id=interaction_id,
+            prompt=prompt,
+            mtime=None,
+            size=len(text),
+        )
+
+    def index_file(self, path) -> bool:
+        """Index a Markdown file if it is new or changed.
+
+        Returns:
+            bool: True if the file was (re)indexed, False if it was up to date.
+        """
+        source = os.path.abspath(path)
+        stat = os.stat(source)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT mtime, size FROM reports WHERE source = ?", (source,)
+            ).fetchone()
+        if row and row[0] == stat.st_mtime and row[1] == stat.st_size:
+            return False
+        # A stray non-UTF-8 byte must not stop a whole directory from indexing
+        with open(source, encoding="utf-8", errors="replace") as f:
+            text = f.read()
+        self._upsert(
+            source,
+            text,
+            interaction_id=None,
+            prompt=None,
+            mtime=stat.st_mtime,
+            size=stat.st_size,
+        )
+        return True
+
+    def index_directory(self, root, pattern=".md") -> tuple[int, int]:
+        """Index every file under root ending with pattern, pruning deleted ones.
+
+        Returns:
+            tuple[int, int]: (files indexed or updated, entries removed).
+        """
+        root = os.path.abspath(root)
+        seen = set()
+        updated = 0
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                if name.endswith(pattern):
+                    path = os.path.join(dirpath, name)
+                    seen.add(path)
+                    updated += self.index_file(path)
+
+        prefix = root.rstrip(os.sep) + os.sep
+        with self._lock, self._db:
+            stale = [
+                (rowid,)
+                for rowid, source in self._db.execute(
+                    "SELECT id, source FROM reports WHERE source LIKE ? ESCAPE '\\'",
+                    (prefix.replace("%", "\\%").replace("_", "\\_") + "%",),
+                )
+                if source not in seen
+            ]
+            self._db.executemany("DELETE FROM reports WHERE id = ?", stale)
+            self._db.executemany("DELETE FROM reports_fts WHERE rowid = ?", stale)
+        return updated, len(stale)
+
+    def search(self, query, *, limit=10, raw=False, min_terms=1) -> list[SearchHit]:
+        """Return the best-matching reports, ranked by BM25.
+
+        Args:
+            query: Free text, or an FTS5 query when raw is True.
+            limit: Maximum number of hits.
+            raw: Pass the query through to FTS5 unchanged.
+            min_terms: Only return reports matching at least this many
+                distinct query terms. Ignored when raw is True.
+        """
+        terms = [] if raw else query_terms(query)
+        expression = query if raw else " OR ".join(terms)
+        if not expression or (not raw and len(terms) < min_terms):
+            return []
+        filtered = min_terms > 1 and not raw
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT reports_fts.rowid, r.source, r.interaction_id, r.title, "
+                "bm25(reports_fts, 4.0, 2.0, 1.0) AS score, "
+                "snippet(reports_fts, 2, '[', ']', ' … ', 16) "
+                "FROM reports_fts JOIN reports r ON r.id = reports_fts.rowid "
+                "WHERE reports_fts MATCH ? ORDER BY score LIMIT ?",
+                # Filtering drops candidates, so rank a wider pool first
+                (expression, limit * SEARCH_CANDIDATES if filtered else limit),
+            ).fetchall()
+            if filtered:
+                matched = self._matched_terms([row[0] for row in rows], terms)
+                rows = [row for row in rows if matched[row[0]] >= min_terms][:limit]
+        return [
+            SearchHit(
+                source=source,
+                interaction_id=interaction_id,
+                title=title,
+                score=-score,
+                snippet=" ".join(snippet.split()),
+            )
+            for _, source, interaction_id, title, score, snippet in rows
+        ]
+
+    def _matched_terms(self, rowids, terms) -> dict[int, int]:
+        """Count how many of terms each of rowids matches. Caller holds _lock."""
+        counts = dict.fromkeys(rowids, 0)
+        if not rowids:
+            return counts
+        placeholders = ", ".join("?" * len(rowids))
+        for term in terms:
+            for (rowid,) in self._db.execute(
+                "SELECT rowid FROM reports_fts WHERE reports_fts MATCH ? "
+                f"AND rowid IN ({placeholders})",
+                (term, *rowids),
+            ):
+                counts[rowid] += 1
+        return counts
@@ -0,0 +1,332 @@
+import gzip
+import queue
+import socket
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+
+OVERFLOW_POLICIES = ("block", "drop", "spill")
+DEFAULT_QUEUE_SIZE = 1024
+# Queued chunks coalesced into one sink write
+MAX_BATCH = 64
+
+_CLOSE = object()
+
+
+class Sink(ABC):
+    """Destination for streamed report text. Subclasses implement write/close."""
+
+    name = "sink"
+
+    @abstractmethod
+    def write(self, text: str): ...
+
+    def close(self):  # noqa: B027 - optional; sinks without resources skip it
+        pass
+
+
+class FileSink(Sink):
+    def __init__(self, path: str):
+        self.name = f"file:{path}"
+        try:
+            self._file = open(path, "w", encoding="utf-8")
+        except OSError as e:
+            raise RuntimeError(f"Cannot write to '{path}': {e}") from e
+
+    def write(self, text):
+        self._file.write(text)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class GzipSink(Sink):
+    def __init__(self, path: str):
+        self.name = f"gzip:{path}"
+        try:
+            self._file = gzip.open(path, "wt", encoding="utf-8")
+        except OSError as e:
+            raise RuntimeError(f"Cannot write to '{path}': {e}") from e
+
+    def write(self, text):
+        self._file.write(text)
+
+    def close(self):
+        self._file.close()
+
+
+class StdoutSink(Sink):
+    name = "stdout"
+
+    def write(self, text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+
+class SocketSink(Sink):
+    """Streams UTF-8 text to a TCP (host, port) or Unix socket path."""
+
+    def __init__(self, address, *, timeout: float = 10):
+        if isinstance(address, tuple):
+            self.name = f"tcp:{address[0]}:{address[1]}"
+        else:
+            self.name = f"unix:{address}"
+        try:
+            if isinstance(address, tuple):
+                self._socket = socket.create_connection(address, timeout=timeout)
+            else:
+                self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                try:
+                    self._socket.settimeout(timeout)
+                    self._socket.connect(address)
+                except OSError:
+                    self._socket.close()
+                    raise
+        except OSError as e:
+            raise RuntimeError(f"Cannot connect to '{self.name}': {e}") from e
+
+    def write(self, text):
+        self._socket.sendall(text.encode("utf-8"))
+
+    def close(self):
+        self._socket.close()
+
+
+class WebhookSink(Sink):
+    """POSTs each (coalesced) chunk of text to an HTTP endpoint."""
+
+    def __init__(self, url: str, *, timeout: float = 10):
+        self.name = url
+        self.url = url
+        self.timeout = timeout
+
+    def write(self, text):
+        request = urllib.request.Request(
+            self.url,
+            data=text.encode("utf-8"),
+            headers={"Content-Type": "text/plain; charset=utf-8"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+def parse_sink_spec(spec: str) -> tuple[str, object]:
+    """Validate a sink spec and return (kind, target) without opening anything.
+
+    Accepted forms: ``file:PATH``, ``gzip:PATH``, ``stdout``, ``tcp:HOST:PORT``,
+    ``unix:PATH`` and ``http(s)://URL``.
+
+    Raises:
+        ValueError: If the spec is not recognized.
+    """
+    if spec == "stdout":
+        return "stdout", None
+    if spec.startswith(("http://", "https://")):
+        return "webhook", spec
+    kind, _, target = spec.partition(":")
+    if kind in ("file", "gzip", "unix") and target:
+        return kind, target
+    if kind == "tcp":
+        host, _, port = target.rpartition(":")
+        if host and port.isdigit():
+            return "tcp", (host, int(port))
+    raise ValueError(
+        f"Invalid sink: {spec}. Expected file:PATH, gzip:PATH, stdout, "
+        "tcp:HOST:PORT, unix:PATH or an http(s) URL"
+    )
+
+
+def create_sink(kind: str, target) -> Sink:
+    """Open a sink from a (kind, target) pair returned by parse_sink_spec."""
+    if kind == "file":
+        return FileSink(target)
+    if kind == "gzip":
+        return GzipSink(target)
+    if kind == "stdout":
+        return StdoutSink()
+    if kind in ("tcp", "unix"):
+        return SocketSink(target)
+    if kind == "webhook":
+        return WebhookSink(target)
+    raise ValueError(f"Unknown sink kind: {kind}")
+
+
+class _SinkWorker:
+    """Feeds one sink from its own bounded queue on a dedicated thread."""
+
+    def __init__(self, sink: Sink, queue_size: int, overflow: str):
+        self.sink = sink
+        self.overflow = overflow
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._spill = None
+        self._spill_lock = threading.Lock()
+        # Chunks in the current spill file, the sum of their enqueue times and
+        # the enqueue time of the first, for latency metrics
+        self._spill_chunks = 0
+        self._spill_enqueued = 0.0
+        self._spill_oldest = 0.0
+        self.written = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.error = None
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._thread = threading.Thread(
+            target=self._run, name=f"sink-{sink.name}", daemon=True
+        )
+        self._thread.start()
+
+    def put(self, text):
+        item = (time.monotonic(), text)
+        if self.overflow == "block":
+            self._queue.put(item)
+            return
+        if self.overflow == "spill":
+            with self._spill_lock:
+                # Once spilling, keep spilling until drained to preserve order
+                if self._spill is None:
+                    try:
+                        self._queue.put_nowait(item)
+                        return
+                    except queue.Full:
+                        self._spill = tempfile.TemporaryFile("w+", encoding="utf-8")
+                        self._spill_oldest = item[0]
+                self._spill.write(text)
+                self.spilled += 1
+                self._spill_chunks += 1
+                self._spill_enqueued += item[0]
+            return
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        self._queue.put((time.monotonic(), _CLOSE))
+        self._thread.join()
+
+    def _take_spill(self):
+        """Return the spill file's text and _write's accounting, or None."""
+        with self._spill_lock:
+            if self._spill is None or not self._queue.empty():
+                return None
+            self._spill.seek(0)
+            spilled = (
+                self._spill.read(),
+                self._spill_chunks,
+                self._spill_enqueued,
+                self._spill_oldest,
+            )
+            self._spill.close()
+            self._spill = None
+            self._spill_chunks = 0
+            self._spill_enqueued = 0.0
+            return spilled
+
+    def _deliver_spill(self):
+        spilled = self._take_spill()
+        if spilled is not None:
+            self._write(*spilled)
+
+    def _deliver(self, batch):
+        self._write(
+            "".join(text for _, text in batch),
+            len(batch),
+            sum(enqueued for enqueued, _ in batch),
+            batch[0][0],
+        )
+
+    def _write(self, text, chunks, enqueued_total, oldest):
+        """Write coalesced chunks and charge each its queueing latency."""
+        if self.error is None and text:
+            try:
+                self.sink.write(text)
+            except Exception as e:
+                # A broken sink must not stall the others; record and discard
+                self.error = str(e)
+        done = time.monotonic()
+        self._latency_total += chunks * done - enqueued_total
+        self._latency_max = max(self._latency_max, done - oldest)
+        self.written += chunks
+
+    def _run(self):
+        closing = False
+        while not closing:
+            try:
+                batch = [self._queue.get(timeout=0.1)]
+            except queue.Empty:
+                self._deliver_spill()
+                continue
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1][1] is _CLOSE:
+                closing = True
+                batch.pop()
+            if batch:
+                self._deliver(batch)
+        self._deliver_spill()
+        try:
+            self.sink.close()
+        except Exception as e:
+            self.error = self.error or str(e)
+
+    def metrics(self) -> dict:
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "latency_avg": self._latency_total / self.written if self.written else 0.0,
+            "latency_max": self._latency_max,
+            "error": self.error,
+        }
+
+
+class OutputPipeline:
+    """Fans streamed text out to several sinks without coupling their speed.
+
+    Each sink gets a bounded queue and worker thread. When a queue is full the
+    overflow policy applies: ``block`` waits (backpressure on the producer),
+    ``drop`` discards the chunk, and ``spill`` appends it to a temporary file
+    that is replayed in order once the sink catches up.
+    """
+
+    def __init__(
+        self,
+        sinks: list[Sink],
+        *,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        overflow: str = "block",
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self._workers = [_SinkWorker(sink, queue_size, overflow) for sink in sinks]
+        self._closed = False
+
+    def write(self, text: str):
+        for worker in self._workers:
+            worker.put(text)
+
+    def close(self):
+        """Flush every queue, then close the sinks. Safe to call twice."""
+        if self._closed:
+            return
+        self._closed = True
+        for worker in self._workers:
+            worker.close()
+
+    def metrics(self) -> dict[str, dict]:
+        return {worker.sink.name: worker.metrics() for worker in self._workers}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
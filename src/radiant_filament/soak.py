@@ -0,0 +1,454 @@
+import gc
+import inspect
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from types import SimpleNamespace
+
+try:
+    import resource
+except ImportError:  # Not available on Windows: RSS is not sampled
+    resource = None
+
+from rich.console import Console
+from rich.table import Table
+
+from .agent import DeepResearchAgent
+from .cancellation import CancellationToken, ResearchCancelled
+from .replay import event_from_log
+
+DEFAULT_SESSIONS = 2000
+DEFAULT_SAMPLE_EVERY = 100
+DEFAULT_FAILURE_RATE = 0.3
+FAILURE_MODES = ("drop", "error", "create_error", "cancel", "early_close")
+ENTRY_POINTS = ("research", "research_poll", "stream_research")
+
+# Allowed growth from the first post-warm-up sample to the end of the run
+DEFAULT_LIMITS = {
+    "rss": 32 * 1024 * 1024,
+    "traced": 2 * 1024 * 1024,
+    "fds": 0,
+    "threads": 0,
+    "open_streams": 0,
+    "generators": 0,
+}
+COUNTED = ("fds", "threads", "open_streams", "generators")
+# Generator functions whose frames must not outlive their session
+TRACKED_GENERATORS = frozenset(
+    {
+        "start_research_stream",
+        "_follow_stream",
+        "_iter_stream",
+        "stream_events",
+        "watch_stream",
+        "_run",
+    }
+)
+
+
+class _NullFile(io.TextIOBase):
+    """Discards console output without holding a file descriptor."""
+
+    def write(self, text):
+        return len(text)
+
+    def isatty(self):
+        return False
+
+
+class SyntheticStream:
+    """SDK-like event stream that records whether its consumer closed it."""
+
+    def __init__(self, client, entries, interaction_id, *, drop_after=None):
+        self.client = client
+        self._entries = iter(entries)
+        self.interaction_id = interaction_id
+        self.drop_after = drop_after
+        self.served = 0
+        self.closed = False
+        client.streams_opened += 1
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.closed:
+            raise ConnectionError("stream closed")
+        if self.drop_after is not None and self.served == self.drop_after:
+            raise ConnectionError("synthetic connection reset")
+        entry = next(self._entries)
+        self.served += 1
+        plan = self.client._plans.get(self.interaction_id)
+        if plan is not None and plan.mode == "cancel" and plan.cancel_at == self.served:
+            plan.cancel_token.cancel("soak cancellation")
+        return event_from_log(entry, self.interaction_id)
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.client.streams_closed += 1
+
+
+@dataclass
+class _Plan:
+    mode: str
+    entries: list
+    cancel_token: CancellationToken | None = None
+    drop_after: int | None = None
+    cancel_at: int | None = None
+    poll_errors: int = 0
+
+
+class SyntheticClient:
+    """Stands in for genai.Client with scripted sessions and injected failures.
+
+    Call :meth:`plan` before each session to choose its failure mode. Per
+    interaction state is dropped as soon as the interaction ends, so the client
+    itself does not grow over a soak run. ``open_streams`` counts streams that
+    were handed out and never closed.
+    """
+
+    def __init__(self, *, chunks=8, chunk_size=120):
+        self.interactions = self
+        self.chunks = chunks
+        self.chunk_size = chunk_size
+        self.streams_opened = 0
+        self.streams_closed = 0
+        self._counter = 0
+        self._next = None
+        self._plans: dict[str, _Plan] = {}
+
+    @property
+    def open_streams(self) -> int:
+        return self.streams_opened - self.streams_closed
+
+    def plan(self, mode=None, cancel_token=None, rng=random):
+        """Script the next created interaction ("drop", "error", ... or None)."""
+        entries = [{"type": "interaction.start", "event_id": "0"}]
+        for i in range(self.chunks):
+            entries.append(
+                {
+                    "type": "content.delta",
+                    "event_id": str(len(entries)),
+                    "delta": "thought_summary" if i % 3 == 0 else "text",
+                    "text": f"Line {i} " + "x" * self.chunk_size + "\n",
+                }
+            )
+        if mode == "error":
+            entries.append(
+                {"type": "error", "event_id": str(len(entries)), "error": "synthetic"}
+            )
+        else:
+            entries.append(
+                {
+                    "type": "interaction.complete",
+                    "event_id": str(len(entries)),
+                    "usage": {"total_tokens": 100},
+                }
+            )
+        self._next = _Plan(
+            mode or "ok",
+            entries,
+            cancel_token=cancel_token,
+            drop_after=rng.randint(1, len(entries) - 1) if mode == "drop" else None,
+            cancel_at=rng.randint(1, len(entries) - 1) if mode == "cancel" else None,
+            poll_errors=1 if mode == "drop" else 0,
+        )
+
+    def create(self, stream=False, **kwargs):
+        plan, self._next = self._next or _Plan("ok", []), None
+        if plan.mode == "create_error":
+            raise ConnectionError("synthetic create failure")
+        self._counter += 1
+        interaction_id = f"soak-{self._counter}"
+        self._plans[interaction_id] = plan
+        if not stream:
+            return SimpleNamespace(id=interaction_id, status="in_progress")
+        return SyntheticStream(
+            self, plan.entries, interaction_id, drop_after=plan.drop_after
+        )
+
+    def get(self, id, stream=False, last_event_id=None, **kwargs):
+        plan = self._plans.get(id)
+        if plan is None:
+            raise ConnectionError(f"unknown interaction {id}")
+        if not stream:
+            if plan.mode == "cancel":
+                plan.cancel_token.cancel("soak cancellation")
+                return SimpleNamespace(id=id, status="in_progress")
+            if plan.poll_errors:
+                plan.poll_errors -= 1
+                raise ConnectionError("synthetic poll failure")
+            del self._plans[id]
+            text = "".join(e["text"] for e in plan.entries if e.get("delta") == "text")
+            failed = plan.mode == "error"
+            return SimpleNamespace(
+                id=id,
+                status="failed" if failed else "completed",
+                error="synthetic" if failed else None,
+                outputs=[SimpleNamespace(type="text", text=text)],
+                usage=SimpleNamespace(total_tokens=100),
+            )
+        ids = [entry["event_id"] for entry in plan.entries]
+        start = ids.index(last_event_id) + 1 if last_event_id in ids else 0
+        return SyntheticStream(self, plan.entries[start:], id)
+
+    def cancel(self, id, **kwargs):
+        self._plans.pop(id, None)
+
+    def finish(self):
+        """Forget interactions a session abandoned without completing."""
+        self._plans.clear()
+
+
+@dataclass
+class SoakSample:
+    sessions: int
+    rss: int
+    fds: int
+    threads: int
+    traced: int
+    open_streams: int
+    generators: int
+
+
+def rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc is unavailable).
+
+    Returns -1 where neither is available, and the metric is not checked.
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        if resource is None:
+            return -1
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KiB on Linux and bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def open_fds() -> int:
+    for path in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return -1
+
+
+def live_generators() -> int:
+    return sum(
+        1
+        for obj in gc.get_objects()
+        if inspect.isgenerator(obj) and obj.gi_code.co_name in TRACKED_GENERATORS
+    )
+
+
+def _slope(xs, ys):
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    if not spread:
+        return 0.0
+    return (
+        sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys, strict=True)) / spread
+    )
+
+
+def detect_leaks(samples: list[SoakSample], limits=None) -> list[str]:
+    """Metrics that trend upward beyond their limit, as readable messages.
+
+    Counted resources (descriptors, threads, unclosed streams, generator
+    frames) must return to their first-sample level. RSS and traced memory
+    are fitted with a least-squares line; the growth it predicts over the run
+    must stay within the limit, so one-off allocations and noise don't count.
+    """
+    limits = {**DEFAULT_LIMITS, **(limits or {})}
+    if len(samples) < 2:
+        return []
+    first, last = samples[0], samples[-1]
+    problems = []
+    for metric in COUNTED:
+        growth = getattr(last, metric) - getattr(first, metric)
+        if growth > limits[metric]:
+            problems.append(
+                f"{metric} grew by {growth} "
+                f"({getattr(first, metric)} -> {getattr(last, metric)})"
+            )
+    xs = [s.sessions for s in samples]
+    span = xs[-1] - xs[0]
+    for metric in ("rss", "traced"):
+        if any(getattr(s, metric) < 0 for s in samples):
+            continue  # Not measurable on this platform
+        growth = _slope(xs, [getattr(s, metric) for s in samples]) * span
+        if growth > limits[metric]:
+            problems.append(
+                f"{metric} trends upward: ~{growth / 1024:,.0f} KiB over {span} sessions"
+            )
+    return problems
+
+
+@dataclass
+class SoakReport:
+    sessions: int
+    duration: float
+    outcomes: dict
+    samples: list[SoakSample] = field(default_factory=list)
+    leaks: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.leaks
+
+    def to_dict(self) -> dict:
+        return {
+            "sessions": self.sessions,
+            "duration": self.duration,
+            "outcomes": self.outcomes,
+            "leaks": self.leaks,
+            "samples": [asdict(sample) for sample in self.samples],
+        }
+
+
+class SoakRunner:
+    """Drives many synthetic sessions through one long-lived agent.
+
+    Sessions rotate through ``research()`` (with an output file),
+    ``research_poll()`` and ``stream_research()``; ``failure_rate`` of them get
+    an injected failure: a dropped stream (resumed by reconnecting), an error
+    event, a failed create, a mid-stream cancellation or, for
+    ``stream_research``, a consumer that stops iterating early. After
+    ``warmup`` sessions, RSS, open descriptors, threads, ``tracemalloc``
+    memory, unclosed streams and live stream generators are sampled every
+    ``sample_every`` sessions and checked with :func:`detect_leaks`.
+    """
+
+    def __init__(
+        self,
+        sessions: int = DEFAULT_SESSIONS,
+        *,
+        failure_rate: float = DEFAULT_FAILURE_RATE,
+        sample_every: int = DEFAULT_SAMPLE_EVERY,
+        warmup: int | None = None,
+        idle_timeout: float | None = 30,
+        limits: dict | None = None,
+        seed: int = 0,
+        console: Console | None = None,
+    ):
+        self.sessions = sessions
+        self.failure_rate = failure_rate
+        self.sample_every = sample_every
+        self.warmup = sample_every if warmup is None else warmup
+        self.idle_timeout = idle_timeout
+        self.limits = limits
+        self.rng = random.Random(seed)
+        self.console = console or Console(stderr=True)
+        self.client = SyntheticClient()
+
+    def _sample(self, sessions) -> SoakSample:
+        gc.collect()
+        return SoakSample(
+            sessions=sessions,
+            rss=rss_bytes(),
+            fds=open_fds(),
+            threads=threading.active_count(),
+            traced=tracemalloc.get_traced_memory()[0],
+            open_streams=self.client.open_streams,
+            generators=live_generators(),
+        )
+
+    def _run_session(self, agent, index, output_path) -> str:
+        entry_point = ENTRY_POINTS[index % len(ENTRY_POINTS)]
+        mode = None
+        if self.rng.random() < self.failure_rate:
+            modes = FAILURE_MODES
+            if entry_point != "stream_research":
+                modes = tuple(m for m in modes if m != "early_close")
+            mode = self.rng.choice(modes)
+        token = CancellationToken()
+        self.client.plan(mode, token, self.rng)
+        kwargs = {"agent_config": {"thinking_summaries": "auto"}, "cancel_token": token}
+        try:
+            if entry_point == "research":
+                agent.research(f"soak {index}", output_path=output_path, **kwargs)
+            elif entry_point == "research_poll":
+                agent.research_poll(
+                    f"soak {index}", output_path=output_path, poll_interval=0, **kwargs
+                )
+            else:
+                stream = agent.stream_research(f"soak {index}", **kwargs)
+                for i, _ in enumerate(stream):
+                    if mode == "early_close" and i == 2:
+                        stream.close()
+                        return "closed"
+                return stream.result.status
+        except ResearchCancelled:
+            return "cancelled"
+        except (RuntimeError, ConnectionError):
+            return "failed"
+        finally:
+            self.client.finish()
+        return "completed"
+
+    def run(self) -> SoakReport:
+        started = time.monotonic()
+        agent = DeepResearchAgent(client=self.client, idle_timeout=self.idle_timeout)
+        agent.console = Console(file=_NullFile(), width=100)
+        outcomes = Counter()
+        samples = []
+        workdir = tempfile.mkdtemp(prefix="rf-soak-")
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        try:
+            output_path = os.path.join(workdir, "report.md")
+            for index in range(1, self.sessions + 1):
+                outcomes[self._run_session(agent, index, output_path)] += 1
+                done = index - self.warmup
+                if done >= 0 and done % self.sample_every == 0:
+                    samples.append(self._sample(index))
+                    self.console.print(
+                        f"[dim]{index}/{self.sessions} sessions[/dim]", highlight=False
+                    )
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+            shutil.rmtree(workdir, ignore_errors=True)
+        return SoakReport(
+            sessions=self.sessions,
+            duration=round(time.monotonic() - started, 3),
+            outcomes=dict(outcomes),
+            samples=samples,
+            leaks=detect_leaks(samples, self.limits),
+        )
+
+
+def samples_table(samples: list[SoakSample]) -> Table:
+    table = Table(title="Soak samples")
+    table.add_column("Sessions", justify="right")
+    table.add_column("RSS MiB", justify="right")
+    table.add_column("Traced KiB", justify="right")
+    table.add_column("FDs", justify="right")
+    table.add_column("Threads", justify="right")
+    table.add_column("Open streams", justify="right")
+    table.add_column("Generators", justify="right")
+    for s in samples:
+        table.add_row(
+            str(s.sessions),
+            f"{s.rss / 2**20:.1f}" if s.rss >= 0 else "-",
+            f"{s.traced / 1024:,.0f}",
+            str(s.fds),
+            str(s.threads),
+            str(s.open_streams),
+            str(s.generators),
+        )
+    return table
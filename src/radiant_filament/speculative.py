@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+
+from rich.console import Console
+
+DEFAULT_CACHE_DIR = os.path.expanduser("~/.radiant-filament/followups")
+DEFAULT_FOLLOWUP_MODEL = "gemini-2.5-pro"
+DEFAULT_FOLLOWUPS = ("Summarize in 3 bullets", "List the key risks")
+
+
+def normalize_prompt(prompt) -> str:
+    """Whitespace- and case-insensitive form used for cache lookups."""
+    return " ".join(prompt.split()).casefold()
+
+
+@dataclass
+class CachedFollowUp:
+    interaction_id: str
+    prompt: str
+    model: str | None
+    report: str
+    followup_interaction_id: str | None = None
+    duration: float | None = None
+    created_at: float = field(default_factory=time.time)
+
+
+class FollowUpCache:
+    """Completed follow-up reports keyed by (interaction ID, model, prompt).
+
+    One small JSON file per follow-up, written atomically, so concurrent
+    writers and readers in other processes never see partial entries.
+    """
+
+    def __init__(self, root=DEFAULT_CACHE_DIR):
+        self.root = root
+
+    def _path(self, interaction_id, prompt, model) -> str:
+        key = json.dumps([interaction_id, model, normalize_prompt(prompt)])
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, digest + ".json")
+
+    def get(self, interaction_id, prompt, model=None) -> CachedFollowUp | None:
+        try:
+            with open(self._path(interaction_id, prompt, model), encoding="utf-8") as f:
+                return CachedFollowUp(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def put(self, entry: CachedFollowUp):
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(entry.interaction_id, entry.prompt, entry.model)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(entry), f)
+        os.replace(tmp_path, path)
+
+
+class SpeculativeFollowUps:
+    """Runs a fixed set of follow-up prompts as soon as research completes.
+
+    Pass an instance as ``followups`` to DeepResearchAgent; each completed
+    interaction then starts every prompt not already cached, concurrently, as a
+    ``model`` follow-up. Finished reports land in ``cache``, so asking the same
+    follow-up later (same interaction, model and prompt) is answered locally.
+    Call :meth:`wait` before exiting, or speculative runs are abandoned.
+    ``statuses`` tracks each (interaction ID, prompt); ``errors`` holds the
+    reason a follow-up failed.
+    """
+
+    def __init__(
+        self,
+        prompts=DEFAULT_FOLLOWUPS,
+        *,
+        model=DEFAULT_FOLLOWUP_MODEL,
+        cache: FollowUpCache | None = None,
+        client=None,
+        max_workers=4,
+        rate_limiter=None,
+        console: Console | None = None,
+    ):
+        self.prompts = list(prompts)
+        self.model = model
+        self.cache = cache or FollowUpCache()
+        self.client = client
+        self.rate_limiter = rate_limiter
+        self.console = console or Console(stderr=True)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="followup"
+        )
+        self._futures = []
+        self.statuses: dict[tuple[str, str], str] = {}
+        self.errors: dict[tuple[str, str], str] = {}
+
+    def start(self, interaction_id, agent):
+        """Submit every uncached follow-up for interaction_id (non-blocking).
+
+        Follow-ups run on fresh agents of the same type as ``agent``, sharing
+        its client (unless one was given here), rate limiter, idle timeout and
+        usage ledger.
+        """
+        for prompt in self.prompts:
+            if self.cache.get(interaction_id, prompt, self.model) is not None:
+                self.statuses[interaction_id, prompt] = "cached"
+                continue
+            self.statuses[interaction_id, prompt] = "running"
+            self._futures.append(
+                self._executor.submit(self._run, agent, interaction_id, prompt)
+            )
+
+    def _run(self, parent, interaction_id, prompt):
+        key = (interaction_id, prompt)
+        try:
+            agent = type(parent)(
+                client=self.client or parent.client,
+                idle_timeout=parent.idle_timeout,
+                rate_limiter=self.rate_limiter or parent.rate_limiter,
+                ledger=parent.ledger,
+            )
+            agent.console = self.console
+            result = agent.stream_research(
+                prompt, previous_interaction_id=interaction_id, model=self.model
+            ).result
+            if result.ok:
+                self.cache.put(
+                    CachedFollowUp(
+                        interaction_id,
+                        prompt,
+                        self.model,
+                        result.report,
+                        followup_interaction_id=result.interaction_id,
+                        duration=result.timings.get("duration"),
+                    )
+                )
+        except Exception as e:
+            # Never leave a dead run looking "running" to later lookups
+            self.statuses[key] = "failed"
+            self.errors[key] = str(e) or type(e).__name__
+            raise
+        if result.error:
+            self.errors[key] = result.error
+        self.statuses[key] = result.status
+        return result
+
+    def wait(self, timeout=None) -> dict[tuple[str, str], str]:
+        """Block until submitted follow-ups finish; returns their statuses."""
+        wait(self._futures, timeout=timeout)
+        return dict(self.statuses)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
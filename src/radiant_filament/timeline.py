@@ -0,0 +1,119 @@
+import json
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from .paths import sidecar_path
+
+DEFAULT_TIMELINE_CAPACITY = 256
+
+
+@dataclass(slots=True)
+class ThoughtEntry:
+    offset: float
+    timestamp: float
+    text: str
+
+
+class ThoughtTimeline:
+    """Bounded, timestamped record of thought summaries for one research run.
+
+    Entries are kept in a ring buffer, so very chatty runs only retain the most
+    recent ``capacity`` summaries; ``dropped`` counts the ones evicted.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_TIMELINE_CAPACITY, *, clock=None):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._clock = clock or time.monotonic
+        self._entries = deque(maxlen=capacity)
+        self.dropped = 0
+        self.started_at = self._clock()
+        self.started_wall = time.time()
+        self.finished_at = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def record(self, text: str):
+        if len(self._entries) == self.capacity:
+            self.dropped += 1
+        now = self._clock()
+        self._entries.append(
+            ThoughtEntry(
+                offset=now - self.started_at,
+                timestamp=self.started_wall + (now - self.started_at),
+                text=text,
+            )
+        )
+
+    def finish(self):
+        self.finished_at = self._clock()
+
+    def entries(self) -> list[ThoughtEntry]:
+        return list(self._entries)
+
+    def phases(self) -> list[dict]:
+        """Each retained thought with the time until the next one (or the end).
+
+        The final phase stays open (duration None) until :meth:`finish` is called.
+        """
+        entries = self.entries()
+        end = None if self.finished_at is None else self.finished_at - self.started_at
+        phases = []
+        for entry, following in zip(entries, entries[1:] + [None], strict=True):
+            stop = following.offset if following else end
+            phases.append(
+                {
+                    "offset": round(entry.offset, 3),
+                    "timestamp": entry.timestamp,
+                    "duration": None if stop is None else round(stop - entry.offset, 3),
+                    "thought": entry.text,
+                }
+            )
+        return phases
+
+    def to_dict(self) -> dict:
+        total = None
+        if self.finished_at is not None:
+            total = round(self.finished_at - self.started_at, 3)
+        return {
+            "started_at": self.started_wall,
+            "total_duration": total,
+            "capacity": self.capacity,
+            "dropped": self.dropped,
+            "phases": self.phases(),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_markdown(self) -> str:
+        data = self.to_dict()
+        lines = ["# Research Timeline", ""]
+        if data["total_duration"] is not None:
+            lines.append(f"Total duration: {data['total_duration']:.1f}s")
+        if self.dropped:
+            lines.append(f"Earlier thoughts dropped: {self.dropped}")
+        lines += ["", "| Start (s) | Duration (s) | Thought |", "|---:|---:|---|"]
+        for phase in data["phases"]:
+            duration = "" if phase["duration"] is None else f"{phase['duration']:.1f}"
+            thought = " ".join(phase["thought"].split()).replace("|", "\\|")
+            lines.append(f"| {phase['offset']:.1f} | {duration} | {thought} |")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str, fmt: str = "json"):
+        """Write the timeline as ``json`` or ``markdown`` to path."""
+        if fmt not in ("json", "markdown"):
+            raise ValueError(f"Unknown timeline format: {fmt}")
+        content = self.to_json() if fmt == "json" else self.to_markdown()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+
+def timeline_path(output_path: str, fmt: str) -> str:
+    """Sidecar path for a report's timeline, e.g. report.timeline.json."""
+    return sidecar_path(
+        output_path, "timeline.json" if fmt == "json" else "timeline.md"
+    )
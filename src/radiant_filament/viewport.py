@@ -0,0 +1,54 @@
+from collections import deque
+
+
+class ViewportBuffer:
+    """Keeps only the trailing lines of a growing text stream.
+
+    Text is appended in arbitrary chunks; completed lines go into a bounded
+    deque, so both memory and :meth:`text` cost scale with the viewport height
+    rather than with the length of the report.
+    """
+
+    def __init__(self, max_lines: int):
+        if max_lines < 1:
+            raise ValueError("max_lines must be at least 1")
+        self.max_lines = max_lines
+        self._lines = deque(maxlen=max_lines)
+        self._partial = ""
+
+    def append(self, text: str):
+        if "\n" not in text:
+            self._partial += text
+            return
+        first, *rest = text.split("\n")
+        self._lines.append(self._partial + first)
+        *complete, self._partial = rest
+        self._lines.extend(complete)
+
+    def lines(self) -> list[str]:
+        lines = list(self._lines)
+        if self._partial or not lines:
+            lines.append(self._partial)
+        return lines[-self.max_lines :]
+
+    def text(self, max_rows: int | None = None, width: int | None = None) -> str:
+        """Return the visible tail, optionally fitted to a terminal area.
+
+        Args:
+            max_rows: Terminal rows available; long lines count as several rows
+                when wrapped at ``width``.
+            width: Terminal width used to estimate wrapping.
+        """
+        lines = self.lines()
+        if max_rows is None:
+            return "\n".join(lines)
+
+        visible = []
+        rows = 0
+        for line in reversed(lines):
+            line_rows = max(1, -(-len(line) // width)) if width else 1
+            if visible and rows + line_rows > max_rows:
+                break
+            visible.append(line)
+            rows += line_rows
+        return "\n".join(reversed(visible))
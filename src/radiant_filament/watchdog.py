@@ -0,0 +1,149 @@
+import threading
+import time
+
+
+class StreamStalledError(TimeoutError):
+    """Raised when a stream produces no events within the idle timeout."""
+
+
+class StallWatchdog:
+    """Background timer that fires ``on_stall`` once a wait exceeds idle_timeout.
+
+    The timer only runs while armed, i.e. while the consumer is blocked waiting
+    for the next event, so slow downstream processing never counts as a stall.
+    """
+
+    def __init__(self, idle_timeout: float, on_stall, *, check_interval=None):
+        self.idle_timeout = idle_timeout
+        self.on_stall = on_stall
+        self.check_interval = check_interval or min(1.0, idle_timeout / 4)
+        self.fired = False
+        self._armed_at = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stream-watchdog", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def arm(self):
+        with self._lock:
+            self._armed_at = time.monotonic()
+
+    def disarm(self):
+        with self._lock:
+            self._armed_at = None
+
+    def _run(self):
+        while not self._stopped.wait(self.check_interval):
+            with self._lock:
+                armed_at = self._armed_at
+            if (
+                armed_at is not None
+                and time.monotonic() - armed_at >= self.idle_timeout
+            ):
+                self.fired = True
+                self.on_stall()
+                return
+
+
+def close_quietly(stream):
+    """Close a stream (if closable), ignoring errors from racing readers."""
+    close = getattr(stream, "close", None)
+    if close is None:
+        return
+    try:
+        close()
+    except Exception:
+        # Closing from the watchdog thread races the blocked reader; the
+        # reader surfaces the failure, so errors here carry no extra signal.
+        pass
+
+
+def watch_stream(stream, idle_timeout: float | None):
+    """Yield events from stream, aborting it after idle_timeout seconds of silence.
+
+    Any event (including heartbeats and thought summaries) resets the timer.
+    On a stall the underlying stream is closed so the blocked read returns.
+
+    Raises:
+        StreamStalledError: If no event arrives within idle_timeout seconds.
+    """
+    if not idle_timeout:
+        yield from stream
+        return
+
+    watchdog = StallWatchdog(idle_timeout, lambda: close_quietly(stream))
+    watchdog.start()
+    iterator = iter(stream)
+    try:
+        while True:
+            watchdog.arm()
+            try:
+                event = next(iterator)
+            except StopIteration:
+                break
+            except Exception as e:
+                if watchdog.fired:
+                    raise StreamStalledError(f"no events for {idle_timeout:g}s") from e
+                raise
+            finally:
+                watchdog.disarm()
+            if watchdog.fired:
+                break
+            yield event
+    finally:
+        watchdog.stop()
+
+    if watchdog.fired:
+        raise StreamStalledError(f"no events for {idle_timeout:g}s")
+
+
+def call_with_timeout(method, idle_timeout: float | None, /, **kwargs):
+    """Call method(**kwargs), giving up if it has not returned in idle_timeout.
+
+    Guards the connect and first-byte phase of opening a stream, which
+    :func:`watch_stream` cannot see: a half-open connection can block the
+    call itself. The call runs on a daemon thread; if it is abandoned and
+    later returns a stream, that stream is closed. Only use it for calls that
+    are safe to repeat, such as resuming a stream: the abandoned call may still
+    take effect on the server.
+
+    Raises:
+        StreamStalledError: If the call is still blocked after idle_timeout.
+    """
+    if not idle_timeout:
+        return method(**kwargs)
+
+    lock = threading.Lock()
+    finished = threading.Event()
+    outcome = {}
+
+    def run():
+        try:
+            value, error = method(**kwargs), None
+        except BaseException as e:
+            value, error = None, e
+        with lock:
+            if outcome.get("abandoned"):
+                close_quietly(value)
+                return
+            outcome.update(value=value, error=error)
+            finished.set()
+
+    threading.Thread(target=run, name="api-call", daemon=True).start()
+    if not finished.wait(idle_timeout):
+        with lock:
+            if not finished.is_set():
+                outcome["abandoned"] = True
+                raise StreamStalledError(f"no response for {idle_timeout:g}s")
+    if outcome["error"] is not None:
+        raise outcome["error"]
+    return outcome["value"]
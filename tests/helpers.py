@@ -0,0 +1,50 @@
+from unittest.mock import MagicMock
+
+
+class MockEvent:
+    """An SDK stream event with the attributes the agent reads."""
+
+    def __init__(self, event_type, event_id=None, text=None, interaction_id="int-1"):
+        self.event_type = event_type
+        self.event_id = event_id
+        self.delta = MagicMock()
+        self.delta.type = "text" if text else "other"
+        self.delta.text = text
+        self.interaction = MagicMock()
+        self.interaction.id = interaction_id
+        self.error = None
+
+
+class MockTextOutput:
+    def __init__(self, text):
+        self.type = "text"
+        self.text = text
+
+
+class MockInteraction:
+    def __init__(self, interaction_id, status, outputs=None):
+        self.id = interaction_id
+        self.status = status
+        self.outputs = outputs or []
+
+
+class FakeClock:
+    """A monotonic clock that only moves when told to (or via sleep)."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class QuotaError(Exception):
+    """HTTP 429 from the API, optionally carrying a Retry-After header."""
+
+    def __init__(self, retry_after=None):
+        super().__init__("429 RESOURCE_EXHAUSTED")
+        self.code = 429
+        self.response = MagicMock(headers={"retry-after": retry_after})
@@ -7,23 +7,10 @@ import pytest
 # Ensure src is in path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
 
-from radiant_filament.agent import DeepResearchAgent
-
-
-class MockEvent:
-    def __init__(self, event_type, event_id=None, text=None, restart=False):
-        self.event_type = event_type
-        self.event_id = event_id
-        self.delta = MagicMock()
-        if text:
-            self.delta.type = "text"
-            self.delta.text = text
-        else:
-            self.delta.type = "other"
+from helpers import MockEvent, MockInteraction, MockTextOutput
 
-        self.interaction = MagicMock()
-        if restart:
-            self.interaction.id = "new_interaction_id"
+from radiant_filament.agent import DeepResearchAgent
+from radiant_filament.cancellation import ResearchCancelled
 
 
 def test_agent_initialization():
@@ -69,7 +56,7 @@ def test_robust_stream_recovers_from_error(monkeypatch):
 
     # Stream 1: Yields one event then raises connection error
     def stream_1():
-        yield MockEvent("interaction.start", restart=True)
+        yield MockEvent("interaction.start", interaction_id="new_interaction_id")
         yield MockEvent("content.delta", event_id="1", text="Hello")
         raise ConnectionError("Connection dropped")
 
@@ -161,7 +148,7 @@ def test_stream_with_previous_interaction_id(monkeypatch):
     mock_client = MagicMock()
 
     def stream():
-        yield MockEvent("interaction.start", restart=True)
+        yield MockEvent("interaction.start", interaction_id="new_interaction_id")
         yield MockEvent("interaction.complete")
 
     mock_client.interactions.create.return_value = stream()
@@ -179,7 +166,7 @@ def test_stream_with_model_instead_of_agent(monkeypatch):
     mock_client = MagicMock()
 
     def stream():
-        yield MockEvent("interaction.start", restart=True)
+        yield MockEvent("interaction.start", interaction_id="new_interaction_id")
         yield MockEvent("interaction.complete")
 
     mock_client.interactions.create.return_value = stream()
@@ -203,7 +190,7 @@ def test_stream_with_tools(monkeypatch):
     mock_client = MagicMock()
 
     def stream():
-        yield MockEvent("interaction.start", restart=True)
+        yield MockEvent("interaction.start", interaction_id="new_interaction_id")
         yield MockEvent("interaction.complete")
 
     mock_client.interactions.create.return_value = stream()
@@ -222,19 +209,6 @@ def test_stream_with_tools(monkeypatch):
     assert kwargs["tools"] == tools
 
 
-class MockTextOutput:
-    def __init__(self, text):
-        self.type = "text"
-        self.text = text
-
-
-class MockInteraction:
-    def __init__(self, interaction_id, status, outputs=None):
-        self.id = interaction_id
-        self.status = status
-        self.outputs = outputs or []
-
-
 def test_poll_creates_interaction_without_stream(monkeypatch):
     """Test that research_poll creates interaction with stream=False."""
     mock_client = MagicMock()
@@ -341,7 +315,7 @@ def test_poll_handles_create_exception(monkeypatch):
 
 
 def test_poll_handles_cancelled_status(monkeypatch):
-    """Test that research_poll raises RuntimeError on cancelled status."""
+    """Test that research_poll raises ResearchCancelled on cancelled status."""
     mock_client = MagicMock()
     mock_interaction = MockInteraction("test_123", "cancelled")
     mock_client.interactions.create.return_value = mock_interaction
@@ -351,7 +325,7 @@ def test_poll_handles_cancelled_status(monkeypatch):
     monkeypatch.setattr("time.sleep", MagicMock())
     agent.console = MagicMock()
 
-    with pytest.raises(RuntimeError, match="cancelled"):
+    with pytest.raises(ResearchCancelled, match="cancelled remotely"):
         agent.research_poll("test prompt")
 
     # Should also print cancelled message
@@ -393,7 +367,7 @@ def test_stream_raises_after_max_retries(monkeypatch):
 
     # Stream that establishes interaction_id then fails
     def stream_1():
-        yield MockEvent("interaction.start", restart=True)
+        yield MockEvent("interaction.start", interaction_id="new_interaction_id")
         raise ConnectionError("Connection dropped")
 
     mock_client.interactions.create.return_value = stream_1()
@@ -511,3 +485,46 @@ def test_poll_raises_on_file_write_failure(monkeypatch, tmp_path):
 
     with pytest.raises(RuntimeError, match="Cannot write to"):
         agent.research_poll("test prompt", output_path=bad_path)
+
+
+def test_poll_writes_and_renders_only_new_output(monkeypatch, tmp_path):
+    """Test that each poll's new text is saved and printed once, as it arrives."""
+    from rich.markdown import Markdown
+
+    mock_client = MagicMock()
+    mock_client.interactions.create.return_value = MockInteraction(
+        "test_123", "in_progress", [MockTextOutput("# Title\n\nIntro")]
+    )
+    mock_client.interactions.get.side_effect = [
+        MockInteraction(
+            "test_123", "in_progress", [MockTextOutput("# Title\n\nIntro done.\n\n")]
+        ),
+        MockInteraction(
+            "test_123",
+            "completed",
+            [
+                MockTextOutput("# Title\n\nIntro done.\n\n"),
+                MockTextOutput("## Findings\n"),
+            ],
+        ),
+    ]
+    output_file = tmp_path / "output.md"
+    saved = []
+    monkeypatch.setattr("time.sleep", lambda _: saved.append(output_file.read_text()))
+
+    agent = DeepResearchAgent(client=mock_client)
+    agent.console = MagicMock()
+    result = agent.research_poll("test prompt", output_path=str(output_file))
+
+    # The file grows before completion instead of being written at the end
+    assert saved == ["# Title\n\nIntro", "# Title\n\nIntro done.\n\n"]
+    assert output_file.read_text() == result.report
+    assert result.report == "# Title\n\nIntro done.\n\n## Findings\n"
+    assert result.chunks == ["# Title\n\nIntro", " done.\n\n", "## Findings\n"]
+
+    rendered = [
+        c[0][0].markup
+        for c in agent.console.print.call_args_list
+        if isinstance(c[0][0], Markdown)
+    ]
+    assert rendered == ["# Title\n\nIntro done.\n\n", "## Findings\n"]
@@ -0,0 +1,125 @@
+import io
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import MockEvent, MockInteraction, MockTextOutput
+
+from radiant_filament.agent import DeepResearchAgent
+from radiant_filament.archive import ReportArchive, request_hash
+
+
+def test_add_and_lookup_by_interaction_id_and_hash(tmp_path):
+    archive = ReportArchive(str(tmp_path))
+    entry = archive.add("# Report\n\nBody", prompt="topic", interaction_id="int-1")
+
+    assert archive.get("int-1") is entry
+    assert archive.get(request_hash("topic")) is entry
+    assert archive.read_report("int-1") == "# Report\n\nBody"
+
+
+def test_index_is_reloaded_on_open(tmp_path):
+    ReportArchive(str(tmp_path)).add("text", prompt="p", interaction_id="int-1")
+
+    reopened = ReportArchive(str(tmp_path))
+    assert len(reopened) == 1
+    assert reopened.read_report("int-1") == "text"
+
+
+def test_segments_roll_over_when_full(tmp_path):
+    archive = ReportArchive(str(tmp_path), segment_size=64, compresslevel=0)
+    for i in range(3):
+        archive.add(f"report {i} " * 10, prompt=str(i), interaction_id=f"int-{i}")
+
+    segments = {entry.segment for entry in archive.entries()}
+    assert len(segments) == 3
+    assert archive.read_report("int-2") == "report 2 " * 10
+
+
+def test_iter_report_streams_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr("radiant_filament.archive.READ_CHUNK_SIZE", 16)
+    archive = ReportArchive(str(tmp_path))
+    text = "".join(f"line {i} ünïcode\n" for i in range(500))
+    archive.add(text, prompt="p", interaction_id="int-1")
+
+    chunks = list(archive.iter_report("int-1"))
+    assert len(chunks) > 1
+    assert "".join(chunks) == text
+
+
+def test_events_only_stored_when_enabled(tmp_path):
+    events = [{"type": "interaction.start"}, {"type": "content.delta", "text": "x"}]
+
+    plain = ReportArchive(str(tmp_path / "plain"))
+    plain.add("r", prompt="p", interaction_id="a", events=events)
+    assert list(plain.iter_events("a")) == []
+
+    full = ReportArchive(str(tmp_path / "full"), store_events=True)
+    full.add("r", prompt="p", interaction_id="a", events=events)
+    assert list(full.iter_events("a")) == events
+    assert full.read_report("a") == "r"
+
+
+def test_unknown_key_raises(tmp_path):
+    archive = ReportArchive(str(tmp_path))
+    with pytest.raises(KeyError):
+        archive.read_report("missing")
+
+
+def test_import_file(tmp_path):
+    report = tmp_path / "report.md"
+    report.write_text("# Imported")
+    archive = ReportArchive(str(tmp_path / "archive"))
+
+    entry = archive.import_file(str(report))
+    assert entry.source == str(report)
+    assert archive.read_report(entry.request_hash) == "# Imported"
+
+
+def test_research_poll_writes_into_archive(tmp_path, monkeypatch):
+    mock_client = MagicMock()
+    mock_client.interactions.create.return_value = MockInteraction(
+        "int-1", "completed", [MockTextOutput("Report")]
+    )
+    archive = ReportArchive(str(tmp_path))
+    agent = DeepResearchAgent(client=mock_client, archive=archive)
+    agent.console = MagicMock()
+    monkeypatch.setattr("time.sleep", MagicMock())
+
+    agent.research_poll("topic")
+
+    entry = archive.get("int-1")
+    assert entry.agent_name == agent.agent_name
+    assert "duration" in entry.timings
+    assert archive.read_report("int-1") == "Report"
+
+
+def test_research_writes_report_and_events_into_archive(tmp_path):
+    from rich.console import Console
+
+    def stream():
+        yield MockEvent("interaction.start")
+        yield MockEvent("content.delta", event_id="1", text="Hello")
+        yield MockEvent("content.delta", event_id="2", text=" World")
+        yield MockEvent("interaction.complete", event_id="3")
+
+    mock_client = MagicMock()
+    mock_client.interactions.create.return_value = stream()
+    archive = ReportArchive(str(tmp_path), store_events=True)
+    agent = DeepResearchAgent(client=mock_client, archive=archive)
+    agent.console = Console(file=io.StringIO())
+
+    agent.research("topic")
+
+    assert archive.read_report("int-1") == "Hello World"
+    assert [e["type"] for e in archive.iter_events("int-1")] == [
+        "interaction.start",
+        "content.delta",
+        "content.delta",
+        "interaction.complete",
+    ]
@@ -0,0 +1,226 @@
+import io
+import os
+import socket
+import sys
+import threading
+
+import pytest
+from rich.console import Console
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from radiant_filament import broker as broker_module
+from radiant_filament.broker import (
+    EventBroker,
+    _Channel,
+    attach,
+    ensure_broker,
+)
+from radiant_filament.main import main
+from radiant_filament.replay import ReplayClient
+
+EVENTS = [
+    {"type": "interaction.start", "event_id": "0"},
+    {
+        "type": "content.delta",
+        "event_id": "1",
+        "delta": "thought_summary",
+        "text": "Hmm",
+    },
+    {"type": "content.delta", "event_id": "2", "delta": "text", "text": "# Report\n"},
+    {"type": "content.delta", "event_id": "3", "delta": "text", "text": "Body."},
+    {"type": "interaction.complete", "event_id": "4"},
+]
+
+
+class GatedClient(ReplayClient):
+    """Replays EVENTS, pausing after the first `split` events until released."""
+
+    def __init__(self, split=3):
+        super().__init__(EVENTS, interaction_id="int-1")
+        self.split = split
+        self.release = threading.Event()
+        self.get_calls = 0
+
+    def get(self, id, stream=False, last_event_id=None, **kwargs):
+        self.get_calls += 1
+        return self._gated(self._stream(last_event_id))
+
+    def _gated(self, events):
+        for i, event in enumerate(events):
+            if i == self.split:
+                assert self.release.wait(5)
+            yield event
+
+
+def quiet_broker(client, **kwargs):
+    return EventBroker(client, console=Console(file=io.StringIO()), **kwargs)
+
+
+def test_subscribers_share_one_upstream_and_late_joiners_replay():
+    client = GatedClient()
+    broker = quiet_broker(client)
+
+    early = broker.subscribe("int-1")
+    seen_early = [next(early)["event_id"] for _ in range(3)]
+    late = broker.subscribe("int-1")
+    seen_late = [next(late)["event_id"] for _ in range(3)]
+    client.release.set()
+    seen_early += [entry["event_id"] for entry in early]
+    seen_late += [entry["event_id"] for entry in late]
+
+    assert seen_early == seen_late == ["0", "1", "2", "3", "4", None]
+    assert client.get_calls == 1
+    assert broker.upstreams_opened == 1
+
+
+def test_last_subscriber_leaving_stops_the_upstream():
+    client = GatedClient()
+    broker = quiet_broker(client)
+    reader = broker.subscribe("int-1")
+    next(reader)
+    reader.close()
+
+    assert broker._channels == {}
+    client.release.set()
+    for thread in threading.enumerate():
+        if thread.name == "broker-int-1":
+            thread.join(5)
+    # A new subscriber gets a fresh upstream rather than the abandoned one
+    entries = list(broker.subscribe("int-1"))
+    assert [entry["event_id"] for entry in entries] == ["0", "1", "2", "3", "4", None]
+    assert broker.upstreams_opened == 2
+    assert broker._channels == {}
+
+
+def test_late_joiner_is_told_about_evicted_events():
+    client = GatedClient()
+    broker = quiet_broker(client, buffer_size=2)
+    early = broker.subscribe("int-1")
+    [next(early) for _ in range(3)]
+
+    late = broker.subscribe("int-1")
+    first = next(late)
+    client.release.set()
+    list(early)
+
+    assert first == {"type": "replay.truncated", "event_id": None, "dropped": 1}
+    assert [entry["event_id"] for entry in late] == ["1", "2", "3", "4", None]
+
+
+def test_slow_subscriber_is_disconnected(monkeypatch):
+    monkeypatch.setattr(broker_module, "SUBSCRIBER_QUEUE_SIZE", 2)
+    channel = _Channel("int-1", buffer_size=10)
+    _, _, slow = channel.subscribe()
+    _, _, fast = channel.subscribe()
+    for i in range(3):
+        channel.publish({"type": "content.delta", "event_id": str(i)})
+        if fast.queue.full():
+            fast.queue.get_nowait()
+
+    assert slow.lagged
+    assert channel.subscribers == {fast}
+    assert len(channel.buffer) == 3
+
+
+def test_upstream_failure_is_forwarded_as_error():
+    client = GatedClient()
+    client.get = lambda **kwargs: (_ for _ in ()).throw(ValueError("bad id"))
+    broker = quiet_broker(client)
+
+    entries = list(broker.subscribe("int-1"))
+
+    assert entries == [
+        {"type": "error", "event_id": None, "error": "bad id"},
+        {"type": "stream.end", "event_id": None},
+    ]
+
+
+def test_attach_over_socket_and_cli(tmp_path, capsys):
+    socket_path = str(tmp_path / "b.sock")
+    server = ensure_broker(
+        socket_path,
+        client=ReplayClient(EVENTS, interaction_id="int-1"),
+        console=Console(file=io.StringIO()),
+    )
+    try:
+        assert ensure_broker(socket_path) is None
+
+        events = list(attach("int-1", socket_path))
+        assert [e.text for e in events if e.kind == "text"] == ["# Report\n", "Body."]
+        assert events[1].thought == "Hmm"
+        assert events[-1].is_terminal
+
+        output = tmp_path / "report.md"
+        main(["attach", "int-1", "--socket", socket_path, "--output", str(output)])
+        assert output.read_text() == "# Report\nBody."
+        assert "# Report\nBody." in capsys.readouterr().out
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert not os.path.exists(socket_path)
+
+
+def test_serve_keeps_a_live_socket_and_replaces_a_stale_one(tmp_path):
+    socket_path = str(tmp_path / "b.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()  # Leaves the socket file behind with nobody listening
+
+    server = quiet_broker(None).serve(socket_path)
+    try:
+        with pytest.raises(OSError, match="already listening"):
+            quiet_broker(None).serve(socket_path)
+        assert os.path.exists(socket_path)
+    finally:
+        server.server_close()
+
+
+def test_attach_without_end_record_fails(tmp_path, capsys):
+    """A broker that goes away mid-stream must not look like a finished run."""
+    socket_path = str(tmp_path / "b.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(socket_path)
+    listener.listen()
+
+    def dying_broker():
+        while True:
+            conn, _ = listener.accept()
+            with conn:
+                if not conn.recv(1024):
+                    continue  # ensure_broker's liveness probe
+                conn.sendall(
+                    b'{"type": "content.delta", "event_id": "1", '
+                    b'"delta": "text", "text": "Partial"}\n'
+                )
+                return
+
+    threading.Thread(target=dying_broker, daemon=True).start()
+    try:
+        with pytest.raises(SystemExit) as exc_info:
+            main(["attach", "int-1", "--socket", socket_path])
+    finally:
+        listener.close()
+
+    assert exc_info.value.code == 1
+    captured = capsys.readouterr()
+    assert "Partial" in captured.out
+    assert "report is incomplete" in captured.err
+
+
+def test_attach_reports_unwritable_output(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        main(
+            [
+                "attach",
+                "int-1",
+                "--socket",
+                str(tmp_path / "b.sock"),
+                "--output",
+                str(tmp_path / "missing" / "report.md"),
+            ]
+        )
+    assert exc_info.value.code == 1
+    assert "Cannot write to" in capsys.readouterr().err
+    assert not os.path.exists(tmp_path / "b.sock")
@@ -0,0 +1,152 @@
+import io
+import os
+import sys
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from rich.console import Console
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import MockEvent
+
+from radiant_filament.agent import DeepResearchAgent
+from radiant_filament.cancellation import CancellationToken, ResearchCancelled
+
+
+def test_cancel_runs_callbacks_once_with_reason():
+    token = CancellationToken()
+    callback = MagicMock()
+    token.add_callback(callback)
+
+    token.cancel("stopped")
+    token.cancel("again")
+
+    callback.assert_called_once()
+    assert token.cancelled
+    assert token.reason == "stopped"
+    with pytest.raises(ResearchCancelled, match="stopped"):
+        token.raise_if_cancelled()
+
+
+def test_callback_added_after_cancel_runs_immediately():
+    token = CancellationToken()
+    token.cancel()
+    callback = MagicMock()
+    token.add_callback(callback)
+    callback.assert_called_once()
+
+
+def test_unregistered_callback_is_not_run():
+    token = CancellationToken()
+    callback = MagicMock()
+    unregister = token.add_callback(callback)
+    unregister()
+    token.cancel()
+    callback.assert_not_called()
+
+
+def test_deadline_cancels_token():
+    token = CancellationToken(deadline=0.01)
+    assert token.wait(2)
+    assert "deadline" in token.reason
+    assert token.remaining() == 0.0
+
+
+class BlockingStream:
+    """Yields events, then blocks until closed (like an idle connection)."""
+
+    def __init__(self, events):
+        self._events = list(events)
+        self._closed = threading.Event()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._events:
+            return self._events.pop(0)
+        self._closed.wait(timeout=5)
+        raise ConnectionError("closed")
+
+    def close(self):
+        self._closed.set()
+
+
+def test_stream_deadline_cancels_remote_and_keeps_partial_output(tmp_path):
+    mock_client = MagicMock()
+    mock_client.interactions.create.return_value = BlockingStream(
+        [MockEvent("interaction.start"), MockEvent("content.delta", "1", "Partial")]
+    )
+    agent = DeepResearchAgent(client=mock_client, idle_timeout=None)
+    agent.console = Console(file=io.StringIO())
+    output = tmp_path / "report.md"
+
+    with pytest.raises(ResearchCancelled, match="deadline"):
+        agent.research(
+            "topic",
+            output_path=str(output),
+            cancel_token=CancellationToken(deadline=0.05),
+        )
+
+    mock_client.interactions.cancel.assert_called_once_with(id="int-1")
+    mock_client.interactions.get.assert_not_called()
+    assert output.read_text() == "Partial"
+
+
+def test_already_cancelled_token_never_creates_interaction():
+    mock_client = MagicMock()
+    agent = DeepResearchAgent(client=mock_client)
+    token = CancellationToken()
+    token.cancel()
+
+    with pytest.raises(ResearchCancelled):
+        list(agent.start_research_stream("topic", cancel_token=token))
+    mock_client.interactions.create.assert_not_called()
+
+
+def test_poll_cancellation_cancels_remote_interaction():
+    mock_client = MagicMock()
+    token = CancellationToken()
+
+    def create(**kwargs):
+        token.cancel("cancelled by test")
+        return MagicMock(id="int-1", status="in_progress")
+
+    mock_client.interactions.create.side_effect = create
+    agent = DeepResearchAgent(client=mock_client)
+    agent.console = MagicMock()
+
+    with pytest.raises(ResearchCancelled, match="cancelled by test"):
+        agent.research_poll("topic", cancel_token=token)
+
+    mock_client.interactions.cancel.assert_called_once_with(id="int-1")
+    mock_client.interactions.get.assert_not_called()
+
+
+def test_cancel_failure_is_reported_not_raised():
+    mock_client = MagicMock()
+    mock_client.interactions.cancel.side_effect = Exception("already finished")
+    agent = DeepResearchAgent(client=mock_client)
+    agent.console = MagicMock()
+    agent.interaction_id = "int-1"
+
+    assert agent.cancel() is False
+    agent.console.print.assert_called()
+
+
+def test_chain_cancellation_marks_steps_cancelled():
+    from radiant_filament.chain import ChainRunner, parse_chain_spec
+
+    token = CancellationToken()
+    token.cancel("cancelled by user")
+    spec = parse_chain_spec({"prompt": "base", "steps": [{"prompt": "A"}]})
+    runner = ChainRunner(
+        spec, client=MagicMock(), console=MagicMock(), cancel_token=token
+    )
+
+    results = runner.run()
+    assert results["base"].status == "cancelled"
+    assert results["step-1"].status == "skipped"
@@ -0,0 +1,167 @@
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import MockEvent
+
+from radiant_filament.chain import (
+    ChainRunner,
+    ChainSpecError,
+    load_chain_spec,
+    parse_chain_spec,
+)
+
+
+def make_client(fail_prompts=()):
+    """Client whose streams answer each prompt with 'report:<prompt>'."""
+    client = MagicMock()
+    counter = iter(range(1000))
+
+    def create(**kwargs):
+        interaction_id = f"int-{next(counter)}"
+        prompt = kwargs["input"]
+
+        def stream():
+            yield MockEvent("interaction.start", interaction_id=interaction_id)
+            if prompt in fail_prompts:
+                event = MockEvent("error", event_id="e")
+                event.error = "boom"
+                yield event
+                return
+            yield MockEvent("content.delta", event_id="1", text=f"report:{prompt}")
+            yield MockEvent("interaction.complete", event_id="2")
+
+        return stream()
+
+    client.interactions.create.side_effect = create
+    return client
+
+
+def test_steps_default_to_following_previous_step():
+    spec = parse_chain_spec(
+        {"prompt": "base", "steps": [{"id": "a", "prompt": "A"}, {"prompt": "B"}]}
+    )
+    assert [s.id for s in spec.steps] == ["base", "a", "step-2"]
+    assert spec.steps[1].after == "base"
+    assert spec.steps[2].after == "a"
+
+
+def test_explicit_after_forms_parallel_branches():
+    spec = parse_chain_spec(
+        {
+            "prompt": "base",
+            "steps": [
+                {"id": "a", "prompt": "A"},
+                {"id": "b", "prompt": "B", "after": "base"},
+            ],
+        }
+    )
+    assert spec.children["base"] == ["a", "b"]
+
+
+def test_unknown_parent_raises():
+    with pytest.raises(ChainSpecError, match="unknown or later step"):
+        parse_chain_spec(
+            {"prompt": "base", "steps": [{"id": "a", "prompt": "A", "after": "zzz"}]}
+        )
+
+
+def test_base_step_rejects_model():
+    with pytest.raises(ChainSpecError, match="base step cannot use 'model'"):
+        parse_chain_spec({"prompt": "base", "model": "gemini-2.5-pro"})
+
+
+def test_load_chain_spec_from_json_file(tmp_path):
+    path = tmp_path / "chain.json"
+    path.write_text(json.dumps({"prompt": "base", "steps": [{"prompt": "A"}]}))
+    spec = load_chain_spec(str(path))
+    assert len(spec.steps) == 2
+
+
+def test_runner_threads_interaction_ids():
+    client = make_client()
+    spec = parse_chain_spec(
+        {
+            "prompt": "base",
+            "steps": [
+                {"id": "a", "prompt": "A", "model": "gemini-2.5-pro"},
+                {"id": "b", "prompt": "B", "after": "base"},
+            ],
+        }
+    )
+    runner = ChainRunner(spec, client=client, console=MagicMock())
+    results = runner.run()
+
+    assert all(r.status == "completed" for r in results.values())
+    calls = {
+        c.kwargs["input"]: c.kwargs for c in client.interactions.create.call_args_list
+    }
+    base_id = results["base"].interaction_id
+    assert "previous_interaction_id" not in calls["base"]
+    assert calls["A"]["previous_interaction_id"] == base_id
+    assert calls["A"]["model"] == "gemini-2.5-pro"
+    assert calls["B"]["previous_interaction_id"] == base_id
+    assert results["a"].text == "report:A"
+
+
+def test_failed_step_skips_descendants():
+    client = make_client(fail_prompts={"A"})
+    spec = parse_chain_spec(
+        {"prompt": "base", "steps": [{"id": "a", "prompt": "A"}, {"prompt": "B"}]}
+    )
+    results = ChainRunner(spec, client=client, console=MagicMock()).run()
+
+    assert results["a"].status == "failed"
+    assert results["step-2"].status == "skipped"
+
+
+def test_write_bundle(tmp_path):
+    spec = parse_chain_spec({"prompt": "base", "steps": [{"id": "a", "prompt": "A"}]})
+    runner = ChainRunner(spec, client=make_client(), console=MagicMock())
+    runner.run()
+    manifest_path = runner.write_bundle(str(tmp_path / "bundle"))
+
+    manifest = json.loads(open(manifest_path).read())
+    assert [s["id"] for s in manifest["steps"]] == ["base", "a"]
+    assert (tmp_path / "bundle" / "a.md").read_text() == "report:A"
+    assert "report:base" in (tmp_path / "bundle" / "bundle.md").read_text()
+
+
+def test_step_that_raises_fails_without_hanging(monkeypatch):
+    spec = parse_chain_spec(
+        {
+            "prompt": "base",
+            "steps": [
+                {"id": "a", "prompt": "A"},
+                {"id": "a2", "prompt": "A2"},
+                {"id": "b", "prompt": "B", "after": "base"},
+            ],
+        }
+    )
+    runner = ChainRunner(spec, client=make_client(), console=MagicMock())
+    make_agent = runner._make_agent
+
+    def broken_make_agent(step):
+        if step.id == "a":
+            raise ValueError("agent construction failed")
+        return make_agent(step)
+
+    monkeypatch.setattr(runner, "_make_agent", broken_make_agent)
+    results = runner.run()
+
+    assert results["a"].status == "failed"
+    assert results["a"].error == "agent construction failed"
+    assert results["a2"].status == "skipped"
+    assert results["b"].status == "completed"
+
+
+def test_step_ids_must_be_safe_filenames():
+    for bad in ["a/b", "../x", ".hidden", "a b"]:
+        with pytest.raises(ChainSpecError, match="must be letters"):
+            parse_chain_spec({"prompt": "base", "steps": [{"id": bad, "prompt": "A"}]})
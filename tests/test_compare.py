@@ -0,0 +1,112 @@
+import io
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+from rich.console import Console
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import MockEvent
+
+from radiant_filament.compare import (
+    ComparisonRunner,
+    RunResult,
+    build_matrix,
+    summarize,
+)
+from radiant_filament.main import main
+
+
+def fake_stream(**kwargs):
+    thinking = kwargs["agent_config"].get("thinking_summaries")
+    text = (
+        "Short."
+        if thinking == "none"
+        else "See https://a.example and https://b.example"
+    )
+    return iter(
+        [
+            MockEvent("interaction.start", "0", interaction_id="int-0"),
+            MockEvent("content.delta", "1", text),
+            MockEvent("interaction.complete", "2"),
+        ]
+    )
+
+
+def test_build_matrix_crosses_agents_and_configs():
+    variants = build_matrix(["a1", "a2"], [{"x": 1}, None])
+    assert [v.name for v in variants] == ['a1 {"x":1}', "a1", 'a2 {"x":1}', "a2"]
+    assert [v.name for v in build_matrix(["a1"], [])] == ["a1"]
+
+
+def test_runner_collects_metrics_per_variant():
+    client = MagicMock()
+    client.interactions.create.side_effect = fake_stream
+    variants = build_matrix(
+        ["agent"], [{"thinking_summaries": "none"}, {"thinking_summaries": "auto"}]
+    )
+    runner = ComparisonRunner(
+        ["p1", "p2"], variants, client=client, console=Console(file=io.StringIO())
+    )
+
+    results = runner.run()
+
+    assert len(results) == 4
+    assert all(r.status == "completed" for r in results)
+    assert all(r.time_to_first_text is not None for r in results)
+    by_variant = {row["variant"]: row for row in runner.summary()}
+    assert by_variant['agent {"thinking_summaries":"auto"}']["mean_citations"] == 2
+    assert by_variant['agent {"thinking_summaries":"none"}']["mean_report_chars"] == 6
+    assert by_variant['agent {"thinking_summaries":"none"}']["completed"] == 2
+
+
+def test_summary_sorts_by_duration_and_skips_failures():
+    results = [
+        RunResult("slow", "p", status="completed", duration=9.0),
+        RunResult("fast", "p", status="completed", duration=1.0),
+        RunResult("broken", "p", status="failed", duration=0.1),
+    ]
+    rows = summarize(results)
+    assert [row["variant"] for row in rows] == ["fast", "slow", "broken"]
+    assert rows[2]["median_duration"] is None
+
+
+def test_failed_variant_is_reported_not_raised():
+    client = MagicMock()
+    client.interactions.create.side_effect = RuntimeError("bad agent")
+    runner = ComparisonRunner(
+        ["p"],
+        build_matrix(["agent"], []),
+        client=client,
+        console=Console(file=io.StringIO()),
+    )
+    [result] = runner.run()
+    assert result.status == "failed"
+    assert "bad agent" in result.error
+
+
+def test_compare_cli_writes_json(monkeypatch, tmp_path):
+    client = MagicMock()
+    client.interactions.create.side_effect = fake_stream
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    monkeypatch.setattr("radiant_filament.agent.genai.Client", lambda **_: client)
+    output = tmp_path / "compare.json"
+
+    main(
+        [
+            "compare",
+            "topic",
+            "--agent-config",
+            '{"thinking_summaries": "none"}',
+            "--output",
+            str(output),
+        ]
+    )
+
+    data = json.loads(output.read_text())
+    assert data["prompts"] == ["topic"]
+    assert data["runs"][0]["status"] == "completed"
+    assert data["summary"][0]["runs"] == 1
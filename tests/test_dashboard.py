@@ -0,0 +1,123 @@
+import io
+import os
+import sys
+
+from rich.console import Console
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from radiant_filament.dashboard import ResearchDashboard
+from radiant_filament.main import main
+from radiant_filament.replay import ReplayClient
+
+
+def make_events(lines):
+    events = [
+        {"type": "interaction.start", "event_id": "0"},
+        {
+            "type": "content.delta",
+            "event_id": "1",
+            "delta": "thought_summary",
+            "text": "Planning",
+        },
+    ]
+    for i, line in enumerate(lines, 2):
+        events.append(
+            {
+                "type": "content.delta",
+                "event_id": str(i),
+                "delta": "text",
+                "text": line + "\n",
+            }
+        )
+    events.append({"type": "interaction.complete", "event_id": str(len(events))})
+    return events
+
+
+def make_dashboard(client, **kwargs):
+    console = Console(file=io.StringIO(), width=100, height=40)
+    return ResearchDashboard(
+        client, console=console, interactive=False, refresh_per_second=100, **kwargs
+    )
+
+
+def test_runs_sessions_and_tracks_rows():
+    client = ReplayClient(make_events(["Alpha", "Beta"]), interaction_id="int-1")
+    dashboard = make_dashboard(client)
+    for prompt in ["first", "second", "third"]:
+        dashboard.add(prompt)
+
+    results = dashboard.run()
+
+    assert [r.status for r in results] == ["completed"] * 3
+    assert all(r.report == "Alpha\nBeta\n" for r in results)
+    for session in dashboard.sessions:
+        assert session.status == "completed"
+        assert session.bytes_received == len("Alpha\nBeta\n")
+        assert session.interaction_id == "int-1"
+        assert session.elapsed is not None
+    frame = dashboard.console.file.getvalue()
+    assert "first" in frame and "third" in frame and "completed" in frame
+
+
+def test_drill_down_renders_only_the_report_tail():
+    lines = [f"line {i}" for i in range(5000)]
+    dashboard = make_dashboard(ReplayClient(make_events(lines)), tail_lines=5)
+    session = dashboard.add("big")
+    dashboard.run()
+    assert session.result.report.count("\n") == 5000
+
+    dashboard.focus = 0
+    console = Console(file=io.StringIO(), width=100, height=40)
+    console.print(dashboard.render())
+    frame = console.file.getvalue()
+
+    assert "line 4999" in frame
+    assert "line 4990" not in frame
+    assert len(session.tail.lines()) <= 5
+
+
+def test_rows_are_capped_to_the_terminal_height():
+    dashboard = make_dashboard(ReplayClient(make_events([])))
+    dashboard.console = Console(file=io.StringIO(), width=100, height=12)
+    for i in range(30):
+        dashboard.add(f"prompt {i}")
+
+    dashboard.console.print(dashboard.render())
+    frame = dashboard.console.file.getvalue()
+
+    assert "prompt 0" in frame
+    assert "prompt 29" not in frame
+    assert "more session(s)" in frame
+
+
+def test_keys_switch_focus():
+    dashboard = make_dashboard(ReplayClient(make_events([])))
+    for prompt in ["a", "b", "c"]:
+        dashboard.add(prompt)
+
+    dashboard.handle_key("2")
+    assert dashboard.focus == 1
+    dashboard.handle_key("n")
+    dashboard.handle_key("n")
+    assert dashboard.focus == 0
+    dashboard.handle_key("p")
+    assert dashboard.focus == 2
+    dashboard.handle_key("\x1b")
+    assert dashboard.focus is None
+    dashboard.handle_key("p")
+    assert dashboard.focus == 2
+    dashboard.handle_key("9")
+    assert dashboard.focus is None
+
+
+def test_cli_writes_completed_reports(tmp_path, monkeypatch):
+    client = ReplayClient(make_events(["Report"]), interaction_id="int-1")
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr("radiant_filament.agent.genai.Client", lambda **_: client)
+
+    main(["dashboard", "a", "b", "--output-dir", str(tmp_path), "--focus", "2"])
+
+    assert (tmp_path / "1.md").read_text() == "Report\n"
+    assert (tmp_path / "2.md").read_text() == "Report\n"
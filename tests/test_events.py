@@ -0,0 +1,106 @@
+import os
+import sys
+import tracemalloc
+from unittest.mock import MagicMock
+
+from google.genai._interactions.types.content_delta import ContentDelta
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from radiant_filament.agent import DeepResearchAgent
+from radiant_filament.events import StreamEvent
+from radiant_filament.replay import event_from_log
+
+
+def sdk_delta(event_id, text):
+    return ContentDelta.model_validate(
+        {
+            "event_type": "content.delta",
+            "event_id": event_id,
+            "index": 0,
+            "delta": {"type": "text", "text": text},
+        }
+    )
+
+
+def test_normalizes_each_event_type():
+    start = StreamEvent.from_sdk(
+        MagicMock(
+            event_type="interaction.start", event_id="0", **{"interaction.id": "i"}
+        )
+    )
+    assert start.interaction_id == "i"
+    assert not start.is_terminal
+
+    text = StreamEvent.from_sdk(sdk_delta("1", "Hello"))
+    assert (text.kind, text.text, text.thought) == ("text", "Hello", None)
+
+    error = StreamEvent.from_sdk(
+        MagicMock(event_type="error", event_id="2", error="quota")
+    )
+    assert error.error == "quota"
+    assert error.is_terminal
+
+
+def test_records_have_no_instance_dict():
+    record = StreamEvent.from_sdk(sdk_delta("1", "Hello"))
+    assert not hasattr(record, "__dict__")
+
+
+def test_log_entries_round_trip_through_replay():
+    entries = [
+        {"type": "interaction.start", "event_id": "0", "interaction_id": "int-1"},
+        {"type": "content.delta", "event_id": "1", "delta": "text", "text": "a"},
+        {
+            "type": "content.delta",
+            "event_id": "2",
+            "delta": "thought_summary",
+            "text": "thinking",
+        },
+        {"type": "error", "event_id": "3", "error": "boom"},
+    ]
+    for entry in entries:
+        logged = StreamEvent.from_sdk(event_from_log(entry, "int-1")).to_log_entry()
+        logged.pop("ts")
+        assert logged == entry
+        assert StreamEvent.from_log_entry(logged).to_log_entry().items() >= (
+            entry.items()
+        )
+    assert StreamEvent.from_log_entry(entries[0]).interaction_id == "int-1"
+
+
+def test_buffered_records_use_less_memory_than_sdk_events():
+    sdk_events = [sdk_delta(str(i), f"chunk {i} " * 8) for i in range(500)]
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        copies = [sdk_delta(e.event_id, e.delta.text) for e in sdk_events]
+        sdk_cost = tracemalloc.get_traced_memory()[0] - before
+        before = tracemalloc.get_traced_memory()[0]
+        records = [StreamEvent.from_sdk(e) for e in sdk_events]
+        record_cost = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    assert len(copies) == len(records)
+    assert record_cost * 4 < sdk_cost
+
+
+def test_stream_events_yields_records():
+    mock_client = MagicMock()
+    mock_client.interactions.create.return_value = iter(
+        [
+            MagicMock(event_type="interaction.start", event_id="0"),
+            sdk_delta("1", "Report"),
+            MagicMock(event_type="interaction.complete", event_id="2"),
+        ]
+    )
+    agent = DeepResearchAgent(client=mock_client)
+
+    events = list(agent.stream_events("topic"))
+
+    assert all(isinstance(e, StreamEvent) for e in events)
+    assert [e.text for e in events if e.kind == "text"] == ["Report"]
+    assert events[-1].is_terminal
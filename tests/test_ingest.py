@@ -0,0 +1,223 @@
+import json
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import QuotaError
+
+from radiant_filament import ingest
+from radiant_filament.ingest import DirectoryIngester, IngestManifest, hash_file
+from radiant_filament.main import main
+
+
+def make_tree(root, files):
+    for relpath, content in files.items():
+        path = root / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def fake_client():
+    client = MagicMock()
+    client.file_search_stores.create.return_value = SimpleNamespace(
+        name="fileSearchStores/new-store"
+    )
+
+    def upload(file_search_store_name, file, config):
+        return SimpleNamespace(
+            done=True,
+            error=None,
+            response=SimpleNamespace(document_name=f"doc-{config['display_name']}"),
+        )
+
+    client.file_search_stores.upload_to_file_search_store.side_effect = upload
+    return client
+
+
+def uploaded_names(client):
+    return sorted(
+        call.kwargs["config"]["display_name"]
+        for call in client.file_search_stores.upload_to_file_search_store.call_args_list
+    )
+
+
+def test_uploads_new_content_once_and_skips_on_rerun(tmp_path, monkeypatch):
+    root = tmp_path / "docs"
+    make_tree(
+        root,
+        {"a.md": "alpha", "sub/b.md": "beta", "sub/copy.md": "alpha", ".hidden": "x"},
+    )
+    manifest = tmp_path / "manifest.json"
+    client = fake_client()
+
+    result = DirectoryIngester(client, manifest_path=str(manifest)).ingest(root)
+
+    assert result.store == "fileSearchStores/new-store"
+    assert (result.scanned, result.uploaded, result.duplicates) == (3, 2, 1)
+    assert uploaded_names(client) == ["a.md", os.path.join("sub", "b.md")]
+
+    # Unchanged files are neither re-hashed nor re-uploaded
+    monkeypatch.setattr(ingest, "hash_file", MagicMock(side_effect=AssertionError))
+    client = fake_client()
+    rerun = DirectoryIngester(client, result.store, manifest_path=str(manifest)).ingest(
+        root
+    )
+    assert (rerun.hashed, rerun.uploaded, rerun.unchanged) == (0, 0, 3)
+    client.file_search_stores.upload_to_file_search_store.assert_not_called()
+
+
+def test_changed_file_is_rehashed_and_uploaded(tmp_path):
+    root = tmp_path / "docs"
+    make_tree(root, {"a.md": "alpha", "b.md": "beta"})
+    manifest = str(tmp_path / "manifest.json")
+    DirectoryIngester(
+        fake_client(), "fileSearchStores/s", manifest_path=manifest
+    ).ingest(root)
+
+    (root / "b.md").write_text("beta, revised")
+    client = fake_client()
+    result = DirectoryIngester(
+        client, "fileSearchStores/s", manifest_path=manifest
+    ).ingest(root)
+
+    assert (result.hashed, result.uploaded, result.replaced) == (1, 1, 1)
+    assert uploaded_names(client) == ["b.md"]
+    # The previous version no longer shows up in file search
+    client.file_search_stores.documents.delete.assert_called_once_with(
+        name="doc-b.md", config={"force": True}
+    )
+    data = json.loads(open(manifest).read())
+    assert data["files"]["b.md"][2] == hash_file(root / "b.md")
+    assert len(data["documents"]) == 2
+
+
+def test_changed_file_keeps_content_another_file_still_has(tmp_path):
+    root = tmp_path / "docs"
+    make_tree(root, {"a.md": "alpha", "copy.md": "alpha"})
+    manifest = str(tmp_path / "manifest.json")
+    DirectoryIngester(
+        fake_client(), "fileSearchStores/s", manifest_path=manifest
+    ).ingest(root)
+
+    (root / "copy.md").write_text("alpha, revised")
+    client = fake_client()
+    result = DirectoryIngester(
+        client, "fileSearchStores/s", manifest_path=manifest
+    ).ingest(root)
+
+    assert (result.uploaded, result.replaced) == (1, 0)
+    client.file_search_stores.documents.delete.assert_not_called()
+
+
+def test_previous_version_is_kept_when_the_new_upload_fails(tmp_path):
+    root = tmp_path / "docs"
+    make_tree(root, {"a.md": "alpha"})
+    manifest = str(tmp_path / "manifest.json")
+    DirectoryIngester(
+        fake_client(), "fileSearchStores/s", manifest_path=manifest
+    ).ingest(root)
+
+    (root / "a.md").write_text("alpha, revised")
+    client = fake_client()
+    client.file_search_stores.upload_to_file_search_store.side_effect = ValueError(
+        "unsupported file"
+    )
+    result = DirectoryIngester(
+        client, "fileSearchStores/s", manifest_path=manifest
+    ).ingest(root)
+
+    assert result.replaced == 0
+    client.file_search_stores.documents.delete.assert_not_called()
+
+
+def test_transient_errors_are_retried_and_failures_reported(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest.time, "sleep", lambda _: None)
+    root = tmp_path / "docs"
+    make_tree(root, {"flaky.md": "f", "broken.md": "b"})
+    client = fake_client()
+    upload = client.file_search_stores.upload_to_file_search_store.side_effect
+    attempts = {"flaky.md": 0}
+
+    def flaky_upload(file_search_store_name, file, config):
+        name = config["display_name"]
+        if name == "broken.md":
+            raise ValueError("unsupported file")
+        attempts[name] += 1
+        if attempts[name] < 3:
+            raise QuotaError("RESOURCE_EXHAUSTED")
+        return upload(file_search_store_name, file, config)
+
+    client.file_search_stores.upload_to_file_search_store.side_effect = flaky_upload
+    manifest = str(tmp_path / "manifest.json")
+
+    result = DirectoryIngester(
+        client, "fileSearchStores/s", manifest_path=manifest
+    ).ingest(root)
+
+    assert attempts["flaky.md"] == 3
+    assert result.uploaded == 1
+    assert result.failed == [("broken.md", "unsupported file")]
+    # The failed file stays pending for the next run
+    assert list(IngestManifest(manifest).documents.values()) == ["doc-flaky.md"]
+
+
+def test_waits_for_indexing_operation(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest.time, "sleep", lambda _: None)
+    root = tmp_path / "docs"
+    make_tree(root, {"a.md": "alpha"})
+    client = fake_client()
+    client.file_search_stores.upload_to_file_search_store.side_effect = None
+    client.file_search_stores.upload_to_file_search_store.return_value = (
+        SimpleNamespace(done=False)
+    )
+    client.operations.get.return_value = SimpleNamespace(
+        done=True, error=None, response=SimpleNamespace(document_name="doc-1")
+    )
+
+    result = DirectoryIngester(
+        client, "fileSearchStores/s", manifest_path=str(tmp_path / "m.json")
+    ).ingest(root)
+
+    assert result.uploaded == 1
+    client.operations.get.assert_called_once()
+
+
+def test_process_pool_hashing_matches_serial(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest, "POOL_THRESHOLD", 2)
+    root = tmp_path / "docs"
+    make_tree(root, {f"{i}.txt": f"content {i % 3}" for i in range(6)})
+
+    result = DirectoryIngester(
+        fake_client(),
+        "fileSearchStores/s",
+        manifest_path=str(tmp_path / "m.json"),
+        hash_workers=2,
+    ).ingest(root)
+
+    assert (result.hashed, result.uploaded, result.duplicates) == (6, 3, 3)
+
+
+def test_cli_prints_store_name(tmp_path, monkeypatch, capsys):
+    root = tmp_path / "docs"
+    make_tree(root, {"a.md": "alpha"})
+    client = fake_client()
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr("radiant_filament.agent.genai.Client", lambda **_: client)
+
+    main(["ingest", str(root), "--manifest", str(tmp_path / "m.json")])
+
+    out = capsys.readouterr().out
+    assert "1 uploaded" in out
+    assert out.strip().endswith("--file-search fileSearchStores/new-store")
+
+
+def test_cli_rejects_missing_directory(tmp_path):
+    with pytest.raises(SystemExit) as exc_info:
+        main(["ingest", str(tmp_path / "missing")])
+    assert exc_info.value.code == 2
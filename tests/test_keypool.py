@@ -0,0 +1,198 @@
+import io
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+from rich.console import Console
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import MockEvent, QuotaError
+
+from radiant_filament.agent import DeepResearchAgent
+from radiant_filament.keypool import KeyPool
+
+
+def make_pool(count=2, **kwargs):
+    clients = {}
+
+    def factory(key):
+        clients[key] = MagicMock(name=key)
+        return clients[key]
+
+    keys = [f"secret-key-{i}" for i in range(count)]
+    pool = KeyPool(keys, client_factory=factory, **kwargs)
+    return pool, [clients[key] for key in keys]
+
+
+def test_new_interactions_go_to_least_loaded_key():
+    pool, clients = make_pool()
+    for i, client in enumerate(clients):
+        client.interactions.create.return_value = MagicMock(
+            id=f"int-{i}", status="in_progress"
+        )
+
+    first = pool.interactions.create(input="a", background=True)
+    second = pool.interactions.create(input="b", background=True)
+
+    assert {first.id, second.id} == {"int-0", "int-1"}
+    assert [u["active"] for u in pool.utilization()] == [1, 1]
+
+
+def test_polls_and_follow_ups_are_pinned_to_creating_key():
+    pool, clients = make_pool()
+    clients[0].interactions.create.return_value = MagicMock(
+        id="int-0", status="in_progress"
+    )
+    pool.interactions.create(input="a")
+    clients[0].interactions.get.return_value = MagicMock(status="completed")
+
+    pool.interactions.get(id="int-0")
+    pool.interactions.create(input="follow-up", previous_interaction_id="int-0")
+
+    clients[1].interactions.get.assert_not_called()
+    assert clients[0].interactions.create.call_count == 2
+    assert pool.utilization()[0]["active"] == 1  # the follow-up
+
+
+def test_quota_error_fails_over_and_cools_key_down():
+    pool, clients = make_pool()
+    clients[0].interactions.create.side_effect = QuotaError()
+    clients[1].interactions.create.return_value = MagicMock(
+        id="int-1", status="in_progress"
+    )
+
+    assert pool.interactions.create(input="a").id == "int-1"
+    clients[0].interactions.create.reset_mock()
+    pool.interactions.create(input="b")
+
+    clients[0].interactions.create.assert_not_called()
+    usage = pool.utilization()
+    assert usage[0]["throttled"] == 1
+    assert usage[1]["interactions"] == 2
+
+
+def test_quota_error_on_every_key_is_raised():
+    pool, clients = make_pool()
+    for client in clients:
+        client.interactions.create.side_effect = QuotaError()
+    with pytest.raises(QuotaError):
+        pool.interactions.create(input="a")
+    assert [u["active"] for u in pool.utilization()] == [0, 0]
+
+
+def test_streamed_interaction_is_pinned_and_released(monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda _: None)
+    pool, clients = make_pool()
+    clients[0].interactions.create.return_value = iter(
+        [
+            MockEvent("interaction.start"),
+            MockEvent("content.delta", "1", "Partial"),
+        ]
+    )
+    clients[0].interactions.get.return_value = iter(
+        [MockEvent("interaction.complete", "2")]
+    )
+    agent = DeepResearchAgent(client=pool)
+    agent.console = Console(file=io.StringIO())
+
+    events = list(agent.start_research_stream("topic"))
+
+    assert events[-1].event_type == "interaction.complete"
+    clients[1].interactions.get.assert_not_called()
+    usage = pool.utilization()
+    assert usage[0]["interactions"] == 1
+    assert usage[0]["active"] == 0
+    assert usage[0]["share"] == 1.0
+
+
+def test_agent_uses_pool_from_environment(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEYS", "k1111, k2222")
+    monkeypatch.setattr("radiant_filament.keypool.genai.Client", MagicMock())
+    agent = DeepResearchAgent()
+    assert isinstance(agent.client, KeyPool)
+    assert [u["key"] for u in agent.client.utilization()] == [
+        "key-1 (...1111)",
+        "key-2 (...2222)",
+    ]
+
+
+def test_pins_persist_across_pools(tmp_path):
+    pin_path = str(tmp_path / "pins.jsonl")
+    pool, clients = make_pool(pin_path=pin_path)
+    clients[1].interactions.create.return_value = MagicMock(
+        id="int-1", status="in_progress"
+    )
+    clients[0].interactions.create.side_effect = QuotaError()
+    pool.interactions.create(input="a")
+    assert "secret-key" not in open(pin_path).read()
+
+    # A new process (e.g. `attach` or a follow-up) reaches the creating key
+    pool, clients = make_pool(pin_path=pin_path)
+    clients[1].interactions.get.return_value = MagicMock(status="in_progress")
+    pool.interactions.get(id="int-1")
+    pool.interactions.cancel(id="int-1")
+
+    clients[0].interactions.get.assert_not_called()
+    clients[0].interactions.cancel.assert_not_called()
+    clients[1].interactions.cancel.assert_called_once_with(id="int-1")
+
+
+def test_unknown_interaction_fails_over_on_not_found():
+    class NotFound(Exception):
+        code = 404
+
+    pool, clients = make_pool()
+    clients[0].interactions.get.side_effect = NotFound()
+    clients[1].interactions.get.return_value = MagicMock(status="in_progress")
+
+    pool.interactions.get(id="int-9")
+    pool.interactions.get(id="int-9")
+
+    assert clients[0].interactions.get.call_count == 1
+    assert clients[1].interactions.get.call_count == 2
+
+
+def test_pins_are_bounded(tmp_path):
+    pin_path = str(tmp_path / "pins.jsonl")
+    pool, clients = make_pool(count=1, pin_path=pin_path, max_pins=3)
+    for i in range(10):
+        clients[0].interactions.create.return_value = MagicMock(
+            id=f"int-{i}", status="completed"
+        )
+        pool.interactions.create(input=str(i))
+
+    assert list(pool._pins) == ["int-7", "int-8", "int-9"]
+    assert len(open(pin_path).readlines()) <= 6
+    reloaded, _ = make_pool(count=1, pin_path=pin_path, max_pins=3)
+    assert list(reloaded._pins) == ["int-7", "int-8", "int-9"]
+
+
+def test_streams_release_load_on_close_and_error():
+    pool, clients = make_pool(count=1)
+
+    def dropped():
+        yield MockEvent("interaction.start")
+        raise ConnectionError("dropped")
+
+    clients[0].interactions.create.return_value = dropped()
+    stream = pool.interactions.create(input="a", stream=True)
+    next(stream)
+    assert pool.utilization()[0]["active"] == 1
+    with pytest.raises(ConnectionError):
+        next(stream)
+    assert pool.utilization()[0]["active"] == 0
+
+    # Closed before interaction.start: the pending slot is released
+    clients[0].interactions.create.return_value = iter([])
+    pool.interactions.create(input="b", stream=True).close()
+    assert pool.utilization()[0]["active"] == 0
+
+    # A reconnect stream counts the interaction until it is closed
+    clients[0].interactions.get.return_value = iter([])
+    resumed = pool.interactions.get(id="int-1", stream=True)
+    assert pool.utilization()[0]["active"] == 1
+    resumed.close()
+    assert pool.utilization()[0]["active"] == 0
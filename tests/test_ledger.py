@@ -0,0 +1,159 @@
+import io
+import json
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from rich.console import Console
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from radiant_filament.agent import DeepResearchAgent
+from radiant_filament.cancellation import CancellationToken, ResearchCancelled
+from radiant_filament.ledger import LedgerEntry, UsageLedger
+from radiant_filament.main import main
+from radiant_filament.replay import ReplayClient
+
+USAGE = {"total_input_tokens": 100, "total_output_tokens": 40, "total_tokens": 140}
+EVENTS = [
+    {"type": "interaction.start", "event_id": "0"},
+    {"type": "content.delta", "event_id": "1", "delta": "text", "text": "Report"},
+    {"type": "interaction.complete", "event_id": "2", "usage": USAGE},
+]
+
+
+def make_agent(client, ledger):
+    agent = DeepResearchAgent(client=client, ledger=ledger, idle_timeout=None)
+    agent.console = Console(file=io.StringIO())
+    return agent
+
+
+def test_streaming_run_records_usage_and_outcome(tmp_path):
+    ledger = UsageLedger(str(tmp_path / "ledger.jsonl"), tags=["team-a"])
+    agent = make_agent(ReplayClient(EVENTS, interaction_id="int-1"), ledger)
+
+    agent.research("topic", agent_config={"thinking_summaries": "none"})
+
+    [entry] = ledger.entries()
+    assert entry.outcome == "completed"
+    assert entry.interaction_id == "int-1"
+    assert entry.usage == USAGE
+    assert entry.tags == ["team-a"]
+    assert entry.prompt_preview == "topic"
+    assert entry.duration is not None and entry.retries == 0
+
+
+def test_failed_and_cancelled_runs_are_recorded(tmp_path):
+    ledger = UsageLedger(str(tmp_path / "ledger.jsonl"))
+    events = EVENTS[:2] + [{"type": "error", "event_id": "2", "error": "quota"}]
+    agent = make_agent(ReplayClient(events), ledger)
+
+    with pytest.raises(RuntimeError):
+        agent.research("topic")
+    result = agent.stream_research("topic").result
+
+    outcomes = [(e.outcome, e.error) for e in ledger.entries()]
+    assert outcomes == [
+        ("failed", "Research error: quota"),
+        ("failed", "Research error: quota"),
+    ]
+    assert not result.ok
+
+
+def test_polling_run_records_usage_from_interaction(tmp_path, monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda _: None)
+    ledger = UsageLedger(str(tmp_path / "ledger.jsonl"))
+    client = MagicMock()
+    client.interactions.create.return_value = SimpleNamespace(
+        id="int-2", status="in_progress"
+    )
+    client.interactions.get.side_effect = [
+        ConnectionError("blip"),
+        SimpleNamespace(
+            id="int-2",
+            status="completed",
+            outputs=[SimpleNamespace(type="text", text="Report")],
+            usage=SimpleNamespace(total_tokens=7, total_input_tokens=MagicMock()),
+        ),
+    ]
+
+    make_agent(client, ledger).research_poll("topic", poll_interval=0)
+
+    [entry] = ledger.entries()
+    assert (entry.outcome, entry.interaction_id) == ("completed", "int-2")
+    assert entry.usage == {"total_tokens": 7}
+    assert entry.retries == 1
+
+
+def test_cancelled_polling_runs_are_recorded_as_cancelled(tmp_path, monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda _: None)
+    ledger = UsageLedger(str(tmp_path / "ledger.jsonl"))
+    client = MagicMock()
+    client.interactions.create.return_value = SimpleNamespace(
+        id="int-3", status="cancelled"
+    )
+    agent = make_agent(client, ledger)
+
+    with pytest.raises(ResearchCancelled):
+        agent.research_poll("topic")
+    token = CancellationToken()
+    token.cancel("stopped early")
+    with pytest.raises(ResearchCancelled):
+        agent.research_poll("topic", cancel_token=token)
+
+    assert client.interactions.create.call_count == 1
+    outcomes = [(e.outcome, e.error) for e in ledger.entries()]
+    assert outcomes == [
+        ("cancelled", "cancelled remotely"),
+        ("cancelled", "stopped early"),
+    ]
+
+
+def test_summarize_groups_by_tag_and_prompt(tmp_path):
+    ledger = UsageLedger(str(tmp_path / "ledger.jsonl"))
+    for prompt, tags, tokens, outcome in [
+        ("cheap", ["a"], 10, "completed"),
+        ("costly", ["a", "b"], 1000, "completed"),
+        ("costly", ["b"], 500, "failed"),
+    ]:
+        entry = LedgerEntry.for_run(prompt, "agent-x", tags=tags)
+        entry.outcome = outcome
+        entry.usage = {"total_tokens": tokens}
+        ledger.record(entry)
+    with open(ledger.path, "a") as f:
+        f.write('{"torn": ')
+
+    by_tag = {row["key"]: row for row in ledger.summarize(by="tag")}
+    assert by_tag["a"]["total_tokens"] == 1010
+    assert (by_tag["b"]["runs"], by_tag["b"]["failed"]) == (2, 1)
+
+    by_prompt = ledger.summarize(by="prompt")
+    assert by_prompt[0]["key"].endswith("costly")
+    assert by_prompt[0]["total_tokens"] == 1500
+
+    assert ledger.summarize(by="agent")[0]["runs"] == 3
+    assert ledger.summarize(since=4102444800) == []  # 2100-01-01
+
+
+def test_cli_records_tags_and_summarizes(tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / "ledger.jsonl")
+    client = ReplayClient(EVENTS, interaction_id="int-1")
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr("radiant_filament.agent.genai.Client", lambda **_: client)
+
+    main(["topic", "--ledger", path, "--tag", "team-a", "--tag", "q3"])
+    capsys.readouterr()
+    main(["ledger", path, "--by", "tag", "--json"])
+
+    rows = json.loads(capsys.readouterr().out)
+    assert {row["key"] for row in rows} == {"team-a", "q3"}
+    assert all(row["total_tokens"] == 140 for row in rows)
+
+
+def test_tag_requires_ledger():
+    with pytest.raises(SystemExit) as exc_info:
+        main(["topic", "--tag", "team-a"])
+    assert exc_info.value.code == 2
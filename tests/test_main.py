@@ -2,13 +2,16 @@ import json
 import os
 import sys
 import tempfile
+from unittest.mock import MagicMock
 
 import pytest
 
 # Ensure src is in path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
 
-from radiant_filament.main import parse_agent_config, validate_file_search_store
+from helpers import MockEvent
+
+from radiant_filament.main import main, parse_agent_config, validate_file_search_store
 
 
 class TestParseAgentConfig:
@@ -67,3 +70,21 @@ class TestValidateFileSearchStore:
 
         with pytest.raises(argparse.ArgumentTypeError):
             validate_file_search_store("fileSearchStores")
+
+
+def test_double_dash_researches_a_subcommand_name(monkeypatch):
+    client = MagicMock()
+    client.interactions.create.return_value = iter(
+        [
+            MockEvent("interaction.start", event_id="1"),
+            MockEvent("interaction.complete", event_id="2"),
+        ]
+    )
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.delenv("GEMINI_API_KEYS", raising=False)
+    monkeypatch.setattr("radiant_filament.agent.genai.Client", lambda **_: client)
+
+    main(["--", "compare"])
+
+    _, kwargs = client.interactions.create.call_args
+    assert kwargs["input"] == "compare"
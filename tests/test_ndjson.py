@@ -0,0 +1,147 @@
+import io
+import json
+import os
+import sys
+
+import pytest
+from rich.console import Console
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from radiant_filament.agent import DeepResearchAgent
+from radiant_filament.archive import ReportArchive
+from radiant_filament.main import main
+from radiant_filament.ndjson import SCHEMA_VERSION, NdjsonWriter, research_ndjson
+from radiant_filament.replay import ReplayClient
+
+EVENTS = [
+    {"type": "interaction.start", "event_id": "0"},
+    {
+        "type": "content.delta",
+        "event_id": "1",
+        "delta": "thought_summary",
+        "text": "Plan",
+    },
+    {"type": "content.delta", "event_id": "2", "delta": "text", "text": "# Report\n"},
+    {"type": "content.delta", "event_id": "3", "delta": "text", "text": "Body."},
+    {"type": "interaction.complete", "event_id": "4"},
+]
+
+
+class DroppingClient(ReplayClient):
+    """Drops the initial stream after `drop_after` events; get() resumes."""
+
+    def __init__(self, events, drop_after):
+        super().__init__(events, interaction_id="int-1")
+        self.drop_after = drop_after
+
+    def create(self, stream=False, **kwargs):
+        def dropped():
+            for i, event in enumerate(self._stream()):
+                if i == self.drop_after:
+                    raise ConnectionError("connection reset")
+                yield event
+
+        return dropped()
+
+
+def run(client, **kwargs):
+    agent = DeepResearchAgent(client=client, idle_timeout=None)
+    agent.console = Console(file=io.StringIO())
+    out = io.StringIO()
+    result = research_ndjson(agent, "topic", stream=out, **kwargs)
+    return result, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_emits_one_line_per_event_with_envelope():
+    result, lines = run(ReplayClient(EVENTS, interaction_id="int-1"))
+
+    assert [line["type"] for line in lines] == [
+        "start",
+        "thought",
+        "text",
+        "text",
+        "complete",
+    ]
+    for line in lines:
+        assert line["v"] == SCHEMA_VERSION
+        assert line["interaction_id"] == "int-1"
+        assert isinstance(line["ts"], float)
+    assert [line["last_event_id"] for line in lines] == ["0", "1", "2", "3", "4"]
+    text = "".join(line["text"] for line in lines if line["type"] == "text")
+    assert text == result.report
+    assert lines[-1]["metrics"]["report_chars"] == len(result.report)
+
+
+def test_reconnect_line_carries_resume_point(monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda _: None)
+
+    _, lines = run(DroppingClient(EVENTS, drop_after=3))
+
+    reconnect = next(line for line in lines if line["type"] == "reconnect")
+    assert reconnect["attempt"] == 1
+    assert reconnect["last_event_id"] == "2"
+    assert "connection reset" in reconnect["error"]
+    assert [line["last_event_id"] for line in lines if line["type"] == "text"] == [
+        "2",
+        "3",
+    ]
+    assert lines[-1]["type"] == "complete"
+
+
+def test_error_event_is_the_last_line(tmp_path):
+    events = EVENTS[:3] + [{"type": "error", "event_id": "3", "error": "quota"}]
+    output = tmp_path / "report.md"
+
+    result, lines = run(ReplayClient(events), output_path=str(output))
+
+    assert not result.ok
+    assert lines[-1]["type"] == "error"
+    assert lines[-1]["status"] == "failed"
+    assert "quota" in lines[-1]["error"]
+    assert output.read_text() == "# Report\n"
+
+
+def test_lines_are_compact():
+    out = io.StringIO()
+    NdjsonWriter(out, clock=lambda: 1.0).emit("start")
+    assert out.getvalue() == (
+        '{"v":1,"type":"start","ts":1.0,"interaction_id":null,"last_event_id":null}\n'
+    )
+
+
+def test_cli_ndjson_keeps_stdout_machine_readable(tmp_path, capsys):
+    archive = ReportArchive(str(tmp_path / "archive"), store_events=True)
+    archive.add(
+        "# Report\nBody.", prompt="topic", interaction_id="int-1", events=EVENTS
+    )
+
+    main(
+        [
+            "topic",
+            "--archive",
+            str(tmp_path / "archive"),
+            "--replay",
+            "int-1",
+            "--format",
+            "ndjson",
+        ]
+    )
+
+    out = capsys.readouterr().out
+    types = [json.loads(line)["type"] for line in out.splitlines()]
+    assert types[0] == "start" and types[-1] == "complete"
+
+
+def test_cli_rejects_ndjson_with_polling():
+    with pytest.raises(SystemExit) as exc_info:
+        main(["topic", "--format", "ndjson", "--no-stream"])
+    assert exc_info.value.code == 2
+
+
+def test_cli_rejects_ndjson_with_stdout_sink(capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        main(["topic", "--format", "ndjson", "--sink", "stdout"])
+    assert exc_info.value.code == 2
+    assert "--sink stdout" in capsys.readouterr().err
@@ -0,0 +1,35 @@
+import os
+import sys
+from types import SimpleNamespace
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from radiant_filament.polling import OutputCursor, split_renderable
+
+
+def text(value):
+    return SimpleNamespace(type="text", text=value)
+
+
+def test_cursor_returns_only_new_text():
+    cursor = OutputCursor()
+    assert cursor.advance(None) == []
+    assert cursor.advance([SimpleNamespace(type="image", text=None)]) == []
+    assert cursor.advance([text("Hel")]) == ["Hel"]
+    assert cursor.advance([text("Hel")]) == []
+    assert cursor.advance([text("Hello")]) == ["lo"]
+    assert cursor.advance([text("Hello"), text("A"), text("B")]) == ["A", "B"]
+    assert cursor.advance([text("Hello"), text("A"), text("Bc")]) == ["c"]
+    # A poll that lags behind an earlier one yields nothing new
+    assert cursor.advance([text("Hello")]) == []
+    assert cursor.advance([text("Hello"), text("A"), text("Bc"), text("D")]) == ["D"]
+
+
+def test_split_renderable_keeps_blocks_whole():
+    assert split_renderable("Para one.\n\nPara t") == ("Para one.\n\n", "Para t")
+    assert split_renderable("- a\n- b\n") == ("", "- a\n- b\n")
+    fenced = "Intro\n\n```\ncode\n\nmore\n"
+    assert split_renderable(fenced) == ("Intro\n\n", "```\ncode\n\nmore\n")
+    closed = fenced + "```\n\nAfter"
+    assert split_renderable(closed) == (closed[: -len("After")], "After")
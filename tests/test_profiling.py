@@ -0,0 +1,150 @@
+import io
+import json
+import os
+import pstats
+import sys
+import time
+
+import pytest
+from rich.console import Console
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import FakeClock
+
+from radiant_filament.agent import DeepResearchAgent
+from radiant_filament.archive import ReportArchive
+from radiant_filament.main import main
+from radiant_filament.profiling import PhaseTimer, Profiler, format_breakdown
+from radiant_filament.replay import ReplayClient
+
+EVENTS = [
+    {"type": "interaction.start", "event_id": "0", "ts": 1.0},
+    {
+        "type": "content.delta",
+        "event_id": "1",
+        "ts": 2.0,
+        "delta": "thought_summary",
+        "text": "Planning",
+    },
+    {
+        "type": "content.delta",
+        "event_id": "2",
+        "ts": 3.0,
+        "delta": "text",
+        "text": "# Report\n",
+    },
+    {
+        "type": "content.delta",
+        "event_id": "3",
+        "ts": 4.0,
+        "delta": "text",
+        "text": "Body.",
+    },
+    {"type": "interaction.complete", "event_id": "4", "ts": 5.0},
+]
+
+
+def test_phase_timer_attributes_remainder_to_handling():
+    clock = FakeClock()
+    timer = PhaseTimer(clock=clock)
+    timer.start()
+
+    def slow_items():
+        clock.now += 2.0
+        yield "a"
+
+    for _ in timer.iterate("network", slow_items()):
+        with timer.phase("render"):
+            clock.now += 0.5
+        clock.now += 0.25
+    timer.stop()
+
+    breakdown = timer.breakdown()
+    assert breakdown["total"] == 2.75
+    assert breakdown["phases"]["network"]["seconds"] == 2.0
+    assert breakdown["phases"]["render"]["seconds"] == 0.5
+    assert breakdown["phases"]["handling"]["seconds"] == 0.25
+    assert "network 73%" in format_breakdown(breakdown)
+
+
+def test_replay_client_streams_and_resumes():
+    client = ReplayClient(EVENTS, interaction_id="int-9")
+    events = list(client.interactions.create(stream=True))
+    assert [e.event_type for e in events][0] == "interaction.start"
+    assert events[0].interaction.id == "int-9"
+    assert events[2].delta.text == "# Report\n"
+    assert events[1].delta.content.text == "Planning"
+
+    resumed = list(client.interactions.get(id="int-9", stream=True, last_event_id="2"))
+    assert [e.event_id for e in resumed] == ["3", "4"]
+    assert client.interactions.create().outputs[0].text == "# Report\nBody."
+
+
+def test_profiled_replay_writes_breakdown_and_pstats(tmp_path):
+    prefix = str(tmp_path / "prof")
+    profiler = Profiler(prefix)
+    agent = DeepResearchAgent(
+        client=ReplayClient(EVENTS), phase_timer=profiler.timer, idle_timeout=None
+    )
+    agent.console = Console(file=io.StringIO())
+    output = tmp_path / "report.md"
+
+    with profiler:
+        agent.research("topic", output_path=str(output))
+
+    assert output.read_text() == "# Report\nBody."
+    data = json.loads((tmp_path / "prof.json").read_text())
+    assert set(data["phases"]) == {"network", "handling", "render", "io"}
+    assert data["phases"]["network"]["count"] == len(EVENTS) + 1
+    assert data["phases"]["io"]["count"] >= 2
+    assert data["memory"]["peak_bytes"] > 0
+    pstats.Stats(prefix + ".pstats")
+
+
+def test_sampling_mode_writes_folded_stacks(tmp_path):
+    prefix = str(tmp_path / "prof")
+    with Profiler(prefix, mode="sampling", sample_interval=0.001):
+        deadline = time.monotonic() + 0.05
+        while time.monotonic() < deadline:
+            sum(range(1000))
+
+    lines = (tmp_path / "prof.folded").read_text().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert ";" in stack and int(count) > 0
+
+
+def test_cli_replays_archived_run_under_profiler(tmp_path):
+    archive = ReportArchive(str(tmp_path / "archive"), store_events=True)
+    archive.add(
+        "# Report\nBody.", prompt="topic", interaction_id="int-1", events=EVENTS
+    )
+    prefix = str(tmp_path / "prof")
+
+    main(
+        [
+            "topic",
+            "--archive",
+            str(tmp_path / "archive"),
+            "--replay",
+            "int-1",
+            "--profile",
+            prefix,
+            "--no-stream",
+        ]
+    )
+
+    data = json.loads((tmp_path / "prof.json").read_text())
+    assert data["mode"] == "deterministic"
+    assert len(ReportArchive(str(tmp_path / "archive")).entries()) == 1
+
+
+def test_replay_without_event_log_is_rejected(tmp_path, capsys):
+    archive = ReportArchive(str(tmp_path / "archive"))
+    archive.add("text", prompt="topic", interaction_id="int-1")
+    with pytest.raises(SystemExit) as exc_info:
+        main(["topic", "--archive", str(tmp_path / "archive"), "--replay", "int-1"])
+    assert exc_info.value.code == 2
+    assert "--archive-events" in capsys.readouterr().err
@@ -0,0 +1,125 @@
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import FakeClock, QuotaError
+
+from radiant_filament.agent import DeepResearchAgent
+from radiant_filament.cancellation import CancellationToken, ResearchCancelled
+from radiant_filament.ratelimit import RateLimiter, is_rate_limit_error
+
+
+def make_limiter(rate=2.0, burst=1, **kwargs):
+    clock = FakeClock(1000.0)
+    limiter = RateLimiter(rate, burst, clock=clock, sleep=clock.sleep, **kwargs)
+    return limiter, clock
+
+
+def test_token_bucket_spaces_requests():
+    limiter, clock = make_limiter(rate=2.0, burst=2)
+    start = clock.now
+
+    waits = [limiter.acquire() for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert clock.now - start == pytest.approx(1.0)
+    assert limiter.stats["admitted"] == 4
+
+
+def test_quota_error_halves_rate_then_recovers():
+    limiter, clock = make_limiter(rate=2.0)
+    limiter.on_rate_limited()
+    assert limiter.rate == pytest.approx(1.0)
+
+    for _ in range(30):
+        limiter.on_success()
+    assert limiter.rate == pytest.approx(2.0)
+
+
+def test_rate_never_drops_below_minimum():
+    limiter, _ = make_limiter(rate=1.0, min_rate=0.25)
+    for _ in range(10):
+        limiter.on_rate_limited(0)
+    assert limiter.rate == pytest.approx(0.25)
+
+
+def test_call_retries_quota_errors_and_honours_retry_after():
+    limiter, clock = make_limiter(rate=10.0)
+    fn = MagicMock(side_effect=[QuotaError(retry_after="3"), "ok"])
+    start = clock.now
+
+    assert limiter.call(fn, id="x") == "ok"
+
+    assert fn.call_count == 2
+    assert clock.now - start >= 3
+    assert limiter.stats["throttled"] == 1
+
+
+def test_call_gives_up_after_max_attempts():
+    limiter, _ = make_limiter(rate=10.0)
+    fn = MagicMock(side_effect=QuotaError())
+    with pytest.raises(QuotaError):
+        limiter.call(fn, max_attempts=3)
+    assert fn.call_count == 3
+
+
+def test_other_errors_are_not_retried():
+    limiter, _ = make_limiter()
+    fn = MagicMock(side_effect=ValueError("bad request"))
+    with pytest.raises(ValueError):
+        limiter.call(fn)
+    fn.assert_called_once()
+    assert not is_rate_limit_error(ValueError("bad request"))
+
+
+def test_acquire_stops_when_token_cancelled():
+    limiter, _ = make_limiter(rate=0.001)
+    limiter.acquire()
+    token = CancellationToken()
+    token.cancel("stop")
+    with pytest.raises(ResearchCancelled):
+        limiter.acquire(token)
+
+
+def test_file_backend_shares_budget_between_instances(tmp_path):
+    clock = FakeClock(1000.0)
+    path = str(tmp_path / "quota.json")
+    first = RateLimiter(1.0, clock=clock, sleep=clock.sleep, state_path=path)
+    second = RateLimiter(1.0, clock=clock, sleep=clock.sleep, state_path=path)
+
+    assert first.acquire() == 0.0
+    assert second.acquire() == pytest.approx(1.0)
+
+    first.on_rate_limited(0)
+    assert second.rate == pytest.approx(0.5)
+
+
+def test_poll_calls_go_through_limiter(monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda _: None)
+
+    class Output:
+        type = "text"
+        text = "Report"
+
+    mock_client = MagicMock()
+    mock_client.interactions.create.side_effect = [
+        QuotaError(),
+        MagicMock(id="int-1", status="in_progress"),
+    ]
+    mock_client.interactions.get.return_value = MagicMock(
+        id="int-1", status="completed", outputs=[Output()]
+    )
+    limiter, _ = make_limiter(rate=100.0)
+    agent = DeepResearchAgent(client=mock_client, rate_limiter=limiter)
+    agent.console = MagicMock()
+
+    agent.research_poll("topic")
+
+    assert mock_client.interactions.create.call_count == 2
+    assert limiter.stats["admitted"] == 3
+    assert limiter.stats["throttled"] == 1
@@ -0,0 +1,113 @@
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from radiant_filament.agent import DeepResearchAgent
+from radiant_filament.report_parser import ReportParser, slugify
+
+REPORT = """Intro line.
+
+# Overview
+
+See https://example.com/a, and [Docs](https://example.com/docs).
+
+```python
+# not a heading
+```
+
+## Details ##
+
+Again https://example.com/a.
+
+## Details
+
+Last.
+"""
+
+
+def feed_in_chunks(parser, text, size):
+    for start in range(0, len(text), size):
+        parser.feed(text[start : start + size])
+    parser.close()
+
+
+def test_sections_toc_and_citations():
+    parser = ReportParser()
+    feed_in_chunks(parser, REPORT, 7)
+
+    assert [s.title for s in parser.sections] == ["", "Overview", "Details", "Details"]
+    assert parser.toc == [
+        {"level": 1, "title": "Overview", "anchor": "overview"},
+        {"level": 2, "title": "Details", "anchor": "details"},
+        {"level": 2, "title": "Details", "anchor": "details-1"},
+    ]
+    assert "# not a heading" in parser.sections[1].body
+
+    citations = list(parser.citations.values())
+    assert [c.url for c in citations] == [
+        "https://example.com/docs",
+        "https://example.com/a",
+    ]
+    assert citations[0].label == "Docs"
+    assert citations[1].count == 2
+    assert citations[1].section == "Overview"
+
+
+def test_chunking_does_not_change_result():
+    whole = ReportParser()
+    whole.feed(REPORT)
+    whole.close()
+    chunked = ReportParser()
+    feed_in_chunks(chunked, REPORT, 1)
+
+    assert chunked.to_dict() == whole.to_dict()
+
+
+def test_sections_are_emitted_as_they_finalize():
+    emitted = []
+    parser = ReportParser(on_section=lambda s: emitted.append(s.title))
+
+    parser.feed("# One\nbody\n")
+    assert emitted == []
+    parser.feed("# Two\n")
+    assert emitted == ["One"]
+    parser.close()
+    assert emitted == ["One", "Two"]
+
+
+def test_citation_callback_fires_once_per_url():
+    urls = []
+    parser = ReportParser(on_citation=lambda c: urls.append(c.url))
+    parser.feed("a https://x.org/1 b https://x.org/1\nhttps://x.org/2.\n")
+    assert urls == ["https://x.org/1", "https://x.org/2"]
+
+
+def test_slugify():
+    assert slugify("1. Executive Summary: 2025 Update") == (
+        "1-executive-summary-2025-update"
+    )
+
+
+def test_research_poll_feeds_parser(monkeypatch, tmp_path):
+    class Output:
+        type = "text"
+        text = "# Title\n\nSource: https://example.com\n"
+
+    mock_client = MagicMock()
+    mock_client.interactions.create.return_value = MagicMock(
+        id="int-1", status="completed", outputs=[Output()]
+    )
+    agent = DeepResearchAgent(client=mock_client)
+    agent.console = MagicMock()
+    parser = ReportParser()
+
+    agent.research_poll("topic", report_parser=parser)
+    parser.write_json(str(tmp_path / "s.json"))
+
+    data = json.loads((tmp_path / "s.json").read_text())
+    assert data["toc"][0]["title"] == "Title"
+    assert data["citations"][0]["url"] == "https://example.com"
@@ -0,0 +1,107 @@
+import io
+import os
+import sys
+from unittest.mock import MagicMock
+
+from rich.console import Console
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from radiant_filament.agent import DeepResearchAgent
+from radiant_filament.archive import ReportArchive
+from radiant_filament.cancellation import CancellationToken
+from radiant_filament.replay import ReplayClient
+from radiant_filament.result import ResearchResult
+
+EVENTS = [
+    {"type": "interaction.start", "event_id": "0"},
+    {
+        "type": "content.delta",
+        "event_id": "1",
+        "delta": "thought_summary",
+        "text": "Plan",
+    },
+    {"type": "content.delta", "event_id": "2", "delta": "text", "text": "# Report\n"},
+    {"type": "content.delta", "event_id": "3", "delta": "text", "text": "Body."},
+    {"type": "interaction.complete", "event_id": "4"},
+]
+
+
+def make_agent(events=EVENTS, **kwargs):
+    agent = DeepResearchAgent(
+        client=ReplayClient(events, interaction_id="int-1"), idle_timeout=None, **kwargs
+    )
+    agent.console = MagicMock()
+    return agent
+
+
+def test_stream_yields_chunks_then_result():
+    agent = make_agent()
+    stream = agent.stream_research("topic")
+
+    chunks = [(c.kind, c.text or c.thought) for c in stream if c.kind]
+
+    assert chunks == [
+        ("thought_summary", "Plan"),
+        ("text", "# Report\n"),
+        ("text", "Body."),
+    ]
+    result = stream.result
+    assert result.ok
+    assert result.report == "# Report\nBody."
+    assert result.interaction_id == "int-1"
+    assert result.metrics["report_chars"] == len(result.report)
+    assert "time_to_first_text" in result.metrics
+    assert [entry.text for entry in result.timeline.entries()] == ["Plan"]
+    assert agent.console.method_calls == []
+
+
+def test_result_drains_stream_and_records_completion(tmp_path):
+    archive = ReportArchive(str(tmp_path / "archive"))
+    agent = make_agent(archive=archive)
+
+    result = agent.stream_research("topic").result
+
+    assert result.ok
+    assert archive.read_report("int-1") == "# Report\nBody."
+
+
+def test_error_event_is_reported_not_raised():
+    events = EVENTS[:3] + [{"type": "error", "event_id": "3", "error": "quota"}]
+
+    result = make_agent(events).stream_research("topic").result
+
+    assert result.status == "failed"
+    assert result.error == "Research error: quota"
+    assert result.report == "# Report\n"
+
+
+def test_cancelled_run_keeps_partial_report():
+    token = CancellationToken()
+    stream = make_agent().stream_research("topic", cancel_token=token)
+    for chunk in stream:
+        if chunk.kind == "text":
+            token.cancel("enough")
+
+    assert stream.result.status == "cancelled"
+    assert stream.result.error == "enough"
+    assert stream.result.report == "# Report\n"
+
+
+def test_report_is_joined_once():
+    result = ResearchResult("p", "completed", chunks=["a", "b"])
+    assert result.report is result.report
+    assert result.to_dict()["report"] == "ab"
+
+
+def test_research_and_poll_return_results(tmp_path):
+    agent = make_agent()
+    agent.console = Console(file=io.StringIO())
+
+    streamed = agent.research("topic")
+    polled = agent.research_poll("topic", poll_interval=0)
+
+    assert streamed.report == polled.report == "# Report\nBody."
+    assert streamed.metrics["reconnects"] == 0
+    assert polled.interaction_id == "int-1"
@@ -0,0 +1,244 @@
+import io
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+
+import pytest
+from rich.console import Console
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from radiant_filament.main import main
+from radiant_filament.replay import ReplayClient
+from radiant_filament.scheduler import (
+    CronSchedule,
+    ResearchScheduler,
+    ScheduleSpecError,
+    VersionStore,
+    apply_delta,
+    make_delta,
+    parse_schedule_specs,
+)
+
+
+def report_events(text):
+    return [
+        {"type": "interaction.start", "event_id": "0"},
+        {"type": "content.delta", "event_id": "1", "delta": "text", "text": text},
+        {"type": "interaction.complete", "event_id": "2"},
+    ]
+
+
+def weekly_report(week):
+    lines = [f"# CVE landscape, week {week}", ""]
+    lines += [f"- CVE-2026-{n:04d}: unchanged advisory text {n}" for n in range(200)]
+    lines.append(f"- CVE-2026-9{week:03d}: new this week")
+    return "\n".join(lines) + "\n"
+
+
+def test_cron_next_after():
+    monday_9am = CronSchedule.parse("0 9 * * mon")
+    sunday = datetime(2026, 3, 1, 12, 30)
+    assert monday_9am.next_after(sunday) == datetime(2026, 3, 2, 9, 0)
+    assert monday_9am.next_after(datetime(2026, 3, 2, 9, 0)) == datetime(
+        2026, 3, 9, 9, 0
+    )
+
+    quarter_hours = CronSchedule.parse("*/15 * * * *")
+    assert quarter_hours.next_after(datetime(2026, 3, 1, 12, 31)) == datetime(
+        2026, 3, 1, 12, 45
+    )
+    assert CronSchedule.parse("@monthly").next_after(datetime(2026, 12, 5)) == datetime(
+        2027, 1, 1, 0, 0
+    )
+
+    # Both day fields restricted: either one matches (1st of month or a Friday)
+    either = CronSchedule.parse("0 0 1 * 5")
+    assert either.next_after(datetime(2026, 3, 2)) == datetime(2026, 3, 6)
+
+
+def test_cron_rejects_invalid_expressions():
+    for expression in ["* * * *", "61 * * * *", "*/0 * * * *", "0 0 * foo *"]:
+        with pytest.raises(ScheduleSpecError):
+            CronSchedule.parse(expression)
+    with pytest.raises(ScheduleSpecError):
+        CronSchedule.parse("0 0 30 feb *").next_after(datetime(2026, 1, 1))
+
+
+def test_delta_round_trip():
+    old = "a\nb\nc\nd\n"
+    new = "a\nB\nc\nd\ne"
+    ops, added, removed = make_delta(old, new)
+    assert apply_delta(old, ops) == new
+    assert (added, removed) == (2, 1)
+    assert apply_delta("", make_delta("", new)[0]) == new
+
+
+def test_store_keeps_deltas_and_reconstructs_every_version(tmp_path):
+    store = VersionStore(str(tmp_path), keyframe_interval=4)
+    reports = [weekly_report(week) for week in range(1, 7)]
+    for week, report in enumerate(reports, 1):
+        store.add("cve", report, interaction_id=f"int-{week}")
+
+    versions = store.versions("cve")
+    kinds = [v.kind for v in versions]
+    assert kinds == ["full", "delta", "delta", "delta", "full", "delta"]
+    assert (versions[1].added, versions[1].removed) == (2, 2)
+    for number, report in enumerate(reports, 1):
+        assert store.read("cve", number) == report
+    assert store.read("cve") == reports[-1]
+
+    stats = store.stats("cve")
+    assert stats["stored_bytes"] < stats["full_bytes"] / 10
+    assert versions[1].length < versions[0].length / 5
+
+    diff = store.diff("cve")
+    changed = [line for line in diff if line[:1] in "+-" and line[:3] not in "+++---"]
+    assert changed == [
+        "-# CVE landscape, week 5\n",
+        "+# CVE landscape, week 6\n",
+        "-- CVE-2026-9005: new this week\n",
+        "+- CVE-2026-9006: new this week\n",
+    ]
+    with pytest.raises(KeyError):
+        store.read("cve", 99)
+    # Version 0 does not exist; it must not silently mean "latest"
+    with pytest.raises(KeyError):
+        store.read("cve", 0)
+    with pytest.raises(KeyError):
+        store.diff("cve", new=0)
+
+
+def test_stores_sharing_a_directory_do_not_interleave(tmp_path):
+    # Separate instances share no thread lock, like separate processes
+    stores = [VersionStore(str(tmp_path)) for _ in range(4)]
+    reports = {}
+
+    def add_reports(worker, store):
+        for i in range(10):
+            report = weekly_report(worker * 100 + i)
+            version = store.add("cve", report)
+            reports[version.number] = report
+
+    threads = [
+        threading.Thread(target=add_reports, args=(worker, store))
+        for worker, store in enumerate(stores)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    versions = stores[0].versions("cve")
+    assert [v.number for v in versions] == list(range(1, 41))
+    for number, report in reports.items():
+        assert stores[0].read("cve", number) == report
+
+
+def test_scheduler_runs_specs_when_due(tmp_path):
+    now = [datetime(2026, 3, 1, 8, 0).timestamp()]
+    specs = parse_schedule_specs(
+        {"specs": [{"name": "cve", "schedule": "0 9 * * *", "prompt": "CVEs"}]}
+    )
+    store = VersionStore(str(tmp_path))
+    scheduler = ResearchScheduler(
+        specs,
+        store,
+        client=ReplayClient(report_events("Report"), interaction_id="int-1"),
+        console=Console(file=io.StringIO()),
+        clock=lambda: now[0],
+    )
+
+    # Never run: due straight away rather than at its first slot
+    assert [spec.name for spec in scheduler.due()] == ["cve"]
+    results = scheduler.run_pending()
+
+    assert results["cve"].number == 1
+    assert store.read("cve") == "Report"
+    assert scheduler.due() == []
+    now[0] = datetime(2026, 3, 1, 9, 0).timestamp()
+    assert [spec.name for spec in scheduler.due()] == ["cve"]
+    scheduler.run_pending()
+    now[0] = datetime(2026, 3, 2, 8, 0).timestamp()
+    assert scheduler.due() == []
+
+
+def test_run_attempts_persist_across_schedulers(tmp_path):
+    now = [datetime(2026, 3, 1, 8, 0).timestamp()]
+    specs = parse_schedule_specs(
+        {"specs": [{"name": "cve", "schedule": "0 9 * * *", "prompt": "CVEs"}]}
+    )
+    store = VersionStore(str(tmp_path))
+
+    def scheduler():
+        return ResearchScheduler(
+            specs,
+            store,
+            client=ReplayClient([{"type": "error", "event_id": "0", "error": "x"}]),
+            console=Console(file=io.StringIO()),
+            clock=lambda: now[0],
+        )
+
+    assert scheduler().run_pending() == {"cve": None}
+    # A failed attempt is not retried by the next process before the next slot
+    assert scheduler().due() == []
+    now[0] = datetime(2026, 3, 1, 9, 0).timestamp()
+    assert [spec.name for spec in scheduler().due()] == ["cve"]
+
+
+def test_cli_runs_now_then_shows_history_and_diff(tmp_path, monkeypatch, capsys):
+    spec_path = tmp_path / "monitors.json"
+    spec_path.write_text(
+        json.dumps({"name": "cve", "schedule": "@weekly", "prompt": "CVE landscape"})
+    )
+    store = str(tmp_path / "store")
+    client = ReplayClient(report_events(weekly_report(1)), interaction_id="int-1")
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr("radiant_filament.agent.genai.Client", lambda **_: client)
+
+    main(["schedule", "--store", store, "run", str(spec_path), "--now"])
+    client.events = report_events(weekly_report(2))
+    main(["schedule", "--store", store, "run", str(spec_path), "--now"])
+    capsys.readouterr()
+
+    main(["schedule", "--store", store, "history", "cve"])
+    history = capsys.readouterr().out
+    assert "v2" in history and "delta" in history
+
+    main(["schedule", "--store", store, "diff", "cve"])
+    diff = capsys.readouterr().out
+    assert "+# CVE landscape, week 2" in diff
+    assert "advisory text 100" not in diff
+
+    main(["schedule", "--store", store, "show", "cve", "1"])
+    assert capsys.readouterr().out == weekly_report(1)
+
+
+def test_cli_once_runs_a_spec_without_history(tmp_path, monkeypatch, capsys):
+    spec_path = tmp_path / "monitors.json"
+    spec_path.write_text(
+        json.dumps({"name": "cve", "schedule": "@weekly", "prompt": "CVE landscape"})
+    )
+    store = str(tmp_path / "store")
+    client = ReplayClient(report_events("Report"), interaction_id="int-1")
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr("radiant_filament.agent.genai.Client", lambda **_: client)
+
+    main(["schedule", "--store", store, "run", str(spec_path), "--once"])
+    assert VersionStore(store).read("cve") == "Report"
+    capsys.readouterr()
+
+    main(["schedule", "--store", store, "run", str(spec_path), "--once"])
+    assert "Nothing due." in capsys.readouterr().out
+    assert len(VersionStore(store).versions("cve")) == 1
+
+
+def test_cli_rejects_invalid_spec(tmp_path):
+    spec_path = tmp_path / "bad.json"
+    spec_path.write_text(json.dumps({"name": "x", "schedule": "never", "prompt": "p"}))
+    with pytest.raises(SystemExit) as exc_info:
+        main(["schedule", "run", str(spec_path)])
+    assert exc_info.value.code == 2
@@ -0,0 +1,134 @@
+import io
+import os
+import sys
+from unittest.mock import MagicMock
+
+from rich.console import Console
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from radiant_filament.agent import DeepResearchAgent
+from radiant_filament.main import main, print_similar_reports
+from radiant_filament.search import ReportIndex, match_query
+
+
+def test_match_query_drops_stop_words_and_punctuation():
+    assert match_query("Research the history of quantum-computing!") == (
+        '"history" OR "quantum" OR "computing"'
+    )
+    assert match_query("what is it?") == ""
+
+
+def test_search_ranks_relevant_report_first():
+    index = ReportIndex(":memory:")
+    index.add_report("# Fusion energy\n\nTokamak progress.", interaction_id="a")
+    index.add_report(
+        "# Quantum computing\n\nQubits and error correction.", interaction_id="b"
+    )
+
+    hits = index.search("history of quantum error correction")
+    assert [hit.interaction_id for hit in hits] == ["b"]
+    assert hits[0].title == "Quantum computing"
+    assert "[" in hits[0].snippet
+
+
+def test_min_terms_filters_single_word_matches():
+    index = ReportIndex(":memory:")
+    index.add_report("# Fusion\n\nTokamak plasma history.", interaction_id="a")
+    index.add_report(
+        "# Quantum computing\n\nQubits and error correction.", interaction_id="b"
+    )
+
+    prompt = "history of quantum error correction"
+    assert len(index.search(prompt)) == 2
+    hits = index.search(prompt, min_terms=2)
+    assert [hit.interaction_id for hit in hits] == ["b"]
+    assert index.search("quantum", min_terms=2) == []
+
+
+def test_similar_reports_need_half_the_prompt_terms():
+    index = ReportIndex(":memory:")
+    index.add_report("# Fusion\n\nTokamak plasma history.", interaction_id="a")
+    index.add_report(
+        "# Quantum computing\n\nQubits and error correction.", interaction_id="b"
+    )
+    out = io.StringIO()
+
+    print_similar_reports(
+        index, "history of quantum error correction", Console(file=out)
+    )
+
+    assert "Quantum computing" in out.getvalue()
+    assert "Fusion" not in out.getvalue()
+
+
+def test_add_report_replaces_existing_entry():
+    index = ReportIndex(":memory:")
+    index.add_report("first draft about tokamaks", interaction_id="a")
+    index.add_report("final report about stellarators", interaction_id="a")
+
+    assert len(index) == 1
+    assert index.search("tokamaks") == []
+    assert len(index.search("stellarators")) == 1
+
+
+def test_index_directory_is_incremental_and_prunes(tmp_path):
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    (reports / "a.md").write_text("# Alpha\n\nGraphene batteries")
+    (reports / "b.md").write_text("# Beta\n\nPerovskite solar cells")
+    (reports / "notes.txt").write_text("ignored")
+    index = ReportIndex(str(tmp_path / "index.db"))
+
+    assert index.index_directory(str(reports)) == (2, 0)
+    assert index.index_directory(str(reports)) == (0, 0)
+
+    (reports / "b.md").unlink()
+    assert index.index_directory(str(reports)) == (0, 1)
+    assert index.search("perovskite") == []
+    assert len(index.search("graphene")) == 1
+
+
+def test_undecodable_file_does_not_abort_directory(tmp_path):
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    (reports / "a.md").write_bytes(b"# Legacy\n\nCaf\xe9 tokamak notes")
+    (reports / "b.md").write_text("# Beta\n\nPerovskite solar cells")
+    index = ReportIndex(str(tmp_path / "index.db"))
+
+    assert index.index_directory(str(reports)) == (2, 0)
+    assert len(index.search("tokamak")) == 1
+    assert len(index.search("perovskite")) == 1
+
+
+def test_research_poll_adds_report_to_index(monkeypatch):
+    class Output:
+        type = "text"
+        text = "Report on hydrogen electrolyzers"
+
+    interaction = MagicMock(id="int-1", status="completed", outputs=[Output()])
+    mock_client = MagicMock()
+    mock_client.interactions.create.return_value = interaction
+    index = ReportIndex(":memory:")
+    agent = DeepResearchAgent(client=mock_client, search_index=index)
+    agent.console = MagicMock()
+    monkeypatch.setattr("time.sleep", MagicMock())
+
+    agent.research_poll("electrolyzers")
+
+    assert [hit.interaction_id for hit in index.search("electrolyzers")] == ["int-1"]
+
+
+def test_search_subcommand(tmp_path, capsys):
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    (reports / "a.md").write_text("# Alpha\n\nGraphene batteries")
+
+    main(
+        ["search", "graphene", "--index", str(tmp_path / "i.db"), "--add", str(reports)]
+    )
+
+    out = capsys.readouterr().out
+    assert "Indexed 1 new or changed reports" in out
+    assert "Alpha" in out
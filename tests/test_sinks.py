@@ -0,0 +1,231 @@
+import gzip
+import io
+import os
+import socket
+import sys
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from rich.console import Console
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import MockEvent
+
+from radiant_filament import main as main_module
+from radiant_filament.agent import DeepResearchAgent
+from radiant_filament.main import open_sinks
+from radiant_filament.sinks import (
+    FileSink,
+    GzipSink,
+    OutputPipeline,
+    Sink,
+    SocketSink,
+    parse_sink_spec,
+)
+
+
+class ListSink(Sink):
+    name = "list"
+
+    def __init__(self):
+        self.chunks = []
+        self.closed = False
+
+    def write(self, text):
+        self.chunks.append(text)
+
+    def close(self):
+        self.closed = True
+
+
+class GatedSink(ListSink):
+    """Blocks every write until the gate is opened."""
+
+    name = "gated"
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+
+    def write(self, text):
+        self.gate.wait(timeout=5)
+        super().write(text)
+
+
+class FailingSink(Sink):
+    name = "failing"
+
+    def write(self, text):
+        raise ConnectionError("refused")
+
+
+def test_file_and_gzip_sinks(tmp_path):
+    plain = tmp_path / "r.md"
+    packed = tmp_path / "r.md.gz"
+    with OutputPipeline([FileSink(str(plain)), GzipSink(str(packed))]) as pipeline:
+        for chunk in ["# Title\n", "Body ", "text."]:
+            pipeline.write(chunk)
+
+    assert plain.read_text() == "# Title\nBody text."
+    with gzip.open(packed, "rt", encoding="utf-8") as f:
+        assert f.read() == "# Title\nBody text."
+
+
+def test_sink_without_write_fails_at_construction():
+    class Incomplete(Sink):
+        name = "incomplete"
+
+    with pytest.raises(TypeError, match="write"):
+        Incomplete()
+
+
+def test_drop_policy_discards_when_queue_is_full():
+    slow = GatedSink()
+    pipeline = OutputPipeline([slow], queue_size=1, overflow="drop")
+
+    for i in range(50):
+        pipeline.write(f"{i},")
+    slow.gate.set()
+    pipeline.close()
+
+    metrics = pipeline.metrics()
+    assert metrics["gated"]["dropped"] > 0
+    assert metrics["gated"]["written"] + metrics["gated"]["dropped"] == 50
+    assert len(slow.chunks) == metrics["gated"]["written"]
+    assert slow.closed
+
+
+def test_spill_policy_preserves_order():
+    slow = GatedSink()
+    pipeline = OutputPipeline([slow], queue_size=2, overflow="spill")
+
+    for i in range(100):
+        pipeline.write(f"{i},")
+    slow.gate.set()
+    pipeline.close()
+
+    assert "".join(slow.chunks) == "".join(f"{i}," for i in range(100))
+    metrics = pipeline.metrics()["gated"]
+    assert metrics["spilled"] > 0
+    assert metrics["dropped"] == 0
+
+
+def test_spilled_chunks_are_counted_individually():
+    slow = GatedSink()
+    pipeline = OutputPipeline([slow], queue_size=2, overflow="spill")
+
+    for i in range(100):
+        pipeline.write(f"{i},")
+    slow.gate.set()
+    pipeline.close()
+
+    metrics = pipeline.metrics()["gated"]
+    assert metrics["written"] == 100
+    assert metrics["latency_max"] >= metrics["latency_avg"] > 0
+
+
+def test_open_sinks_closes_opened_sinks_when_one_fails(tmp_path, monkeypatch):
+    opened = []
+    real_create_sink = main_module.create_sink
+
+    def create_sink(kind, target):
+        sink = real_create_sink(kind, target)
+        opened.append(sink)
+        return sink
+
+    monkeypatch.setattr(main_module, "create_sink", create_sink)
+    with pytest.raises(RuntimeError, match="Cannot connect to 'unix:"):
+        open_sinks(
+            [("file", str(tmp_path / "a.md")), ("unix", str(tmp_path / "no.sock"))]
+        )
+    assert len(opened) == 1
+    assert opened[0]._file.closed
+
+
+def test_failing_sink_does_not_affect_others():
+    good = ListSink()
+    with OutputPipeline([FailingSink(), good]) as pipeline:
+        pipeline.write("a")
+        pipeline.write("b")
+
+    assert "".join(good.chunks) == "ab"
+    assert pipeline.metrics()["failing"]["error"] == "refused"
+
+
+def test_latency_metrics_are_recorded():
+    with OutputPipeline([ListSink()]) as pipeline:
+        pipeline.write("x")
+    metrics = pipeline.metrics()["list"]
+    assert metrics["written"] == 1
+    assert metrics["latency_max"] >= metrics["latency_avg"] >= 0
+
+
+def test_socket_sink_streams_to_tcp_listener():
+    server = socket.create_server(("127.0.0.1", 0))
+    received = []
+
+    def accept():
+        conn, _ = server.accept()
+        with conn:
+            while data := conn.recv(4096):
+                received.append(data)
+
+    thread = threading.Thread(target=accept)
+    thread.start()
+    with OutputPipeline([SocketSink(server.getsockname())]) as pipeline:
+        pipeline.write("hello ")
+        pipeline.write("world")
+    thread.join(timeout=5)
+    server.close()
+
+    assert b"".join(received) == b"hello world"
+
+
+def test_parse_sink_spec():
+    assert parse_sink_spec("stdout") == ("stdout", None)
+    assert parse_sink_spec("gzip:out.gz") == ("gzip", "out.gz")
+    assert parse_sink_spec("tcp:localhost:9000") == ("tcp", ("localhost", 9000))
+    assert parse_sink_spec("https://x.test/hook") == ("webhook", "https://x.test/hook")
+    with pytest.raises(ValueError):
+        parse_sink_spec("tcp:localhost")
+    with pytest.raises(ValueError):
+        parse_sink_spec("ftp:somewhere")
+
+
+def test_invalid_overflow_policy():
+    with pytest.raises(ValueError):
+        OutputPipeline([], overflow="sometimes")
+
+
+def test_research_and_poll_feed_the_pipeline():
+    mock_client = MagicMock()
+    mock_client.interactions.create.return_value = iter(
+        [
+            MockEvent("interaction.start"),
+            MockEvent("content.delta", "1", "Hello "),
+            MockEvent("content.delta", "2", "world"),
+            MockEvent("interaction.complete", "3"),
+        ]
+    )
+    agent = DeepResearchAgent(client=mock_client)
+    agent.console = Console(file=io.StringIO())
+    streamed = ListSink()
+
+    agent.research("topic", pipeline=OutputPipeline([streamed]))
+    assert "".join(streamed.chunks) == "Hello world"
+    assert streamed.closed
+
+    class Output:
+        type = "text"
+        text = "Polled report"
+
+    mock_client.interactions.create.return_value = MagicMock(
+        id="int-2", status="completed", outputs=[Output()]
+    )
+    polled = ListSink()
+    agent.research_poll("topic", pipeline=OutputPipeline([polled]))
+    assert polled.chunks == ["Polled report"]
+    assert polled.closed
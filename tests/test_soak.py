@@ -0,0 +1,78 @@
+import io
+import os
+import sys
+
+import pytest
+from rich.console import Console
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from radiant_filament.agent import DeepResearchAgent
+from radiant_filament.cancellation import CancellationToken
+from radiant_filament.main import main
+from radiant_filament.soak import (
+    SoakRunner,
+    SoakSample,
+    SyntheticClient,
+    detect_leaks,
+)
+
+
+def sample(sessions, **overrides):
+    values = dict(
+        rss=80 << 20, fds=4, threads=1, traced=100_000, open_streams=0, generators=0
+    )
+    return SoakSample(sessions=sessions, **{**values, **overrides})
+
+
+def test_short_soak_releases_everything():
+    runner = SoakRunner(
+        300, sample_every=50, failure_rate=0.5, console=Console(file=io.StringIO())
+    )
+
+    report = runner.run()
+
+    assert report.ok, report.leaks
+    assert len(report.samples) == 6
+    assert {"completed", "failed", "cancelled"} <= set(report.outcomes)
+    assert sum(report.outcomes.values()) == 300
+    assert runner.client.open_streams == 0
+
+
+@pytest.mark.parametrize("mode", ["drop", "error", "cancel"])
+def test_streams_are_closed_on_every_path(mode):
+    client = SyntheticClient()
+    agent = DeepResearchAgent(client=client, idle_timeout=None)
+    agent.console = Console(file=io.StringIO())
+    token = CancellationToken()
+    client.plan(mode, token)
+
+    result = agent.stream_research("topic", cancel_token=token).result
+
+    assert client.streams_opened >= 1
+    assert client.open_streams == 0
+    assert result.ok == (mode == "drop")
+
+
+def test_detect_leaks_flags_upward_trends_only():
+    flat = [sample(n, traced=100_000 + (n % 2) * 50_000) for n in range(100, 1100, 100)]
+    assert detect_leaks(flat) == []
+
+    growing = [
+        sample(n, traced=100_000 + n * 5_000, threads=1 + n // 500)
+        for n in range(100, 1100, 100)
+    ]
+    leaks = detect_leaks(growing)
+    assert any(leak.startswith("traced trends upward") for leak in leaks)
+    assert any(leak.startswith("threads grew by 2") for leak in leaks)
+    assert detect_leaks(growing, {"traced": 10 << 20, "threads": 5}) == []
+
+    # RSS is -1 where it cannot be measured (Windows) and is then not checked
+    unmeasured = [sample(n, rss=-1) for n in range(100, 1100, 100)]
+    assert detect_leaks(unmeasured) == []
+
+
+def test_cli_reports_verdict(capsys):
+    main(["soak", "--sessions", "90", "--sample-every", "30"])
+    assert "No upward resource trends" in capsys.readouterr().out
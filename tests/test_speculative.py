@@ -0,0 +1,162 @@
+import io
+import os
+import sys
+import threading
+
+from rich.console import Console
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from radiant_filament.agent import DeepResearchAgent
+from radiant_filament.main import main
+from radiant_filament.replay import ReplayClient
+from radiant_filament.speculative import (
+    CachedFollowUp,
+    FollowUpCache,
+    SpeculativeFollowUps,
+)
+
+EVENTS = [
+    {"type": "interaction.start", "event_id": "0"},
+    {"type": "content.delta", "event_id": "1", "delta": "text", "text": "Report"},
+    {"type": "interaction.complete", "event_id": "2"},
+]
+
+
+class FollowUpClient(ReplayClient):
+    """Replays EVENTS for the research run and answers follow-ups by echo."""
+
+    def __init__(self):
+        super().__init__(EVENTS, interaction_id="int-1")
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def create(self, stream=False, **kwargs):
+        with self._lock:
+            self.requests.append(kwargs)
+            n = len(self.requests)
+        if "previous_interaction_id" not in kwargs:
+            return super().create(stream=stream, **kwargs)
+        answer = [
+            EVENTS[0],
+            {**EVENTS[1], "text": f"Answer: {kwargs['input']}"},
+            EVENTS[2],
+        ]
+        return ReplayClient(answer, interaction_id=f"followup-{n}")._stream()
+
+
+def make_agent(client, followups):
+    agent = DeepResearchAgent(client=client, followups=followups, idle_timeout=None)
+    agent.console = Console(file=io.StringIO())
+    return agent
+
+
+def test_cache_round_trip_normalizes_prompt(tmp_path):
+    cache = FollowUpCache(str(tmp_path))
+    cache.put(CachedFollowUp("int-1", "List the key risks", "m", "Risks"))
+
+    assert cache.get("int-1", "  list the KEY risks ", "m").report == "Risks"
+    assert cache.get("int-1", "List the key risks", "other-model") is None
+    assert cache.get("int-2", "List the key risks", "m") is None
+
+
+def test_completion_runs_followups_and_caches_them(tmp_path):
+    cache = FollowUpCache(str(tmp_path))
+    followups = SpeculativeFollowUps(
+        ["Summarize", "Risks"],
+        model="m",
+        cache=cache,
+        console=Console(file=io.StringIO()),
+    )
+    client = FollowUpClient()
+
+    make_agent(client, followups).research("topic")
+    statuses = followups.wait(timeout=10)
+    followups.close()
+
+    assert statuses == {
+        ("int-1", "Summarize"): "completed",
+        ("int-1", "Risks"): "completed",
+    }
+    followup_requests = [r for r in client.requests if "previous_interaction_id" in r]
+    assert {r["input"] for r in followup_requests} == {"Summarize", "Risks"}
+    assert all(r["previous_interaction_id"] == "int-1" for r in followup_requests)
+    assert all(r["model"] == "m" for r in followup_requests)
+    cached = cache.get("int-1", "Risks", "m")
+    assert cached.report == "Answer: Risks"
+    assert cached.followup_interaction_id.startswith("followup-")
+
+
+def test_cached_followups_are_not_rerun(tmp_path):
+    cache = FollowUpCache(str(tmp_path))
+    cache.put(CachedFollowUp("int-1", "Summarize", "m", "Old answer"))
+    followups = SpeculativeFollowUps(
+        ["Summarize"], model="m", cache=cache, console=Console(file=io.StringIO())
+    )
+    client = FollowUpClient()
+
+    make_agent(client, followups).research("topic")
+
+    assert followups.wait(timeout=10) == {("int-1", "Summarize"): "cached"}
+    assert len(client.requests) == 1
+    assert cache.get("int-1", "Summarize", "m").report == "Old answer"
+
+
+def test_followup_that_raises_is_marked_failed(tmp_path):
+    class BrokenCache(FollowUpCache):
+        def put(self, entry):
+            raise OSError("disk full")
+
+    followups = SpeculativeFollowUps(
+        ["Summarize"],
+        model="m",
+        cache=BrokenCache(str(tmp_path)),
+        console=Console(file=io.StringIO()),
+    )
+
+    make_agent(FollowUpClient(), followups).research("topic")
+
+    assert followups.wait(timeout=10) == {("int-1", "Summarize"): "failed"}
+    assert followups.errors == {("int-1", "Summarize"): "disk full"}
+    followups.close()
+
+
+def test_cli_speculates_then_answers_from_cache(tmp_path, monkeypatch, capsys):
+    cache_dir = str(tmp_path / "cache")
+    client = FollowUpClient()
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr("radiant_filament.agent.genai.Client", lambda **_: client)
+
+    main(
+        [
+            "topic",
+            "--speculate-prompt",
+            "Summarize",
+            "--speculate-model",
+            "m",
+            "--followup-cache",
+            cache_dir,
+        ]
+    )
+    assert "completed" in capsys.readouterr().out
+    requests_made = len(client.requests)
+
+    output = tmp_path / "answer.md"
+    main(
+        [
+            "summarize",
+            "--previous-interaction-id",
+            "int-1",
+            "--model",
+            "m",
+            "--followup-cache",
+            cache_dir,
+            "--output",
+            str(output),
+        ]
+    )
+
+    assert len(client.requests) == requests_made
+    assert "follow-up cache" in capsys.readouterr().out
+    assert output.read_text() == "Answer: Summarize"
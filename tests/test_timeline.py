@@ -0,0 +1,103 @@
+import io
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+from rich.console import Console
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import FakeClock
+
+from radiant_filament.agent import DeepResearchAgent
+from radiant_filament.timeline import ThoughtTimeline, timeline_path
+
+
+def test_phases_measure_time_until_next_thought():
+    clock = FakeClock(100.0)
+    timeline = ThoughtTimeline(clock=clock)
+    clock.now = 101.0
+    timeline.record("Planning")
+    clock.now = 105.0
+    timeline.record("Searching")
+    clock.now = 112.5
+    timeline.finish()
+
+    phases = timeline.phases()
+    assert [p["thought"] for p in phases] == ["Planning", "Searching"]
+    assert [p["offset"] for p in phases] == [1.0, 5.0]
+    assert [p["duration"] for p in phases] == [4.0, 7.5]
+    assert timeline.to_dict()["total_duration"] == 12.5
+
+
+def test_last_phase_open_until_finished():
+    timeline = ThoughtTimeline(clock=FakeClock(100.0))
+    timeline.record("Planning")
+    assert timeline.phases()[0]["duration"] is None
+
+
+def test_ring_buffer_bounds_memory():
+    timeline = ThoughtTimeline(capacity=3, clock=FakeClock(100.0))
+    for i in range(10):
+        timeline.record(f"thought {i}")
+
+    assert len(timeline) == 3
+    assert timeline.dropped == 7
+    assert [e.text for e in timeline.entries()] == [
+        "thought 7",
+        "thought 8",
+        "thought 9",
+    ]
+
+
+def test_exports(tmp_path):
+    timeline = ThoughtTimeline(clock=FakeClock(100.0))
+    timeline.record("Reading | sources")
+    timeline.finish()
+
+    json_path = tmp_path / "t.json"
+    timeline.write(str(json_path), "json")
+    assert json.loads(json_path.read_text())["phases"][0]["thought"] == (
+        "Reading | sources"
+    )
+
+    md_path = tmp_path / "t.md"
+    timeline.write(str(md_path), "markdown")
+    assert "Reading \\| sources" in md_path.read_text()
+
+    with pytest.raises(ValueError):
+        timeline.write(str(md_path), "yaml")
+
+
+def test_timeline_path():
+    assert timeline_path("out/report.md", "json") == "out/report.timeline.json"
+    assert timeline_path("report", "markdown") == "report.timeline.md"
+
+
+def test_research_records_thought_summaries():
+    def thought(text):
+        event = MagicMock(event_type="content.delta", event_id=None)
+        event.delta.type = "thought_summary"
+        event.delta.content.text = text
+        return event
+
+    def stream():
+        start = MagicMock(event_type="interaction.start", event_id=None)
+        start.interaction.id = "int-1"
+        yield start
+        yield thought("Planning")
+        yield thought("Searching")
+        yield MagicMock(event_type="interaction.complete", event_id=None)
+
+    mock_client = MagicMock()
+    mock_client.interactions.create.return_value = stream()
+    agent = DeepResearchAgent(client=mock_client)
+    agent.console = Console(file=io.StringIO())
+
+    agent.research("topic")
+
+    assert [e.text for e in agent.timeline.entries()] == ["Planning", "Searching"]
+    assert agent.timeline.finished_at is not None
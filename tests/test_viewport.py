@@ -0,0 +1,84 @@
+import io
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+from rich.console import Console
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import MockEvent
+
+from radiant_filament.agent import DeepResearchAgent
+from radiant_filament.viewport import ViewportBuffer
+
+
+def test_buffer_keeps_only_trailing_lines():
+    buffer = ViewportBuffer(3)
+    buffer.append("one\ntwo\nth")
+    buffer.append("ree\nfour\nfi")
+
+    assert buffer.lines() == ["three", "four", "fi"]
+    assert buffer.text() == "three\nfour\nfi"
+
+
+def test_buffer_handles_trailing_newline():
+    buffer = ViewportBuffer(2)
+    buffer.append("a\nb\n")
+
+    assert buffer.text() == "a\nb"
+
+
+def test_buffer_counts_wrapped_rows():
+    buffer = ViewportBuffer(10)
+    buffer.append("short\n" + "x" * 25 + "\nend")
+
+    # The 25-char line wraps to 3 rows at width 10, leaving room for "end" only
+    assert buffer.text(max_rows=4, width=10) == "x" * 25 + "\nend"
+    assert buffer.text(max_rows=2, width=10) == "end"
+
+
+def test_buffer_rejects_empty_viewport():
+    with pytest.raises(ValueError):
+        ViewportBuffer(0)
+
+
+def test_research_viewport_renders_only_tail(tmp_path, monkeypatch):
+    lines = [f"line {i}\n" for i in range(200)]
+
+    def stream():
+        yield MockEvent("interaction.start")
+        for i, line in enumerate(lines):
+            yield MockEvent("content.delta", event_id=str(i), text=line)
+        yield MockEvent("interaction.complete")
+
+    mock_client = MagicMock()
+    mock_client.interactions.create.return_value = stream()
+    agent = DeepResearchAgent(client=mock_client)
+    agent.console = Console(file=io.StringIO(), width=80)
+
+    rendered = []
+    original = sys.modules["radiant_filament.agent"].Markdown
+
+    def spy(text, *args, **kwargs):
+        rendered.append(text)
+        return original(text, *args, **kwargs)
+
+    monkeypatch.setattr("radiant_filament.agent.Markdown", spy)
+    output = tmp_path / "report.md"
+    agent.research("topic", output_path=str(output), viewport=5)
+
+    assert max(len(text.splitlines()) for text in rendered) <= 5
+    assert rendered[-1].endswith("line 199")
+    assert output.read_text() == "".join(lines)
+
+
+def test_research_rejects_invalid_viewport(tmp_path):
+    output = tmp_path / "report.md"
+    output.write_text("previous report")
+    agent = DeepResearchAgent(client=MagicMock())
+    with pytest.raises(ValueError, match="viewport"):
+        agent.research("topic", output_path=str(output), viewport=0)
+    assert output.read_text() == "previous report"
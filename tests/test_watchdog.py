@@ -0,0 +1,159 @@
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+# Ensure src is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from helpers import MockEvent
+
+from radiant_filament.agent import DeepResearchAgent
+from radiant_filament.watchdog import (
+    StreamStalledError,
+    call_with_timeout,
+    watch_stream,
+)
+
+
+class HangingStream:
+    """Yields the given events, then blocks like a half-open connection."""
+
+    def __init__(self, events):
+        self._events = list(events)
+        self._closed = threading.Event()
+        self.close_calls = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._events:
+            return self._events.pop(0)
+        if not self._closed.wait(timeout=5):
+            raise AssertionError("watchdog never closed the stream")
+        raise ConnectionError("stream closed")
+
+    def close(self):
+        self.close_calls += 1
+        self._closed.set()
+
+
+def test_passes_events_through():
+    assert list(watch_stream(iter([1, 2, 3]), idle_timeout=1)) == [1, 2, 3]
+
+
+def test_disabled_timeout_passes_through():
+    assert list(watch_stream(iter([1]), idle_timeout=None)) == [1]
+
+
+def test_stalled_stream_is_closed_and_raises():
+    stream = HangingStream(["a"])
+    received = []
+
+    with pytest.raises(StreamStalledError):
+        for event in watch_stream(stream, idle_timeout=0.05):
+            received.append(event)
+
+    assert received == ["a"]
+    assert stream.close_calls == 1
+
+
+def test_slow_consumer_is_not_a_stall():
+    received = []
+    for event in watch_stream(iter([1, 2, 3]), idle_timeout=0.05):
+        time.sleep(0.1)
+        received.append(event)
+    assert received == [1, 2, 3]
+
+
+def test_agent_resumes_stalled_stream_with_last_event_id():
+    mock_client = MagicMock()
+    mock_client.interactions.create.return_value = HangingStream(
+        [MockEvent("interaction.start"), MockEvent("content.delta", event_id="7")]
+    )
+    mock_client.interactions.get.return_value = iter(
+        [MockEvent("interaction.complete", event_id="8")]
+    )
+    agent = DeepResearchAgent(client=mock_client, idle_timeout=0.05)
+    agent.console = MagicMock()
+
+    events = list(agent.start_research_stream("topic"))
+
+    assert [e.event_type for e in events][-1] == "interaction.complete"
+    _, kwargs = mock_client.interactions.get.call_args
+    assert kwargs["last_event_id"] == "7"
+    assert agent.stream_stats["stalls"] == 1
+    assert agent.stream_stats["reconnects"] == 1
+    assert len(agent.stream_stats["recovery_latencies"]) == 1
+
+
+def test_slow_create_is_not_abandoned():
+    """Giving up on create could leave a second interaction running."""
+
+    def create(**kwargs):
+        time.sleep(0.2)
+        return iter([MockEvent("interaction.complete", event_id="1")])
+
+    mock_client = MagicMock()
+    mock_client.interactions.create.side_effect = create
+    agent = DeepResearchAgent(client=mock_client, idle_timeout=0.05)
+    agent.console = MagicMock()
+
+    events = list(agent.start_research_stream("topic"))
+
+    assert events[-1].event_type == "interaction.complete"
+    assert mock_client.interactions.create.call_count == 1
+
+
+def test_abandoned_call_closes_late_stream():
+    release = threading.Event()
+    late_stream = HangingStream([])
+
+    def get(**kwargs):
+        release.wait(5)  # A half-open connection: no response
+        return late_stream
+
+    started = time.monotonic()
+    with pytest.raises(StreamStalledError, match="no response"):
+        call_with_timeout(get, 0.05, id="int-1")
+    assert time.monotonic() - started < 2
+
+    # The abandoned call's stream is closed once it finally arrives
+    release.set()
+    assert late_stream._closed.wait(5)
+
+
+def test_blocked_reconnect_is_retried(monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def get(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            release.wait(5)
+        return iter([MockEvent("interaction.complete", event_id="8")])
+
+    mock_client = MagicMock()
+    mock_client.interactions.get.side_effect = get
+    agent = DeepResearchAgent(client=mock_client, idle_timeout=0.05)
+    agent.console = MagicMock()
+    monkeypatch.setattr("time.sleep", MagicMock())
+    try:
+        events = list(agent.attach_stream("int-1"))
+    finally:
+        release.set()
+
+    assert events[-1].event_type == "interaction.complete"
+    assert len(calls) == 2
+    assert agent.stream_stats["stalls"] == 1
+
+
+def test_call_with_timeout_passes_results_and_errors():
+    assert call_with_timeout(lambda **kw: kw, 1, a=1) == {"a": 1}
+    assert call_with_timeout(lambda: 2, None) == 2
+    with pytest.raises(ValueError):
+        call_with_timeout(lambda: (_ for _ in ()).throw(ValueError("x")), 1)